@@ -199,15 +199,13 @@ class ContextBuilder:
         Returns:
             State summary dictionary
         """
-        active_hosts = engagement_state.get_active_hosts()
-        open_services = engagement_state.get_open_services()
-        findings = list(engagement_state.findings.values())
+        query = engagement_state.query()
+        active_hosts = query.active_hosts()
+        open_services = query.open_services()
         targets = list(engagement_state.targets.values())
 
-        # Count findings by severity
-        severity_counts: dict[str, int] = {}
-        for finding in findings:
-            severity_counts[finding.severity] = severity_counts.get(finding.severity, 0) + 1
+        # Count findings by severity (from the severity index)
+        severity_counts = query.severity_counts()
 
         # Get common services
         service_counts: dict[str, int] = {}
@@ -222,7 +220,7 @@ class ContextBuilder:
             "in_scope_targets": len([t for t in targets if t.in_scope]),
             "active_hosts_count": len(active_hosts),
             "open_services_count": len(open_services),
-            "findings_count": len(findings),
+            "findings_count": len(engagement_state.findings),
             "severity_counts": severity_counts,
             "common_services": dict(sorted(service_counts.items(), key=lambda x: x[1], reverse=True)[:5]),
             "phase": self._determine_phase(engagement_state),
@@ -237,13 +235,13 @@ class ContextBuilder:
         Returns:
             Current phase string
         """
-        active_hosts = engagement_state.get_active_hosts()
-        findings = list(engagement_state.findings.values())
-        high_severity_findings = [f for f in findings if f.severity in ["high", "critical"]]
+        query = engagement_state.query()
+        active_hosts = query.active_hosts()
+        high_severity_findings = query.findings(severity=("high", "critical"))
 
         if not active_hosts:
             return "initial_reconnaissance"
-        elif not findings:
+        elif not engagement_state.findings:
             return "enumeration"
         elif not high_severity_findings:
             return "vulnerability_assessment"
@@ -3,6 +3,7 @@
 import logging
 from collections.abc import Callable
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 from rich.panel import Panel
@@ -14,11 +15,15 @@ from wish_models.engagement import EngagementState, Target
 from wish_models.finding import Finding
 from wish_models.session import SessionMetadata
 from wish_tools.execution.executor import ToolExecutor
+from wish_tools.execution.spool import SpooledOutput
 
 from wish_cli.ui.ui_manager import WishUIManager
 
 logger = logging.getLogger(__name__)
 
+# Lines of spooled output shown by /logs
+LOGS_TAIL_LINES = 200
+
 
 class SlashCommandHandler:
     """Slash command handler."""
@@ -246,7 +251,7 @@ Examples:
                             lines.append(f"   │  ├─ {service_info}")
 
                     # VULNERABILITIES
-                    vulns = self._get_host_vulnerabilities(host, engagement_state.findings)
+                    vulns = self._get_host_vulnerabilities(host, engagement_state)
                     if vulns:
                         lines.append("   └─ [bold]VULNERABILITIES:[/bold]")
                         for vuln in vulns:
@@ -289,7 +294,7 @@ Examples:
                         ports_branch.add(f"│  └─ [blue]{service_info}[/blue]")
 
                     # Display vulnerability information
-                    vulns = self._get_host_vulnerabilities(host, engagement_state.findings)
+                    vulns = self._get_host_vulnerabilities(host, engagement_state)
                     if vulns:
                         vuln_branch = host_branch.add("└─ [bold]VULNERABILITIES:[/bold]")
                         for vuln in vulns:
@@ -336,18 +341,9 @@ Examples:
 
         return root
 
-    def _get_host_vulnerabilities(self, host: Any, findings: dict[str, Finding]) -> list[Finding]:
-        """Get vulnerabilities related to host."""
-        host_vulns = []
-        for finding in findings.values():
-            # Check if host IP is included in finding description or title
-            if (
-                host.ip_address in finding.description
-                or host.ip_address in finding.title
-                or (hasattr(finding, "affected_hosts") and host.ip_address in getattr(finding, "affected_hosts", []))
-            ):
-                host_vulns.append(finding)
-        return host_vulns
+    def _get_host_vulnerabilities(self, host: Any, engagement_state: EngagementState) -> list[Finding]:
+        """Get vulnerabilities related to host (linked by host ID or mentioning its IP)."""
+        return engagement_state.query().findings_for_host(host)
 
     async def _mode_command(self, args: list[str]) -> None:
         """Mode command."""
@@ -691,13 +687,24 @@ Examples:
         self.ui_manager.print(f"Command: {job_info.command or 'Unknown'}")
         self.ui_manager.print(f"Status: {job_info.status.value}")
 
-        if job_info.full_output:
-            from rich.panel import Panel
-
+        if job_info.output_file and Path(job_info.output_file).exists():
+            # Spooled output can be hundreds of MB; show its tail and where to find the rest
+            spooled = SpooledOutput(job_info.output_file)
+            output_panel = Panel(
+                spooled.tail(LOGS_TAIL_LINES),
+                border_style="dim",
+                title=f"Last {LOGS_TAIL_LINES} lines ({spooled.size} bytes in {job_info.output_file})",
+            )
+            self.ui_manager.print(output_panel)
+        elif job_info.full_output:
             output_panel = Panel(
                 job_info.full_output, border_style="dim", title=f"Complete Output ({len(job_info.full_output)} bytes)"
             )
             self.ui_manager.print(output_panel)
+        elif job_info.output:
+            # Still running: show the latest streamed lines
+            output_panel = Panel(job_info.output, border_style="dim", title="Latest Output (running)")
+            self.ui_manager.print(output_panel)
         else:
             self.ui_manager.print("[dim]No output available for this job[/dim]")
 
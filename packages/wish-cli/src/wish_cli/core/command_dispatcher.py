@@ -11,8 +11,10 @@ from wish_ai.planning.models import Plan, PlanStep
 from wish_core.session import SessionManager
 from wish_core.state.manager import StateManager
 from wish_knowledge import Retriever
+from wish_models.finding import Finding
 from wish_models.session import SessionMetadata
 from wish_tools.execution.executor import ToolExecutor
+from wish_tools.execution.spool import SpooledOutput, spool_path_for
 from wish_tools.parsers.nmap import NmapParser
 from wish_tools.parsers.smb import Enum4linuxParser, SmbclientParser
 
@@ -20,10 +22,12 @@ from wish_cli.commands.slash_commands import SlashCommandHandler
 from wish_cli.core.exploit_engine import ExploitEngine
 from wish_cli.core.job_manager import JobInfo, JobStatus
 from wish_cli.core.vulnerability_detector import VulnerabilityDetector
+from wish_cli.services.scope_manager import ScopeManager
 from wish_cli.ui.ui_manager import WishUIManager
 
 logger = logging.getLogger(__name__)
 
+
 # List of known interactive commands
 INTERACTIVE_COMMANDS = {
     "ftp": "FTP client",
@@ -183,6 +187,9 @@ class CommandDispatcher:
         self.smbclient_parser = SmbclientParser()
         self.enum4linux_parser = Enum4linuxParser()
 
+        # Scope filtering for parsed results
+        self.scope_manager = ScopeManager(state_manager)
+
         # Vulnerability detector
         self.vulnerability_detector = VulnerabilityDetector()
 
@@ -461,11 +468,16 @@ class CommandDispatcher:
                     "exit_code": 1,
                 }
 
-            # Execute tool
+            # Execute tool, streaming its output to the job for live progress. The
+            # complete stdout is spooled to disk and result handlers parse it from
+            # there; only a tail is kept in memory
+            job_manager = self.ui_manager.job_manager
             result = await self.tool_executor.execute_command(
                 command=command,
                 tool_name=step.tool_name,
                 timeout=300,  # 5 minute timeout
+                on_output=lambda chunk: job_manager.record_output(job_id, chunk.text),
+                spool_path=spool_path_for(job_id),
             )
 
             # Update state from result
@@ -485,6 +497,7 @@ class CommandDispatcher:
                     "result": result,
                     "job_id": job_id,
                     "output": result.stdout if hasattr(result, "stdout") else str(result),
+                    "output_file": self._spooled_output_file(result),
                     "exit_code": 0,
                 }
             else:
@@ -498,6 +511,7 @@ class CommandDispatcher:
                     "error": result.stderr,
                     "job_id": job_id,
                     "output": result.stderr if hasattr(result, "stderr") else str(result),
+                    "output_file": self._spooled_output_file(result),
                     "exit_code": 1,
                 }
 
@@ -613,18 +627,42 @@ class CommandDispatcher:
                 logger.warning(f"Unknown result format: {type(result)}")
                 return
 
-            # Parse nmap results
-            if not self.nmap_parser.can_parse(stdout):
-                logger.warning("nmap output format not recognized")
-                return
-
-            # Parse and update host information
-            hosts = self.nmap_parser.parse_hosts(stdout)
+            # Parse hosts, services and script findings in a single pass
+            output_file = self._spooled_output_file(result)
+            if output_file is not None:
+                # The complete output is on disk; stream it from there
+                try:
+                    parsed = self.nmap_parser.parse_file(output_file)
+                except ValueError:
+                    logger.warning("nmap output format not recognized")
+                    return
+            else:
+                if not self.nmap_parser.can_parse(stdout):
+                    logger.warning("nmap output format not recognized")
+                    return
+                parsed = self.nmap_parser.parse_all(stdout)
+            hosts = parsed["hosts"]
             total_services = 0
-            total_vulnerabilities = 0
+            detected_vulnerabilities: list[Finding] = []
+
+            # Out-of-scope hosts are recorded with a tag but never analyzed (only when a scope is defined)
+            out_of_scope_ids: set[str] = set()
+            if hosts:
+                out_of_scope = await self.scope_manager.flag_out_of_scope(hosts)
+                if out_of_scope:
+                    out_of_scope_ids = {host.id for host in out_of_scope}
+                    flagged = ", ".join(host.ip_address for host in out_of_scope)
+                    logger.info(f"Out-of-scope hosts: {flagged}")
+                    self.ui_manager.print_warning(
+                        f"{len(out_of_scope)} host(s) outside the defined scope recorded as out-of-scope "
+                        f"and not analyzed: {flagged}"
+                    )
+
+            # Merge the whole scan in one batch (single event and timestamp update)
+            if hosts:
+                await self.state_manager.merge_hosts(hosts)
 
             for host in hosts:
-                await self.state_manager.update_hosts([host])
                 logger.info(f"Updated host: {host.ip_address} ({host.status})")
 
                 # Update service information
@@ -632,11 +670,14 @@ class CommandDispatcher:
                     total_services += 1
                     logger.info(f"Found service: {service.port}/{service.protocol} {service.service_name}")
 
+                if host.id in out_of_scope_ids:
+                    continue
+
                 # Automatic vulnerability detection
                 vulnerabilities = self.vulnerability_detector.detect_vulnerabilities(host)
+                detected_vulnerabilities.extend(vulnerabilities)
                 for vuln in vulnerabilities:
                     await self.state_manager.add_finding(vuln)
-                    total_vulnerabilities += 1
                     primary_cve = vuln.cve_ids[0] if vuln.cve_ids else "No CVE"
                     logger.info(f"Detected vulnerability: {primary_cve} - {vuln.title}")
 
@@ -652,13 +693,13 @@ class CommandDispatcher:
                             for suggestion in suggestions:
                                 self.ui_manager.print_info(f"   - {suggestion}")
 
-            # Parse and update vulnerability findings from nmap scripts
-            script_findings = self.nmap_parser.parse_findings(stdout)
-            for finding in script_findings:
+            # Update vulnerability findings from nmap scripts
+            for finding in parsed["findings"]:
                 await self.state_manager.add_finding(finding)
                 logger.info(f"Added script finding: {finding.title}")
 
             # UI update notification
+            total_vulnerabilities = len(detected_vulnerabilities)
             self.ui_manager.print_info(
                 f"State updated: {len(hosts)} hosts, {total_services} services, {total_vulnerabilities} vulnerabilities"
             )
@@ -677,20 +718,18 @@ class CommandDispatcher:
                 if total_vulnerabilities > 0:
                     self.ui_manager.show_success("Analysis complete. I found critical vulnerabilities:")
 
-                    # List detected vulnerabilities
-                    for host in hosts:
-                        vulns = self.vulnerability_detector.detect_vulnerabilities(host)
-                        for vuln in vulns:
-                            if vuln.cve_ids:
-                                cve_id = vuln.cve_ids[0]
-                                self.ui_manager.print_info(f"    - Service: {vuln.title}")
-                                self.ui_manager.print_info(f"    - Vulnerability: {cve_id} - Remote Command Execution")
-
-                                # Automatically record critical vulnerabilities
-                                if vuln.severity == "critical":
-                                    self.ui_manager.show_success(
-                                        f"Critical finding '{cve_id}' automatically recorded. Use /findings to view."
-                                    )
+                    # List the vulnerabilities detected above (no second detection pass)
+                    for vuln in detected_vulnerabilities:
+                        if vuln.cve_ids:
+                            cve_id = vuln.cve_ids[0]
+                            self.ui_manager.print_info(f"    - Service: {vuln.title}")
+                            self.ui_manager.print_info(f"    - Vulnerability: {cve_id} - Remote Command Execution")
+
+                            # Automatically record critical vulnerabilities
+                            if vuln.severity == "critical":
+                                self.ui_manager.show_success(
+                                    f"Critical finding '{cve_id}' automatically recorded. Use /findings to view."
+                                )
                 else:
                     self.ui_manager.show_info("No critical vulnerabilities detected in scanned services.")
 
@@ -698,6 +737,26 @@ class CommandDispatcher:
             logger.error(f"Failed to update state from nmap result: {e}")
             self.ui_manager.print_warning(f"Could not fully update state from nmap result: {e}")
 
+    @staticmethod
+    def _spooled_output_file(result: Any) -> str | None:
+        """Path of the spooled stdout of a tool result, if it was spooled."""
+        if isinstance(result, dict):
+            output_file = result.get("output_file")
+        else:
+            output_file = getattr(result, "output_file", None)
+        return output_file if isinstance(output_file, str) else None
+
+    def _full_output(self, result: Any, stdout: str) -> str:
+        """Complete stdout of a tool result, read back from its spool file when it has one."""
+        output_file = self._spooled_output_file(result)
+        if output_file is None:
+            return stdout
+        try:
+            return "".join(SpooledOutput(output_file).iter_lines())
+        except OSError as e:
+            logger.warning(f"Cannot read spooled output {output_file}, using the in-memory tail: {e}")
+            return stdout
+
     async def _update_from_nikto_result(self, result: Any) -> None:
         """Update state from nikto result."""
         # Parse nikto results and update state (simplified)
@@ -725,6 +784,9 @@ class CommandDispatcher:
                 logger.warning(f"Unknown smbclient result format: {type(result)}")
                 return
 
+            # stdout only holds a tail when the output was spooled
+            stdout = self._full_output(result, stdout)
+
             # Parse using smbclient parser
             if not self.smbclient_parser.can_parse(stdout):
                 logger.warning("smbclient output format not recognized")
@@ -805,6 +867,9 @@ class CommandDispatcher:
                 logger.warning(f"Unknown enum4linux result format: {type(result)}")
                 return
 
+            # stdout only holds a tail when the output was spooled
+            stdout = self._full_output(result, stdout)
+
             # Parse using enum4linux parser
             if not self.enum4linux_parser.can_parse(stdout):
                 logger.warning("enum4linux output format not recognized")
@@ -4,13 +4,18 @@ import asyncio
 import logging
 import threading
 import time
+from collections import deque
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Lines of streamed output kept for a running job
+LIVE_OUTPUT_LINES = 50
+
 
 class JobStatus(Enum):
     """Job status enumeration."""
@@ -40,9 +45,11 @@ class JobInfo:
     tool_name: str | None = None
     parameters: dict[str, Any] | None = None
     output: str | None = None  # Truncated output for display
-    full_output: str | None = None  # Complete output for logs
+    full_output: str | None = None  # Complete output for logs (only the tail when spooled)
+    output_file: str | None = None  # Complete raw stdout spooled to disk
     exit_code: int | None = None
     step_info: dict[str, Any] | None = None  # Original PlanStep information
+    live_output: deque[str] = field(default_factory=lambda: deque(maxlen=LIVE_OUTPUT_LINES))  # Tail while running
 
 
 class JobManager:
@@ -139,6 +146,9 @@ class JobManager:
                     else:
                         job_info.output = job_info.full_output
 
+                if isinstance(result.get("output_file"), str):
+                    job_info.output_file = result["output_file"]
+
                 if "exit_code" in result:
                     job_info.exit_code = result["exit_code"]
                 elif "success" in result:
@@ -152,6 +162,9 @@ class JobManager:
                 else:
                     job_info.output = job_info.full_output
                 job_info.exit_code = 0 if result.success else 1
+                output_file = getattr(result, "output_file", None)
+                if isinstance(output_file, str):
+                    job_info.output_file = output_file
 
             # Check for failure patterns in output
             failure_detected = self._detect_failure_in_output(job_info)
@@ -210,6 +223,15 @@ class JobManager:
 
         return False
 
+    def record_output(self, job_id: str, text: str) -> None:
+        """Record streamed output of a running job, keeping only its latest lines."""
+        job_info = self.jobs.get(job_id)
+        if job_info is None or job_info.status != JobStatus.RUNNING:
+            return
+
+        job_info.live_output.extend(text.splitlines())
+        job_info.output = "\n".join(job_info.live_output)
+
     def get_job_status(self, job_id: str) -> JobStatus | None:
         """Get job status."""
         job_info = self.jobs.get(job_id)
@@ -307,7 +329,9 @@ class JobManager:
                 to_remove.append(job_id)
 
         for job_id in to_remove:
-            del self.jobs[job_id]
+            job_info = self.jobs.pop(job_id)
+            if job_info.output_file:
+                Path(job_info.output_file).unlink(missing_ok=True)
             # Also clean up any remaining callbacks
             self._completion_callbacks.pop(job_id, None)
 
@@ -14,7 +14,7 @@ class VulnerabilityDetector:
     """Automatic vulnerability detection class."""
 
     def __init__(self) -> None:
-        self.vulnerability_patterns = {
+        self.vulnerability_patterns: dict[str, dict[str, Any]] = {
             "samba_usermap_script": {
                 "pattern": r"Samba\s+3\.0\.20",
                 "service_names": ["netbios-ssn", "microsoft-ds"],
@@ -49,6 +49,7 @@ class VulnerabilityDetector:
                 "category": "vulnerability",
             },
         }
+        self._patterns_by_port = self._index_patterns_by_port()
 
     def detect_vulnerabilities(self, host: Host) -> list[Finding]:
         """Detect vulnerabilities for host."""
@@ -67,8 +68,8 @@ class VulnerabilityDetector:
         # Build service information
         service_info = self._build_service_info(service)
 
-        # Check each vulnerability pattern
-        for _vuln_id, vuln_data in self.vulnerability_patterns.items():
+        # Only patterns registered for this port can match
+        for vuln_data in self._patterns_by_port.get(service.port, []):
             if self._matches_vulnerability(service, service_info, vuln_data):
                 finding = self._create_finding(vuln_data, service, host)
                 findings.append(finding)
@@ -76,6 +77,14 @@ class VulnerabilityDetector:
 
         return findings
 
+    def _index_patterns_by_port(self) -> dict[int, list[dict[str, Any]]]:
+        """Group vulnerability patterns by the ports they apply to."""
+        patterns_by_port: dict[int, list[dict[str, Any]]] = {}
+        for vuln_data in self.vulnerability_patterns.values():
+            for port in vuln_data["ports"]:
+                patterns_by_port.setdefault(port, []).append(vuln_data)
+        return patterns_by_port
+
     def _build_service_info(self, service: Service) -> str:
         """Build service information as string."""
         info_parts = []
@@ -10,6 +10,8 @@ from unittest.mock import AsyncMock
 
 from rich.text import Text
 from wish_ai.planning.models import Plan
+from wish_core.persistence import AutoSaveManager, SessionStore, StateChangeTracker
+from wish_core.state import StateChanges
 from wish_models.engagement import EngagementState
 from wish_models.session import SessionMetadata
 
@@ -266,6 +268,14 @@ class HeadlessSession:
         """Get current engagement state."""
         return await self.wish_client._get_state()
 
+    def get_revision(self) -> int:
+        """Get the current engagement state revision."""
+        return self.wish_client.state_manager.revision
+
+    def get_changes_since(self, revision: int) -> StateChanges:
+        """Get what changed in the engagement state after the given revision."""
+        return self.wish_client.state_manager.changes_since(revision)
+
     async def end(self) -> SessionSummary:
         """End the session."""
         return await self.wish_client._end_session(self.session_id)
@@ -274,8 +284,18 @@ class HeadlessSession:
 class HeadlessWish:
     """Headless mode Python SDK for wish."""
 
-    def __init__(self, auto_approve: bool = False):
+    def __init__(self, auto_approve: bool = False, session_dir: str | None = None):
+        """Create a headless client.
+
+        Args:
+            auto_approve: Approve generated plans without asking
+            session_dir: Base directory to persist the session in, auto-saved
+                (and journaled) as configured; the session is only kept in
+                memory when None
+        """
         self.auto_approve = auto_approve
+        self.session_dir = session_dir
+        self.auto_save_manager: AutoSaveManager | None = None
         self._event_handlers: dict[str, list[Callable]] = {}
         self._active_session: HeadlessSession | None = None
         self._last_log_index = 0  # Track log position for headless output
@@ -291,21 +311,34 @@ class HeadlessWish:
         from wish_ai.conversation.manager import ConversationManager
         from wish_ai.gateway.openai import OpenAIGateway
         from wish_ai.planning.generator import PlanGenerator
-        from wish_core.config import ConfigManager
-        from wish_core.session import InMemorySessionManager
+        from wish_core.config import get_config_manager
+        from wish_core.events import EventBus
+        from wish_core.session import FileSessionManager, InMemorySessionManager
         from wish_core.state.manager import InMemoryStateManager
         from wish_tools.execution.executor import ToolExecutor
 
         from wish_cli.core.command_dispatcher import CommandDispatcher
 
-        # Initialize real config manager
-        self.config_manager = ConfigManager()
-
-        # Initialize real session manager
-        self.session_manager = InMemorySessionManager()
-
-        # Initialize real state manager
-        self.state_manager = InMemoryStateManager()
+        # Share the process-wide config manager (and its parsed config)
+        self.config_manager = get_config_manager()
+
+        # Initialize real state manager; subscribers run off the mutation path unless configured otherwise
+        self.event_bus = EventBus(mode=self.config_manager.get_general_config().event_bus_mode)
+        self.state_manager = InMemoryStateManager(event_bus=self.event_bus)
+
+        # Initialize real session manager, persisted like the interactive CLI when a directory is given
+        if self.session_dir is not None:
+            general_config = self.config_manager.get_general_config()
+            session_store = SessionStore.from_config(general_config, base_path=self.session_dir)
+            self.session_manager = FileSessionManager(session_store)
+            self.auto_save_manager = AutoSaveManager(
+                session_store=session_store,
+                save_interval=general_config.auto_save_interval,
+                state_provider=self.state_manager.get_current_state_sync,
+            )
+            StateChangeTracker(self.auto_save_manager).watch(self.state_manager)
+        else:
+            self.session_manager = InMemorySessionManager()
 
         # Initialize conversation manager
         self.conversation_manager = ConversationManager()
@@ -363,6 +396,8 @@ class HeadlessWish:
         )
 
         self._active_session = session
+        if self.auto_save_manager is not None:
+            await self.auto_save_manager.start_auto_save()
         logger.info(f"Started headless session {session.session_id}")
         return session
 
@@ -381,11 +416,8 @@ class HeadlessWish:
 
     async def _send_prompt(self, session_id: str, prompt: str) -> PromptResult:
         """Internal: Send prompt to session."""
-        state_before = await self.state_manager.get_current_state()
-        # Create a deep copy to avoid mutation issues
-        import copy
-
-        state_before = copy.deepcopy(state_before)
+        # Copy-on-write snapshot, so later mutations do not leak into the result
+        state_before = await self.state_manager.snapshot()
 
         start_time = time.time()
 
@@ -422,7 +454,7 @@ class HeadlessWish:
             )
 
             execution_time = time.time() - start_time
-            state_after = await self.state_manager.get_current_state()
+            state_after = await self.state_manager.snapshot()
 
             # Add command to history if method exists
             if hasattr(self.state_manager, "add_command_to_history"):
@@ -449,7 +481,7 @@ class HeadlessWish:
         except Exception as e:
             logger.error(f"Error processing command: {e}", exc_info=True)
             execution_time = time.time() - start_time
-            state_after = await self.state_manager.get_current_state()
+            state_after = await self.state_manager.snapshot()
 
             # Fire error event
             from .events import EventType
@@ -479,7 +511,9 @@ class HeadlessWish:
         duration = time.time() - self._active_session.created_at
         current_state = await self.state_manager.get_current_state()
 
-        # Save session
+        # Flush pending changes, then save a full snapshot
+        if self.auto_save_manager is not None:
+            await self.auto_save_manager.stop_auto_save()
         await self.session_manager.save_session(current_state)
 
         # Create summary (use actual command history from state)
@@ -538,7 +572,14 @@ class HeadlessWish:
             # Wait for jobs to finish with longer timeout
             await asyncio.sleep(1.0)
 
-        # 2. Cleanup command dispatcher
+        # 2. Stop auto-save (saving what is still pending)
+        if self.auto_save_manager is not None:
+            await self.auto_save_manager.stop_auto_save()
+
+        # 3. Deliver events still queued for subscribers
+        await self.event_bus.close()
+
+        # 4. Cleanup command dispatcher
         if hasattr(self, "command_dispatcher"):
             # Cancel any pending tasks
             if hasattr(self.command_dispatcher, "_background_tasks"):
@@ -550,7 +591,7 @@ class HeadlessWish:
                         except (asyncio.CancelledError, Exception) as e:
                             logger.debug(f"Task cancellation: {e}")
 
-        # 3. Cleanup AI gateway (OpenAI client)
+        # 5. Cleanup AI gateway (OpenAI client)
         if hasattr(self, "ai_gateway"):
             try:
                 # Use the close method we just added
@@ -559,10 +600,10 @@ class HeadlessWish:
             except Exception as e:
                 logger.debug(f"Error closing AI gateway client: {e}")
 
-        # 4. Wait for subprocess cleanup
+        # 6. Wait for subprocess cleanup
         await asyncio.sleep(1.0)
 
-        # 5. Cleanup all pending asyncio tasks
+        # 7. Cleanup all pending asyncio tasks
         current_task = asyncio.current_task()
         all_tasks = [t for t in asyncio.all_tasks() if t != current_task and not t.done()]
 
@@ -577,7 +618,7 @@ class HeadlessWish:
             except TimeoutError:
                 logger.warning("Some tasks did not complete within timeout")
 
-        # 6. Final sleep to ensure all cleanup is done
+        # 8. Final sleep to ensure all cleanup is done
         await asyncio.sleep(0.5)
 
         logger.info("HeadlessWish cleanup completed")
@@ -3,6 +3,7 @@
 from dataclasses import dataclass
 from typing import Any
 
+from wish_core.state import StateDiff, diff_states
 from wish_models.engagement import EngagementState
 
 
@@ -16,6 +17,10 @@ class PromptResult:
     state_after: EngagementState
     execution_time: float
 
+    def diff(self) -> StateDiff:
+        """List what the prompt changed in the engagement state."""
+        return diff_states(self.state_before, self.state_after)
+
 
 @dataclass
 class SessionSummary:
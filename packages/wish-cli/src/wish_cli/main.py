@@ -13,15 +13,19 @@ from wish_ai.conversation.manager import ConversationManager
 from wish_ai.gateway.openai import OpenAIGateway
 from wish_ai.planning.generator import PlanGenerator
 from wish_c2 import create_c2_connector
-from wish_core.config.manager import ConfigManager
+from wish_core.config.manager import get_config_manager
+from wish_core.events import EventBus
 from wish_core.persistence import SessionStore
 from wish_core.persistence.auto_save import AutoSaveManager
+from wish_core.persistence.state_tracker import StateChangeTracker
 from wish_core.session import FileSessionManager
 from wish_core.state.manager import InMemoryStateManager
 from wish_knowledge import KnowledgeConfig, Retriever
 from wish_knowledge.config import EmbeddingConfig
 from wish_knowledge.manager import KnowledgeManager, check_knowledge_initialized
 from wish_tools.execution.executor import ToolExecutor
+from wish_tools.execution.msfconsole_pool import MsfconsolePool
+from wish_tools.execution.spool import sweep_spool_dir
 
 from wish_cli.cli.hybrid import HybridWishCLI as WishCLI
 from wish_cli.core.command_dispatcher import CommandDispatcher
@@ -38,11 +42,13 @@ class WishApp:
         self.ui_manager: WishUIManager | None = None
         self.shutdown_event = asyncio.Event()
         self.auto_save_manager: AutoSaveManager | None = None
+        self.event_bus: EventBus | None = None
+        self.tool_executor: ToolExecutor | None = None
 
     async def initialize(self) -> None:
         """Initialize all components."""
         # Configuration
-        config_manager = ConfigManager()
+        config_manager = get_config_manager()
         config = config_manager.load_config()
 
         # Setup logging based on debug mode
@@ -92,9 +98,11 @@ class WishApp:
             logging.info(f"Logs written to {log_file}")
 
         # Core components
-        session_store = SessionStore()
+        session_store = SessionStore.from_config(config.general)
         session_manager = FileSessionManager(session_store)
-        state_manager = InMemoryStateManager()
+        # Subscribers run off the mutation path unless configured otherwise
+        self.event_bus = EventBus(mode=config.general.event_bus_mode)
+        state_manager = InMemoryStateManager(event_bus=self.event_bus)
 
         # AI components
         ai_gateway = OpenAIGateway(
@@ -107,8 +115,19 @@ class WishApp:
         conversation_manager = ConversationManager()
         plan_generator = PlanGenerator(ai_gateway)
 
-        # Tool execution
-        tool_executor = ToolExecutor()
+        # Tool execution (spool files are otherwise only removed by job cleanup,
+        # so output left by earlier sessions is swept here)
+        swept = sweep_spool_dir()
+        if swept:
+            logger.info(f"Removed {swept} old spooled output files")
+        msfconsole_pool = None
+        if config.tools.msfconsole_pool_size > 0:
+            msfconsole_pool = MsfconsolePool(
+                size=config.tools.msfconsole_pool_size,
+                max_commands=config.tools.msfconsole_max_commands,
+            )
+        tool_executor = ToolExecutor(msfconsole_pool=msfconsole_pool)
+        self.tool_executor = tool_executor
 
         # Initialize knowledge base
         knowledge_config = KnowledgeConfig(
@@ -180,9 +199,11 @@ class WishApp:
         # Auto-save manager
         self.auto_save_manager = AutoSaveManager(
             session_store=session_store,
-            save_interval=30,  # Auto-save every 30 seconds
+            save_interval=30,  # Save changes at most 30 seconds after they happen
             state_provider=lambda: state_manager.get_current_state_sync(),
         )
+        # Every state mutation marks the changed entity for the next (incremental) save
+        StateChangeTracker(self.auto_save_manager).watch(state_manager)
 
         # UI components (initialize only if not already done during knowledge import)
         if not self.ui_manager:
@@ -253,12 +274,19 @@ class WishApp:
         if self.auto_save_manager:
             await self.auto_save_manager.stop_auto_save()
 
+        # Deliver events still queued for subscribers
+        if self.event_bus:
+            await self.event_bus.close()
+
         if self.cli:
             await self.cli.shutdown()
 
         if self.ui_manager:
             await self.ui_manager.shutdown()
 
+        if self.tool_executor:
+            await self.tool_executor.shutdown()
+
     def _load_sliver_config(self) -> dict[str, Any]:
         """Load Sliver configuration from multiple sources.
 
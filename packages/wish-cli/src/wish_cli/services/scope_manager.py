@@ -4,12 +4,16 @@ import logging
 from typing import TYPE_CHECKING
 
 from wish_models.engagement import Target
+from wish_models.host import Host
 
 if TYPE_CHECKING:
     from wish_core.state.manager import StateManager
 
 logger = logging.getLogger(__name__)
 
+# Tag given to discovered hosts that fall outside the defined scope
+OUT_OF_SCOPE_TAG = "out-of-scope"
+
 
 class ScopeManager:
     """Manages target scope operations."""
@@ -29,6 +33,27 @@ class ScopeManager:
             lines.append(f"  [wish.step]⎿[/wish.step] [cyan]{target.scope}[/cyan] ({target.scope_type})")
         return lines
 
+    async def is_in_scope(self, address: str) -> bool:
+        """Check whether an IP address, CIDR, URL or domain is in scope."""
+        engagement_state = await self.state_manager.get_current_state()
+        return engagement_state.is_in_scope(address)
+
+    async def filter_hosts(self, hosts: list[Host]) -> tuple[list[Host], list[Host]]:
+        """Split parsed hosts into (in scope, out of scope); everything is in scope when none is defined."""
+        engagement_state = await self.state_manager.get_current_state()
+        scope = engagement_state.scope_index()
+        if scope.is_empty:
+            return list(hosts), []
+        return scope.filter_hosts(hosts)
+
+    async def flag_out_of_scope(self, hosts: list[Host]) -> list[Host]:
+        """Tag the hosts that fall outside the defined scope and return them (none when no scope is defined)."""
+        _, out_of_scope = await self.filter_hosts(hosts)
+        for host in out_of_scope:
+            if OUT_OF_SCOPE_TAG not in host.tags:
+                host.tags.append(OUT_OF_SCOPE_TAG)
+        return out_of_scope
+
     async def add_target(self, target_scope: str) -> tuple[bool, str]:
         """Add a target to scope."""
         try:
@@ -3,6 +3,7 @@
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+from wish_models import EngagementState, SessionMetadata
 
 from wish_cli.core.command_dispatcher import CommandDispatcher
 from wish_cli.core.job_manager import JobInfo, JobStatus
@@ -15,9 +16,14 @@ class TestCommandDispatcherJobCompletion:
     @pytest.fixture
     def mock_dependencies(self):
         """Create mock dependencies for CommandDispatcher."""
+        state_manager = AsyncMock()
+        # No targets defined, so scope filtering keeps every parsed host
+        state_manager.get_current_state.return_value = EngagementState(
+            name="Test", session_metadata=SessionMetadata(session_id="test")
+        )
         return {
             "ui_manager": Mock(),
-            "state_manager": AsyncMock(),
+            "state_manager": state_manager,
             "session_manager": AsyncMock(),
             "conversation_manager": Mock(),
             "plan_generator": Mock(),
@@ -51,7 +57,7 @@ class TestCommandDispatcherJobCompletion:
 
         # Mock nmap parser
         command_dispatcher.nmap_parser.can_parse.return_value = True
-        command_dispatcher.nmap_parser.parse_hosts.return_value = []
+        command_dispatcher.nmap_parser.parse_all.return_value = {"hosts": [], "services": [], "findings": []}
 
         # Should not raise an exception
         await command_dispatcher.handle_job_completion("test_job_001", job_info)
@@ -80,7 +86,7 @@ class TestCommandDispatcherJobCompletion:
 
         # Mock nmap parser
         command_dispatcher.nmap_parser.can_parse.return_value = True
-        command_dispatcher.nmap_parser.parse_hosts.return_value = []
+        command_dispatcher.nmap_parser.parse_all.return_value = {"hosts": [], "services": [], "findings": []}
 
         # Should handle object format correctly
         await command_dispatcher.handle_job_completion("test_job_002", job_info)
@@ -103,14 +109,18 @@ class TestCommandDispatcherJobCompletion:
         mock_host.ip_address = "10.10.10.3"
         mock_host.status = "up"
         mock_host.services = []
-        command_dispatcher.nmap_parser.parse_hosts.return_value = [mock_host]
+        command_dispatcher.nmap_parser.parse_all.return_value = {"hosts": [mock_host], "services": [], "findings": []}
         command_dispatcher.vulnerability_detector.detect_vulnerabilities.return_value = []
 
         # Should not raise AttributeError
         await command_dispatcher._update_from_nmap_result(result)
 
-        # Verify state was updated
-        command_dispatcher.state_manager.update_hosts.assert_called_once()
+        # Verify state was updated with a single batch merge
+        command_dispatcher.state_manager.merge_hosts.assert_called_once_with([mock_host])
+        # The output is parsed once for every entity type
+        command_dispatcher.nmap_parser.parse_all.assert_called_once()
+        command_dispatcher.nmap_parser.parse_hosts.assert_not_called()
+        command_dispatcher.nmap_parser.parse_findings.assert_not_called()
 
     async def test_update_from_nmap_result_object_format(self, command_dispatcher):
         """Test _update_from_nmap_result with object format."""
@@ -125,14 +135,14 @@ class TestCommandDispatcherJobCompletion:
         mock_host.ip_address = "10.10.10.3"
         mock_host.status = "up"
         mock_host.services = []
-        command_dispatcher.nmap_parser.parse_hosts.return_value = [mock_host]
+        command_dispatcher.nmap_parser.parse_all.return_value = {"hosts": [mock_host], "services": [], "findings": []}
         command_dispatcher.vulnerability_detector.detect_vulnerabilities.return_value = []
 
         # Should handle object format
         await command_dispatcher._update_from_nmap_result(result)
 
-        # Verify state was updated
-        command_dispatcher.state_manager.update_hosts.assert_called_once()
+        # Verify state was updated with a single batch merge
+        command_dispatcher.state_manager.merge_hosts.assert_called_once_with([mock_host])
 
     async def test_handle_job_completion_with_failed_job(self, command_dispatcher):
         """Test handling job completion when job failed."""
@@ -148,7 +158,7 @@ class TestCommandDispatcherJobCompletion:
         await command_dispatcher.handle_job_completion("test_job_003", job_info)
 
         # Verify state was not updated
-        command_dispatcher.state_manager.update_hosts.assert_not_called()
+        command_dispatcher.state_manager.merge_hosts.assert_not_called()
 
     async def test_handle_job_completion_missing_step_info(self, command_dispatcher):
         """Test handling job completion when step_info is missing."""
@@ -164,7 +174,7 @@ class TestCommandDispatcherJobCompletion:
         await command_dispatcher.handle_job_completion("test_job_004", job_info)
 
         # Verify no state update attempted
-        command_dispatcher.state_manager.update_hosts.assert_not_called()
+        command_dispatcher.state_manager.merge_hosts.assert_not_called()
 
     async def test_handle_job_completion_with_empty_result(self, command_dispatcher):
         """Test handling job completion when result is empty."""
@@ -180,4 +190,58 @@ class TestCommandDispatcherJobCompletion:
         await command_dispatcher.handle_job_completion("test_job_005", job_info)
 
         # Verify no state update attempted
-        command_dispatcher.state_manager.update_hosts.assert_not_called()
+        command_dispatcher.state_manager.merge_hosts.assert_not_called()
+
+    async def test_update_from_smbclient_result_reads_spool_file(self, command_dispatcher, tmp_path):
+        """Test that the smbclient handler parses the complete spooled output, not the in-memory tail."""
+        spool = tmp_path / "smbclient.out"
+        spool.write_text(
+            "Anonymous login successful\n\n"
+            "\tSharename       Type      Comment\n"
+            "\t---------       ----      -------\n"
+            "\ttmp             Disk      oh noes!\n"
+            "\tIPC$            IPC       IPC Service (Samba 3.0.20-Debian)\n\n"
+            "SMB1 disabled -- no workgroup available\n"
+        )
+        result = {
+            "success": True,
+            "output": "SMB1 disabled -- no workgroup available\n",
+            "output_file": str(spool),
+        }
+
+        await command_dispatcher._update_from_smbclient_result(result)
+
+        titles = [call.args[0].title for call in command_dispatcher.state_manager.add_finding.call_args_list]
+        assert "SMB Anonymous Access Allowed" in titles
+        assert "Potentially Interesting SMB Share: tmp" in titles
+
+    async def test_update_from_nmap_result_domain_only_scope(self, command_dispatcher, mock_dependencies):
+        """Test that hosts outside a domain-only scope are kept, flagged and not analyzed."""
+        from wish_models import Host, Target
+
+        state = EngagementState(name="Test", session_metadata=SessionMetadata(session_id="test"))
+        target = Target(scope="example.com", scope_type="domain")
+        state.targets[target.id] = target
+        mock_dependencies["state_manager"].get_current_state.return_value = state
+
+        in_scope = Host(ip_address="10.0.0.1", hostnames=["www.example.com"], discovered_by="nmap")
+        other_domain = Host(ip_address="10.0.0.2", hostnames=["mail.other.org"], discovered_by="nmap")
+        unnamed = Host(ip_address="10.0.0.3", discovered_by="nmap")
+        command_dispatcher.nmap_parser.can_parse.return_value = True
+        command_dispatcher.nmap_parser.parse_all.return_value = {
+            "hosts": [in_scope, other_domain, unnamed],
+            "services": [],
+            "findings": [],
+        }
+        command_dispatcher.vulnerability_detector.detect_vulnerabilities.return_value = []
+
+        await command_dispatcher._update_from_nmap_result({"success": True, "output": "Nmap scan report"})
+
+        merged = command_dispatcher.state_manager.merge_hosts.call_args.args[0]
+        assert merged == [in_scope, other_domain, unnamed]
+        assert "out-of-scope" not in in_scope.tags
+        assert "out-of-scope" in other_domain.tags
+        assert "out-of-scope" in unnamed.tags
+        command_dispatcher.vulnerability_detector.detect_vulnerabilities.assert_called_once_with(in_scope)
+        warning = command_dispatcher.ui_manager.print_warning.call_args.args[0]
+        assert warning.startswith("2 host(s) outside the defined scope")
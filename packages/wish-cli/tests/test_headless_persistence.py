@@ -0,0 +1,51 @@
+"""Tests for session persistence in headless mode."""
+
+from unittest.mock import Mock
+
+import pytest
+from wish_core.config import ConfigManager
+from wish_core.persistence import SessionStore
+from wish_models import Host
+
+from wish_cli.headless.client import HeadlessWish
+
+
+@pytest.fixture
+def headless_wish(tmp_path, monkeypatch):
+    """Create a HeadlessWish persisting its session under tmp_path with default config."""
+    # No LLM is involved in persistence
+    monkeypatch.setattr("wish_ai.gateway.openai.OpenAIGateway", Mock)
+    config_manager = ConfigManager(config_path=str(tmp_path / "config.toml"))
+    monkeypatch.setattr("wish_core.config.get_config_manager", lambda: config_manager)
+    return HeadlessWish(session_dir=str(tmp_path / "wish"))
+
+
+@pytest.mark.asyncio
+async def test_state_changes_are_journaled(headless_wish, tmp_path):
+    """Test that state changes reach the session journal and are replayed on load."""
+    session_store = headless_wish.session_manager.session_store
+    assert session_store.journal_mode
+
+    session = await headless_wish.start_session()
+    # The first save writes the snapshot the journal builds on
+    assert await headless_wish.auto_save_manager.force_save()
+    snapshot = session_store.current_session_file.read_bytes()
+
+    host = Host(ip_address="10.0.0.5", discovered_by="nmap")
+    await headless_wish.state_manager.merge_hosts([host])
+    assert headless_wish.auto_save_manager.dirty_entities == {("hosts", host.id)}
+    assert await headless_wish.auto_save_manager.force_save()
+
+    # Only the journal was written
+    assert session_store.current_session_file.read_bytes() == snapshot
+    assert session_store.journal_record_count > 0
+
+    # Crash recovery: a fresh store replays the journal on top of the snapshot
+    recovered = await SessionStore(base_path=str(tmp_path / "wish")).load_current_session()
+    assert recovered is not None
+    assert host.id in recovered.hosts
+
+    # Ending the session folds the journal into a new snapshot
+    await session.end()
+    assert not session_store.journal_file.exists()
+    assert not headless_wish.auto_save_manager.is_running
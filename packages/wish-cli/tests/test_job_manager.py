@@ -0,0 +1,68 @@
+"""Tests for JobManager live output."""
+
+import time
+
+from wish_cli.core.job_manager import LIVE_OUTPUT_LINES, JobInfo, JobManager, JobStatus
+
+
+class TestJobManagerLiveOutput:
+    """Test streamed output recording."""
+
+    def test_record_output_keeps_latest_lines(self):
+        """Test that a running job shows only its latest streamed lines."""
+        manager = JobManager()
+        manager.jobs["job_001"] = JobInfo(job_id="job_001", description="scan", status=JobStatus.RUNNING)
+
+        for i in range(LIVE_OUTPUT_LINES + 10):
+            manager.record_output("job_001", f"line {i}\n")
+
+        lines = manager.jobs["job_001"].output.split("\n")
+        assert len(lines) == LIVE_OUTPUT_LINES
+        assert lines[-1] == f"line {LIVE_OUTPUT_LINES + 9}"
+
+    def test_record_output_ignores_finished_jobs(self):
+        """Test that output arriving after completion does not replace the final output."""
+        manager = JobManager()
+        manager.jobs["job_001"] = JobInfo(
+            job_id="job_001", description="scan", status=JobStatus.COMPLETED, output="final"
+        )
+
+        manager.record_output("job_001", "late line\n")
+        manager.record_output("job_999", "unknown job\n")
+
+        assert manager.jobs["job_001"].output == "final"
+
+
+class TestJobManagerSpooledOutput:
+    """Test spooled output files of jobs."""
+
+    async def test_job_records_output_file(self, tmp_path):
+        """Test that the spool file reported by a tool is kept with the job."""
+        manager = JobManager()
+        output_file = str(tmp_path / "job.out")
+
+        async def run():
+            return {"success": True, "output": "tail", "output_file": output_file, "exit_code": 0}
+
+        job_id = await manager.start_job(run(), description="scan")
+        await manager.wait_for_job(job_id)
+
+        assert manager.jobs[job_id].output_file == output_file
+
+    def test_cleanup_removes_output_file(self, tmp_path):
+        """Test that cleaning up old jobs deletes their spool files."""
+        manager = JobManager()
+        output_file = tmp_path / "job.out"
+        output_file.write_text("output")
+        manager.jobs["job_001"] = JobInfo(
+            job_id="job_001",
+            description="scan",
+            status=JobStatus.COMPLETED,
+            completed_at=time.time() - 7200,
+            output_file=str(output_file),
+        )
+
+        manager.cleanup_completed_jobs(max_age_seconds=3600)
+
+        assert "job_001" not in manager.jobs
+        assert not output_file.exists()
@@ -7,17 +7,19 @@ for the wish penetration testing command center.
 
 from .config import ConfigManager, WishConfig
 from .events import EngagementEvent, EventBus
-from .parsers import ParserRegistry, ToolParser
+from .parsers import ParserMatch, ParserRegistry, ToolParser
 from .session import SessionManager
-from .state import InMemoryStateManager, StateManager
+from .state import InMemoryStateManager, SQLiteStateManager, StateManager
 
 __all__ = [
     "StateManager",
     "InMemoryStateManager",
+    "SQLiteStateManager",
     "EngagementEvent",
     "EventBus",
     "SessionManager",
     "ParserRegistry",
+    "ParserMatch",
     "ToolParser",
     "ConfigManager",
     "WishConfig",
@@ -5,6 +5,6 @@ This module provides configuration management for the wish platform,
 including reading from ~/.wish/config.toml and environment variables.
 """
 
-from .manager import ConfigManager, WishConfig, get_api_key, get_config_manager, get_llm_config
+from .manager import ConfigManager, WishConfig, get_api_key, get_config_manager, get_llm_config, reload_config
 
-__all__ = ["ConfigManager", "WishConfig", "get_api_key", "get_config_manager", "get_llm_config"]
+__all__ = ["ConfigManager", "WishConfig", "get_api_key", "get_config_manager", "get_llm_config", "reload_config"]
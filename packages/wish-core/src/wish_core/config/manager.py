@@ -7,6 +7,7 @@ including reading from ~/.wish/config.toml and environment variables.
 
 import logging
 import os
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -14,8 +15,16 @@ import tomli as tomllib
 import tomli_w
 from pydantic import BaseModel, Field
 
+from ..events import PublishMode
+
 logger = logging.getLogger(__name__)
 
+# Environment variables applied on top of the config file
+ENV_OVERRIDE_VARS = ("OPENAI_API_KEY", "WISH_LLM_TIMEOUT", "WISH_DEBUG")
+
+# File identity (mtime, size) plus the override values a cached config was built from
+_ConfigStamp = tuple[tuple[int, int] | None, tuple[str | None, ...]]
+
 
 class LLMConfig(BaseModel):
     """LLM configuration section."""
@@ -35,6 +44,10 @@ class GeneralConfig(BaseModel):
     auto_save_interval: int = 30
     max_session_history: int = 10
     debug_mode: bool = False
+    session_format: str = "json"  # json, orjson or msgpack
+    session_journal: bool = True  # Append incremental saves to a journal instead of rewriting the snapshot
+    session_compact_threshold: int = 500  # Journal records that trigger a new snapshot
+    event_bus_mode: PublishMode = "queued"  # Queued event delivery never delays state updates
 
 
 class C2Config(BaseModel):
@@ -45,12 +58,20 @@ class C2Config(BaseModel):
     sliver_cert_path: str = "~/.sliver/configs/default.crt"
 
 
+class ToolsConfig(BaseModel):
+    """Tool execution configuration section."""
+
+    msfconsole_pool_size: int = 0  # Long-lived msfconsole workers; 0 starts one per command
+    msfconsole_max_commands: int = 50  # Commands before a worker is replaced
+
+
 class WishConfig(BaseModel):
     """Main configuration model for wish."""
 
     general: GeneralConfig = Field(default_factory=GeneralConfig)
     llm: LLMConfig = Field(default_factory=LLMConfig)
     c2: C2Config = Field(default_factory=C2Config)
+    tools: ToolsConfig = Field(default_factory=ToolsConfig)
 
 
 class ConfigManager:
@@ -64,6 +85,8 @@ class ConfigManager:
         """
         self.config_path = Path(config_path or "~/.wish/config.toml").expanduser()
         self._config: WishConfig | None = None
+        self._config_stamp: _ConfigStamp | None = None
+        self._reload_hooks: list[Callable[[WishConfig], None]] = []
         self._ensure_config_dir()
 
     def _ensure_config_dir(self) -> None:
@@ -77,17 +100,24 @@ class ConfigManager:
     def load_config(self) -> WishConfig:
         """Load configuration from file and environment variables.
 
+        The parsed configuration is cached and only rebuilt when the config
+        file's mtime/size or one of the environment overrides changes, so
+        repeated calls cost a single stat().
+
         Returns:
             WishConfig object with loaded configuration
         """
-        if self._config is not None:
+        stamp = self._current_stamp()
+        if self._config is not None and stamp == self._config_stamp:
             return self._config
 
+        reloading = self._config is not None
+
         # Start with default configuration
         config_data = {}
 
         # Load from file if it exists
-        if self.config_path.exists():
+        if stamp[0] is not None:
             try:
                 with open(self.config_path, "rb") as f:
                     config_data = tomllib.load(f)
@@ -103,8 +133,64 @@ class ConfigManager:
 
         # Create and cache configuration
         self._config = WishConfig(**config_data)
+        self._config_stamp = stamp
+
+        if reloading:
+            self._notify_reload(self._config)
         return self._config
 
+    def reload(self) -> WishConfig:
+        """Drop the cached configuration and load it again.
+
+        Registered reload hooks are called with the new configuration.
+
+        Returns:
+            Freshly loaded WishConfig
+        """
+        self.invalidate()
+        config = self.load_config()
+        self._notify_reload(config)
+        return config
+
+    def invalidate(self) -> None:
+        """Drop the cached configuration so the next access re-reads it."""
+        self._config = None
+        self._config_stamp = None
+
+    def add_reload_hook(self, hook: Callable[[WishConfig], None]) -> None:
+        """Register a callback run whenever the configuration is reloaded.
+
+        Args:
+            hook: Called with the new WishConfig after a reload
+        """
+        self._reload_hooks.append(hook)
+
+    def remove_reload_hook(self, hook: Callable[[WishConfig], None]) -> None:
+        """Unregister a reload callback.
+
+        Args:
+            hook: Previously registered callback
+        """
+        if hook in self._reload_hooks:
+            self._reload_hooks.remove(hook)
+
+    def _notify_reload(self, config: WishConfig) -> None:
+        """Run reload hooks, logging (not raising) their failures."""
+        for hook in list(self._reload_hooks):
+            try:
+                hook(config)
+            except Exception as e:
+                logger.warning(f"Config reload hook {hook!r} failed: {e}")
+
+    def _current_stamp(self) -> _ConfigStamp:
+        """Identify the config file version and environment overrides in effect."""
+        try:
+            stat = self.config_path.stat()
+            file_stamp: tuple[int, int] | None = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_stamp = None
+        return file_stamp, tuple(os.getenv(name) for name in ENV_OVERRIDE_VARS)
+
     def _apply_env_overrides(self, config_data: dict[str, Any]) -> dict[str, Any]:
         """Apply environment variable overrides to configuration.
 
@@ -219,8 +305,9 @@ class ConfigManager:
         config.llm.api_key = api_key
         self.save_config(config)
 
-        # Update cached config
+        # Update cached config; our own write does not need a re-parse
         self._config = config
+        self._config_stamp = self._current_stamp()
 
         logger.info("OpenAI API key updated in configuration")
 
@@ -302,6 +389,15 @@ def get_config_manager() -> ConfigManager:
     return _config_manager
 
 
+def reload_config() -> WishConfig:
+    """Reload the global configuration, running its reload hooks.
+
+    Returns:
+        Freshly loaded WishConfig
+    """
+    return get_config_manager().reload()
+
+
 def get_api_key() -> str | None:
     """Convenience function to get OpenAI API key.
 
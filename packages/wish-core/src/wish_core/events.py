@@ -1,11 +1,16 @@
 """Event system for wish-core."""
 
+import asyncio
+import logging
+import time
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Literal
 
 from wish_models import CollectedData, Finding, Host
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class HostDiscovered:
@@ -14,6 +19,14 @@ class HostDiscovered:
     host: Host
 
 
+@dataclass
+class HostsMerged:
+    """Event for when a batch of hosts is merged into the engagement."""
+
+    added_host_ids: list[str]
+    updated_host_ids: list[str]
+
+
 @dataclass
 class FindingAdded:
     """Event for when a finding is added."""
@@ -36,14 +49,61 @@ class ModeChanged:
     new_mode: str
 
 
-EngagementEvent = HostDiscovered | FindingAdded | DataCollected | ModeChanged
+EngagementEvent = HostDiscovered | HostsMerged | FindingAdded | DataCollected | ModeChanged
+
+
+@dataclass
+class HandlerStats:
+    """Timing statistics for a single event handler."""
+
+    # Display label (the handler's qualified name); not unique across handlers
+    name: str = ""
+    calls: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        """Average handler run time in seconds."""
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+PublishMode = Literal["sequential", "concurrent", "queued"]
 
 
 class EventBus:
-    """Event bus for observer pattern implementation."""
+    """Event bus for observer pattern implementation.
+
+    Publish modes:
+        sequential: await each handler in subscription order (default)
+        concurrent: run all handlers for an event with asyncio.gather
+        queued: enqueue the event on a bounded queue and return immediately;
+            a background worker dispatches it concurrently. When the queue is
+            full, publish waits for space (backpressure).
+
+    Ordering and error isolation are only guaranteed per handler in the
+    concurrent and queued modes, so the state managers create sequential
+    buses by default; the CLI and headless mode pass a bus in the mode set by
+    ``general.event_bus_mode`` (queued unless configured otherwise).
+    """
+
+    def __init__(self, mode: PublishMode = "sequential", max_queue_size: int = 1000) -> None:
+        if mode not in ("sequential", "concurrent", "queued"):
+            raise ValueError(f"Unknown publish mode: {mode}")
 
-    def __init__(self) -> None:
         self._handlers: dict[type, list[Callable[[Any], Awaitable[None]]]] = {}
+        self._mode: PublishMode = mode
+        self._max_queue_size = max_queue_size
+        self._queue: asyncio.Queue[EngagementEvent] | None = None
+        self._worker_task: asyncio.Task[None] | None = None
+        # Keyed by the handler itself: names are shared by lambdas, and by bound methods of different instances
+        self._stats: dict[Callable[[Any], Awaitable[None]], HandlerStats] = {}
+
+    @property
+    def mode(self) -> PublishMode:
+        """Get the publish mode."""
+        return self._mode
 
     def subscribe(self, event_type: type, handler: Callable[[Any], Awaitable[None]]) -> None:
         """Subscribe to an event type."""
@@ -53,15 +113,88 @@ class EventBus:
 
     async def publish(self, event: EngagementEvent) -> None:
         """Publish an event to all subscribers."""
-        import logging
-
-        logger = logging.getLogger(__name__)
-
-        event_type = type(event)
-        if event_type in self._handlers:
-            for handler in self._handlers[event_type]:
-                try:
-                    await handler(event)
-                except Exception as e:
-                    logger.error(f"Error in event handler: {e}")
-                    # Continue with other handlers despite error
+        if self._mode == "queued":
+            await self._enqueue(event)
+            return
+
+        handlers = self._handlers.get(type(event))
+        if not handlers:
+            return
+
+        if self._mode == "concurrent" and len(handlers) > 1:
+            await asyncio.gather(*(self._run_handler(handler, event) for handler in handlers))
+        else:
+            for handler in handlers:
+                await self._run_handler(handler, event)
+
+    async def drain(self) -> None:
+        """Wait until all queued events have been dispatched."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Dispatch remaining queued events and stop the background worker."""
+        await self.drain()
+        if self._worker_task:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+        self._queue = None
+
+    @property
+    def pending_events(self) -> int:
+        """Number of events waiting in the queue."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def get_handler_stats(self) -> list[HandlerStats]:
+        """Get timing statistics for each handler that has run, labelled with its name."""
+        return list(self._stats.values())
+
+    def reset_stats(self) -> None:
+        """Clear all handler timing statistics."""
+        self._stats.clear()
+
+    async def _enqueue(self, event: EngagementEvent) -> None:
+        """Put an event on the queue, starting the worker on first use."""
+        if type(event) not in self._handlers:
+            return
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._dispatch_loop(self._queue))
+
+        await self._queue.put(event)
+
+    async def _dispatch_loop(self, queue: "asyncio.Queue[EngagementEvent]") -> None:
+        """Background worker that dispatches queued events."""
+        while True:
+            event = await queue.get()
+            try:
+                handlers = self._handlers.get(type(event), [])
+                await asyncio.gather(*(self._run_handler(handler, event) for handler in handlers))
+            finally:
+                queue.task_done()
+
+    async def _run_handler(self, handler: Callable[[Any], Awaitable[None]], event: EngagementEvent) -> None:
+        """Run a single handler, isolating errors and recording timing."""
+        stats = self._stats.get(handler)
+        if stats is None:
+            stats = self._stats[handler] = HandlerStats(name=getattr(handler, "__qualname__", repr(handler)))
+
+        start = time.perf_counter()
+        try:
+            await handler(event)
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Error in event handler: {e}")
+            # Continue with other handlers despite error
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.calls += 1
+            stats.total_time += elapsed
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
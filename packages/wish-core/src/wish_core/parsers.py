@@ -1,9 +1,22 @@
 """Parser registry and base classes for wish-core."""
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, TypedDict
 
 from wish_models import Finding, Host, Service
 
+# How much of the output format detection looks at
+SNIFF_CHARS = 4096
+
+
+class ParsedOutput(TypedDict):
+    """Every entity type parsed from one tool output."""
+
+    hosts: list[Host]
+    services: list[Service]
+    findings: list[Finding]
+
 
 class ToolParser(ABC):
     """Abstract base class for tool output parsers."""
@@ -12,50 +25,141 @@ class ToolParser(ABC):
     @abstractmethod
     def tool_name(self) -> str:
         """The name of the tool this parser handles."""
-        pass
+
+    @property
+    @abstractmethod
+    def supported_formats(self) -> list[str]:
+        """List of supported output formats."""
 
     @abstractmethod
     def can_parse(self, output: str, format_hint: str | None = None) -> bool:
         """Check if this parser can handle the given output."""
-        pass
 
     @abstractmethod
-    def parse_hosts(self, output: str) -> list[Host]:
+    def parse_hosts(self, output: str, format_hint: str | None = None) -> list[Host]:
         """Parse host information from tool output."""
-        pass
 
     @abstractmethod
-    def parse_services(self, output: str) -> list[Service]:
+    def parse_services(self, output: str, format_hint: str | None = None) -> list[Service]:
         """Parse service information from tool output."""
-        pass
 
     @abstractmethod
-    def parse_findings(self, output: str) -> list[Finding]:
+    def parse_findings(self, output: str, format_hint: str | None = None) -> list[Finding]:
         """Parse findings from tool output."""
-        pass
+
+    def sniff(self, prefix: str) -> str | None:
+        """Detect the output format from the start of the output.
+
+        Returns the format name, or None when the prefix does not look like
+        this tool's output. Parsers with cheap signatures should override this;
+        the default runs can_parse() on the prefix only.
+        """
+        if self.can_parse(prefix):
+            return self.supported_formats[0]
+        return None
+
+    def parse_all(self, output: str, format_hint: str | None = None) -> ParsedOutput:
+        """Parse all available information from tool output."""
+        return {
+            "hosts": self.parse_hosts(output, format_hint),
+            "services": self.parse_services(output, format_hint),
+            "findings": self.parse_findings(output, format_hint),
+        }
+
+    def get_metadata(self, output: str, format_hint: str | None = None) -> dict[str, Any]:
+        """Extract metadata from tool output (scan timing, arguments, etc.)."""
+        return {}
+
+
+@dataclass(frozen=True)
+class ParserMatch:
+    """A parser together with the output format detected for it.
+
+    The parse methods pass the detected format on, so the output is not
+    sniffed again for every call.
+    """
+
+    parser: ToolParser
+    format: str
+
+    def parse_hosts(self, output: str) -> list[Host]:
+        """Parse hosts with the detected format."""
+        return self.parser.parse_hosts(output, self.format)
+
+    def parse_services(self, output: str) -> list[Service]:
+        """Parse services with the detected format."""
+        return self.parser.parse_services(output, self.format)
+
+    def parse_findings(self, output: str) -> list[Finding]:
+        """Parse findings with the detected format."""
+        return self.parser.parse_findings(output, self.format)
+
+    def parse_all(self, output: str) -> ParsedOutput:
+        """Parse everything with the detected format."""
+        return self.parser.parse_all(output, self.format)
+
+    def get_metadata(self, output: str) -> dict[str, Any]:
+        """Extract metadata with the detected format."""
+        return self.parser.get_metadata(output, self.format)
 
 
 class ParserRegistry:
-    """Registry for tool parsers."""
+    """Registry for tool parsers.
 
-    def __init__(self) -> None:
+    Output is matched to a parser by tool name when one is known, and
+    otherwise by sniffing the first SNIFF_CHARS characters with each parser.
+    """
+
+    def __init__(self, parsers: list[ToolParser] | None = None) -> None:
         self._parsers: dict[str, ToolParser] = {}
+        for parser in parsers or []:
+            self.register(parser)
 
     def register(self, parser: ToolParser) -> None:
         """Register a parser for a tool."""
-        self._parsers[parser.tool_name] = parser
+        self._parsers[parser.tool_name.lower()] = parser
 
     def get_parser(self, tool_name: str) -> ToolParser | None:
         """Get a parser for the specified tool."""
-        return self._parsers.get(tool_name)
+        return self._parsers.get(tool_name.lower())
+
+    def detect(self, output: str, tool_name: str | None = None, format_hint: str | None = None) -> ParserMatch | None:
+        """Find the parser and format for the given output.
+
+        Args:
+            output: Tool output
+            tool_name: Tool that produced the output, if known (checked first)
+            format_hint: Output format, if known (skips sniffing)
+
+        Returns:
+            ParserMatch, or None if no parser recognizes the output
+        """
+        prefix = output[:SNIFF_CHARS]
+
+        parser = self.get_parser(tool_name) if tool_name else None
+        if parser is not None:
+            return self._match(parser, output, prefix, format_hint)
 
-    def find_parser(self, output: str, format_hint: str | None = None) -> ToolParser | None:
-        """Find a parser that can handle the given output."""
         for parser in self._parsers.values():
-            if parser.can_parse(output, format_hint):
-                return parser
+            match = self._match(parser, output, prefix, format_hint)
+            if match is not None:
+                return match
         return None
 
+    def find_parser(self, output: str, format_hint: str | None = None) -> ToolParser | None:
+        """Find a parser that can handle the given output."""
+        match = self.detect(output, format_hint=format_hint)
+        return match.parser if match is not None else None
+
     def list_tools(self) -> list[str]:
         """List all registered tool names."""
         return list(self._parsers.keys())
+
+    @staticmethod
+    def _match(parser: ToolParser, output: str, prefix: str, format_hint: str | None) -> ParserMatch | None:
+        if format_hint is not None:
+            if format_hint in parser.supported_formats and parser.can_parse(output, format_hint):
+                return ParserMatch(parser, format_hint)
+            return None
+        detected = parser.sniff(prefix)
+        return ParserMatch(parser, detected) if detected is not None else None
@@ -1,7 +1,17 @@
 """Persistence module for wish-core state management."""
 
 from .auto_save import AutoSaveManager
+from .serializers import SessionSerializer, available_formats, get_serializer
 from .session_store import SessionStore
+from .sqlite_store import SQLiteStore
 from .state_tracker import StateChangeTracker
 
-__all__ = ["AutoSaveManager", "SessionStore", "StateChangeTracker"]
+__all__ = [
+    "AutoSaveManager",
+    "SessionSerializer",
+    "SessionStore",
+    "SQLiteStore",
+    "StateChangeTracker",
+    "available_formats",
+    "get_serializer",
+]
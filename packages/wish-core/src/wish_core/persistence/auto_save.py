@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+import time
 from collections.abc import Callable
 from datetime import datetime
 
@@ -11,23 +12,32 @@ from .session_store import SessionStore
 
 
 class AutoSaveManager:
-    """Auto-save manager for periodic state persistence."""
+    """Auto-save manager for debounced state persistence.
+
+    Changes are saved once no further change has arrived for ``debounce_delay``
+    seconds (idle flush), but never later than ``save_interval`` seconds after
+    the first unsaved change (max latency), so bursts of scan results are
+    coalesced into one write without leaving work unsaved for long.
+    """
 
     def __init__(
         self,
         session_store: SessionStore,
-        save_interval: int = 30,
+        save_interval: float = 30,
         state_provider: Callable[[], EngagementState] | None = None,
+        debounce_delay: float = 2.0,
     ) -> None:
         """Initialize auto-save manager.
 
         Args:
             session_store: SessionStore instance for persistence
-            save_interval: Save interval in seconds (default: 30)
+            save_interval: Maximum seconds a change may stay unsaved (default: 30)
             state_provider: Callable that returns current EngagementState
+            debounce_delay: Seconds without new changes after which pending changes are saved
         """
         self.session_store = session_store
         self.save_interval = save_interval
+        self.debounce_delay = debounce_delay
         self.state_provider = state_provider
         self.logger = logging.getLogger(__name__)
 
@@ -35,6 +45,14 @@ class AutoSaveManager:
         self._is_running = False
         self._last_save_time = datetime.now()
         self._changes_since_save = False
+        # Entity changes (collection, entity_id) pending an incremental save
+        self._pending_changes: set[tuple[str, str]] = set()
+        self._full_save_required = False
+        # Monotonic times of the first and latest change since the last save
+        self._first_change_time: float | None = None
+        self._last_change_time = 0.0
+        self._change_event = asyncio.Event()
+        self._save_lock = asyncio.Lock()
 
     async def start_auto_save(self) -> None:
         """Start the auto-save background task."""
@@ -43,7 +61,7 @@ class AutoSaveManager:
 
         self._is_running = True
         self._auto_save_task = asyncio.create_task(self._auto_save_loop())
-        self.logger.info(f"Auto-save started with {self.save_interval}s interval")
+        self.logger.info(f"Auto-save started (debounce {self.debounce_delay}s, max latency {self.save_interval}s)")
 
     async def stop_auto_save(self) -> None:
         """Stop the auto-save background task."""
@@ -62,9 +80,29 @@ class AutoSaveManager:
 
         self.logger.info("Auto-save stopped")
 
-    def mark_changes(self) -> None:
-        """Mark that changes have occurred since last save."""
+    def mark_changes(self, collection: str | None = None, entity_id: str | None = None) -> None:
+        """Mark that changes have occurred since last save.
+
+        Args:
+            collection: EngagementState collection that changed ("hosts", "findings", ...),
+                or "session_metadata" for metadata-only changes
+            entity_id: ID of the changed entity within the collection
+
+        Without a collection/entity pair the next save writes a full snapshot.
+        """
+        now = time.monotonic()
+        if self._first_change_time is None:
+            self._first_change_time = now
+        self._last_change_time = now
+
         self._changes_since_save = True
+        if collection is not None and entity_id is not None:
+            self._pending_changes.add((collection, entity_id))
+        elif collection != "session_metadata":
+            self._full_save_required = True
+
+        # Wake the auto-save loop so it can reschedule the save
+        self._change_event.set()
 
     async def force_save(self) -> bool:
         """Force an immediate save operation.
@@ -93,14 +131,36 @@ class AutoSaveManager:
         """Check if there are unsaved changes."""
         return self._changes_since_save
 
+    @property
+    def dirty_entities(self) -> frozenset[tuple[str, str]]:
+        """Get the (collection, entity_id) pairs changed since the last save."""
+        return frozenset(self._pending_changes)
+
+    def _next_save_time(self) -> float:
+        """Get the monotonic time at which pending changes are due to be saved."""
+        first_change_time = self._first_change_time if self._first_change_time is not None else time.monotonic()
+        return min(self._last_change_time + self.debounce_delay, first_change_time + self.save_interval)
+
     async def _auto_save_loop(self) -> None:
         """Main auto-save loop that runs in the background."""
         while self._is_running:
             try:
-                await asyncio.sleep(self.save_interval)
-
-                if self._changes_since_save:
-                    await self._perform_save()
+                self._change_event.clear()
+                if not self._changes_since_save:
+                    # Idle until something changes
+                    await self._change_event.wait()
+                    continue
+
+                delay = self._next_save_time() - time.monotonic()
+                if delay > 0:
+                    # Wait for the deadline, restarting whenever a new change arrives
+                    try:
+                        await asyncio.wait_for(self._change_event.wait(), timeout=delay)
+                    except TimeoutError:
+                        pass
+                    continue
+
+                await self._perform_save()
 
             except asyncio.CancelledError:
                 break
@@ -119,15 +179,36 @@ class AutoSaveManager:
             self.logger.warning("No state provider configured for auto-save")
             return False
 
+        async with self._save_lock:
+            return await self._save_pending(self.state_provider)
+
+    async def _save_pending(self, state_provider: Callable[[], EngagementState]) -> bool:
+        """Save pending changes (caller holds the save lock)."""
+        # Take ownership of pending changes; anything marked during the save stays pending
+        pending_changes, self._pending_changes = self._pending_changes, set()
+        full_save_required, self._full_save_required = self._full_save_required, False
+        self._first_change_time = None
+
+        saved = False
         try:
-            current_state = self.state_provider()
+            current_state = state_provider()
             if current_state:
-                await self.session_store.save_current_session(current_state)
+                if full_save_required or not self.session_store.journal_mode:
+                    await self.session_store.save_current_session(current_state)
+                else:
+                    await self.session_store.append_changes(current_state, pending_changes)
+                saved = True
                 self._last_save_time = datetime.now()
-                self._changes_since_save = False
+                # Anything marked while the save was running stays unsaved
+                self._changes_since_save = self._first_change_time is not None
                 self.logger.debug("Auto-save completed successfully")
-                return True
         except Exception as e:
             self.logger.error(f"Save operation failed: {e}")
-
-        return False
+        finally:
+            # Restore on failure or cancellation so the changes are retried on
+            # the next save, after a fresh debounce window
+            if not saved:
+                self._pending_changes |= pending_changes
+                self._full_save_required = self._full_save_required or full_save_required
+                self._first_change_time = self._last_change_time = time.monotonic()
+        return saved
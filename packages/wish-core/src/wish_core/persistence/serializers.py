@@ -0,0 +1,147 @@
+"""Pluggable serialization formats for session files."""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSerializer(ABC):
+    """Converts session dictionaries to bytes and back."""
+
+    #: Format name used in configuration
+    name: str = ""
+    #: Leading bytes identifying the format on disk (empty for plain JSON)
+    magic: bytes = b""
+    #: File name suffix of session files written in this format
+    suffix: str = ".json"
+
+    @abstractmethod
+    def dumps(self, data: dict[str, Any]) -> bytes:
+        """Serialize session data to bytes."""
+        pass
+
+    @abstractmethod
+    def loads(self, raw: bytes) -> dict[str, Any]:
+        """Deserialize session data from bytes."""
+        pass
+
+
+class JSONSerializer(SessionSerializer):
+    """Human-readable, indented JSON using the standard library (default)."""
+
+    name = "json"
+
+    def dumps(self, data: dict[str, Any]) -> bytes:
+        """Serialize session data to indented JSON."""
+        return json.dumps(data, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+
+    def loads(self, raw: bytes) -> dict[str, Any]:
+        """Deserialize JSON session data."""
+        result: dict[str, Any] = json.loads(raw)
+        return result
+
+
+class OrjsonSerializer(SessionSerializer):
+    """Compact JSON using orjson; files stay readable by any JSON parser."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, data: dict[str, Any]) -> bytes:
+        """Serialize session data to compact JSON."""
+        result: bytes = self._orjson.dumps(data, default=str)
+        return result
+
+    def loads(self, raw: bytes) -> dict[str, Any]:
+        """Deserialize JSON session data."""
+        result: dict[str, Any] = self._orjson.loads(raw)
+        return result
+
+
+class MsgpackSerializer(SessionSerializer):
+    """Binary MessagePack using msgspec, prefixed with a magic header."""
+
+    name = "msgpack"
+    magic = b"WISHMP1\n"
+    suffix = ".msgpack"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encoder = msgspec.msgpack.Encoder(enc_hook=str)
+        self._decoder = msgspec.msgpack.Decoder()
+
+    def dumps(self, data: dict[str, Any]) -> bytes:
+        """Serialize session data to MessagePack."""
+        result: bytes = self.magic + self._encoder.encode(data)
+        return result
+
+    def loads(self, raw: bytes) -> dict[str, Any]:
+        """Deserialize MessagePack session data."""
+        result: dict[str, Any] = self._decoder.decode(memoryview(raw)[len(self.magic) :])
+        return result
+
+
+_SERIALIZERS: dict[str, type[SessionSerializer]] = {
+    JSONSerializer.name: JSONSerializer,
+    OrjsonSerializer.name: OrjsonSerializer,
+    MsgpackSerializer.name: MsgpackSerializer,
+}
+
+#: Suffixes of session files in any format, default format first
+SESSION_FILE_SUFFIXES = tuple(dict.fromkeys(serializer_class.suffix for serializer_class in _SERIALIZERS.values()))
+
+
+def available_formats() -> list[str]:
+    """List serialization formats whose dependencies are installed."""
+    formats = []
+    for name, serializer_class in _SERIALIZERS.items():
+        try:
+            serializer_class()
+        except ImportError:
+            continue
+        formats.append(name)
+    return formats
+
+
+def get_serializer(name: str) -> SessionSerializer:
+    """Get a serializer by format name.
+
+    Falls back to the standard JSON serializer (with a warning) when the
+    optional dependency for the requested format is not installed.
+
+    Raises:
+        ValueError: If the format name is unknown
+    """
+    serializer_class = _SERIALIZERS.get(name)
+    if serializer_class is None:
+        raise ValueError(f"Unknown session format: {name} (available: {', '.join(_SERIALIZERS)})")
+
+    try:
+        return serializer_class()
+    except ImportError as e:
+        logger.warning(f"Session format '{name}' unavailable ({e}), falling back to json")
+        return JSONSerializer()
+
+
+def detect_serializer(raw: bytes) -> SessionSerializer:
+    """Pick the serializer that can read the given file contents.
+
+    Raises:
+        ImportError: If the data needs an optional dependency that is not installed
+    """
+    if raw.startswith(MsgpackSerializer.magic):
+        return MsgpackSerializer()
+
+    # Any JSON flavour: prefer orjson for speed when installed
+    try:
+        return OrjsonSerializer()
+    except ImportError:
+        return JSONSerializer()
@@ -1,19 +1,69 @@
 """Session persistence management for wish-core."""
 
+import asyncio
 import json
 import logging
+import os
+from collections.abc import Iterable
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 from wish_models import EngagementState
+from wish_models.validation import IntegrityReport, ModelValidator
 
+from ..config.manager import GeneralConfig
+from .serializers import SESSION_FILE_SUFFIXES, SessionSerializer, detect_serializer, get_serializer
+
+# Entity collections of EngagementState that can be journaled individually
+JOURNAL_COLLECTIONS = ("targets", "hosts", "findings", "collected_data")
+
+# Bump when the archive catalog layout changes to force a rebuild
+ARCHIVE_CATALOG_VERSION = 1
+
+# Integrity errors logged individually per check; the rest are only counted
+MAX_LOGGED_INTEGRITY_ERRORS = 10
 
-class SessionStore:
-    """Session persistence manager."""
 
-    def __init__(self, base_path: str = "~/.wish") -> None:
-        """Initialize session store with base directory."""
+class SessionStore:
+    """Session persistence manager.
+
+    In journal mode, incremental saves append compact delta records to
+    ``current_session.journal`` instead of rewriting the whole snapshot. The
+    journal is folded into a new snapshot (compaction) once it holds
+    ``compact_threshold`` records, and replayed on top of the snapshot when
+    the session is loaded.
+
+    Snapshots and archives are written with the configured serializer
+    ("json", "orjson" or "msgpack") and named with its suffix (".json" or
+    ".msgpack"); the format is detected when reading, so files written in any
+    format can always be loaded.
+
+    Encoding and disk writes run in a worker thread so saving never blocks the
+    event loop; the state is converted to plain data on the loop first, so the
+    worker never touches live model objects.
+
+    Archive metadata is kept in ``archive_catalog.json`` so listing and cleanup
+    never open the archives themselves. The catalog is reconciled against the
+    archives directory (new, changed or deleted files) whenever the directory
+    has changed since the catalog was written, and rebuilt if it is missing.
+    """
+
+    def __init__(
+        self,
+        base_path: str = "~/.wish",
+        journal_mode: bool = False,
+        compact_threshold: int = 500,
+        serializer: str | SessionSerializer = "json",
+    ) -> None:
+        """Initialize session store with base directory.
+
+        Args:
+            base_path: Base directory for session data
+            journal_mode: Append incremental changes to a write-ahead journal
+            compact_threshold: Number of journal records that triggers compaction
+            serializer: Format name or serializer instance used for writing
+        """
         self.base_path = Path(base_path).expanduser()
         self.sessions_dir = self.base_path / "sessions"
         self.archives_dir = self.sessions_dir / "archives"
@@ -23,21 +73,60 @@ class SessionStore:
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
         self.archives_dir.mkdir(parents=True, exist_ok=True)
 
-        self.current_session_file = self.sessions_dir / "current_session.json"
+        self.serializer = get_serializer(serializer) if isinstance(serializer, str) else serializer
+        self.current_session_file = self.sessions_dir / f"current_session{self.serializer.suffix}"
         self.session_history_file = self.sessions_dir / "session_history.json"
+        self.journal_file = self.sessions_dir / "current_session.journal"
+        # Kept outside archives_dir so writing it does not change the directory mtime
+        self.archive_catalog_file = self.sessions_dir / "archive_catalog.json"
+
+        self.journal_mode = journal_mode
+        self.compact_threshold = compact_threshold
+        self._journal_generation = 0
+        self._journal_records = 0
+        # Journal records are only valid against a snapshot this store wrote or loaded
+        self._snapshot_synced = False
+        # Serializes snapshot and journal writes running in worker threads
+        self._write_lock = asyncio.Lock()
+        # Outcome of the latest integrity pass (session load or compaction)
+        self.last_integrity_report: IntegrityReport | None = None
+
+    @classmethod
+    def from_config(cls, config: GeneralConfig, base_path: str = "~/.wish") -> "SessionStore":
+        """Create a session store with the format and journal settings of the general config."""
+        return cls(
+            base_path=base_path,
+            journal_mode=config.session_journal,
+            compact_threshold=config.session_compact_threshold,
+            serializer=config.session_format,
+        )
 
     async def save_current_session(self, engagement_state: EngagementState) -> None:
         """Save the current session to disk."""
+        async with self._write_lock:
+            await self._save_snapshot(engagement_state)
+
+    async def _save_snapshot(self, engagement_state: EngagementState) -> None:
+        """Write a full snapshot (caller holds the write lock)."""
         try:
             data = self._engagement_state_to_dict(engagement_state)
 
-            # Write to temporary file first, then atomic move
-            temp_file = self.current_session_file.with_suffix(".tmp")
+            # A new snapshot starts a new journal generation, so stale journal
+            # records left over from a crash during compaction are never replayed
+            self._journal_generation += 1
+            data["journal_generation"] = self._journal_generation
 
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+            await asyncio.to_thread(self._write_session_file, self.current_session_file, data)
+
+            # Drop a snapshot written earlier in another format
+            for stale_file in self._current_session_files():
+                if stale_file != self.current_session_file:
+                    stale_file.unlink(missing_ok=True)
 
-            temp_file.replace(self.current_session_file)
+            # The snapshot now contains everything the journal held
+            self.journal_file.unlink(missing_ok=True)
+            self._journal_records = 0
+            self._snapshot_synced = True
 
             self.logger.info(f"Session saved: {engagement_state.session_metadata.session_id}")
 
@@ -46,38 +135,115 @@ class SessionStore:
             raise
 
     async def load_current_session(self) -> EngagementState | None:
-        """Load the current session from disk."""
-        if not self.current_session_file.exists():
+        """Load the current session from disk (written in any format)."""
+        session_files = self._current_session_files()
+        if not session_files:
             return None
+        session_file = session_files[0]
 
         try:
-            with open(self.current_session_file, encoding="utf-8") as f:
-                data = json.load(f)
+            data = self._read_session_file(session_file)
 
             # Validate data structure
             if not self._validate_session_data(data):
                 self.logger.warning("Invalid session data found, skipping load")
                 return None
 
-            return self._dict_to_engagement_state(data)
+            self._journal_generation = data.get("journal_generation", 0)
+            self._journal_records = self._replay_journal(data)
+            self._snapshot_synced = True
+
+            engagement_state = self._dict_to_engagement_state(data)
+            self._check_integrity(engagement_state, "load")
+            return engagement_state
 
         except Exception as e:
             self.logger.error(f"Failed to load session: {e}")
             # Backup corrupted file
-            backup_file = self.current_session_file.with_suffix(
-                f".corrupted.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            )
-            self.current_session_file.rename(backup_file)
+            backup_file = session_file.with_suffix(f".corrupted.{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            session_file.rename(backup_file)
             return None
 
+    async def append_changes(self, engagement_state: EngagementState, changes: Iterable[tuple[str, str]]) -> None:
+        """Persist only the given entity changes.
+
+        Each change is a ``(collection, entity_id)`` pair where collection is one
+        of ``JOURNAL_COLLECTIONS``. Entities still present in the state are
+        written as upserts, missing ones as deletions. Session metadata is always
+        written along with the changes. Falls back to a full snapshot when
+        journal mode is disabled or no snapshot exists yet, and compacts once
+        the journal reaches ``compact_threshold`` records.
+        """
+        async with self._write_lock:
+            await self._append_changes(engagement_state, changes)
+
+    async def _append_changes(self, engagement_state: EngagementState, changes: Iterable[tuple[str, str]]) -> None:
+        """Append journal records for the given changes (caller holds the write lock)."""
+        if not self.journal_mode or not self._snapshot_synced or not self.current_session_file.exists():
+            await self._save_snapshot(engagement_state)
+            return
+
+        records: list[dict[str, Any]] = []
+        if not self.journal_file.exists():
+            records.append({"op": "begin", "generation": self._journal_generation})
+
+        for collection, entity_id in sorted(set(changes)):
+            if collection not in JOURNAL_COLLECTIONS:
+                raise ValueError(f"Unknown journal collection: {collection}")
+            entity = getattr(engagement_state, collection).get(entity_id)
+            if entity is None:
+                records.append({"op": "del", "c": collection, "id": entity_id})
+            else:
+                records.append({"op": "put", "c": collection, "id": entity_id, "d": entity.model_dump(mode="json")})
+
+        records.append({"op": "meta", "d": self._state_header_to_dict(engagement_state)})
+
+        try:
+            await asyncio.to_thread(self._write_journal_records, records)
+
+            self._journal_records += len(records)
+            self.logger.debug(f"Journaled {len(records)} records for {engagement_state.session_metadata.session_id}")
+
+        except Exception as e:
+            self.logger.error(f"Failed to append session journal: {e}")
+            raise
+
+        if self._journal_records >= self.compact_threshold:
+            self._check_integrity(engagement_state, "compaction")
+            await self._save_snapshot(engagement_state)
+
+    def _check_integrity(self, engagement_state: EngagementState, context: str) -> IntegrityReport:
+        """Run the cross-reference integrity pass and log its outcome and timing."""
+        report = ModelValidator.validate_engagement(engagement_state)
+        self.last_integrity_report = report
+
+        session_id = engagement_state.session_metadata.session_id
+        if report.is_valid:
+            self.logger.debug(f"Session {session_id} {context}: {report.summary()}")
+        else:
+            self.logger.warning(f"Session {session_id} {context}: {report.summary()}")
+            for error in report.errors[:MAX_LOGGED_INTEGRITY_ERRORS]:
+                self.logger.warning(f"  {error}")
+        return report
+
+    async def compact(self, engagement_state: EngagementState) -> None:
+        """Fold the journal into a fresh snapshot."""
+        self._check_integrity(engagement_state, "compaction")
+        await self.save_current_session(engagement_state)
+
+    @property
+    def journal_record_count(self) -> int:
+        """Number of records in the current journal."""
+        return self._journal_records
+
     async def archive_session(self, engagement_state: EngagementState, custom_name: str | None = None) -> str:
         """Archive a session with optional custom name."""
         # Generate archive filename
         if custom_name:
-            archive_name = f"{datetime.now().strftime('%Y-%m-%d')}_{custom_name}.json"
+            archive_name = f"{datetime.now().strftime('%Y-%m-%d')}_{custom_name}{self.serializer.suffix}"
         else:
             session_name = engagement_state.name or "session"
-            archive_name = f"{datetime.now().strftime('%Y-%m-%d_%H%M%S')}_{session_name}.json"
+            archive_name = f"{datetime.now().strftime('%Y-%m-%d_%H%M%S')}_{session_name}{self.serializer.suffix}"
 
         archive_path = self.archives_dir / archive_name
 
@@ -85,46 +251,29 @@ class SessionStore:
         data = self._engagement_state_to_dict(engagement_state)
         data["archived_at"] = datetime.now().isoformat()
 
-        # Save archive file
-        with open(archive_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+        # Save archive file and record it in the catalog
+        catalog = self._load_archive_catalog()
+        await asyncio.to_thread(self._write_session_file, archive_path, data)
+        catalog[archive_path.name] = self._archive_catalog_entry(archive_path, data)
+        self._save_archive_catalog(catalog)
 
         # Add to session history
         await self._add_to_history(engagement_state, str(archive_path))
 
         # Clear current session
-        if self.current_session_file.exists():
-            self.current_session_file.unlink()
+        for session_file in self._current_session_files():
+            session_file.unlink()
+        self.journal_file.unlink(missing_ok=True)
+        self._journal_records = 0
+        self._snapshot_synced = False
 
         self.logger.info(f"Session archived: {archive_path}")
         return str(archive_path)
 
     async def list_archived_sessions(self, limit: int = 20) -> list[dict[str, Any]]:
         """List archived sessions with metadata."""
-        archives = []
-
-        for archive_file in self.archives_dir.glob("*.json"):
-            try:
-                with open(archive_file, encoding="utf-8") as f:
-                    data = json.load(f)
-
-                session_metadata = data.get("session_metadata", {})
-                archives.append(
-                    {
-                        "file_path": str(archive_file),
-                        "session_id": session_metadata.get("session_id"),
-                        "engagement_name": data.get("name"),
-                        "created_at": session_metadata.get("session_start"),
-                        "last_activity": session_metadata.get("last_activity"),
-                        "total_findings": session_metadata.get("total_findings", 0),
-                        "current_mode": session_metadata.get("current_mode"),
-                        "file_size": archive_file.stat().st_size,
-                        "archived_at": data.get("archived_at"),
-                    }
-                )
-
-            except Exception as e:
-                self.logger.warning(f"Failed to read archive {archive_file}: {e}")
+        catalog = self._load_archive_catalog()
+        archives = [dict(entry["info"]) for entry in catalog.values()]
 
         # Sort by creation time, most recent first
         archives.sort(key=lambda x: x.get("created_at") or "", reverse=True)
@@ -133,10 +282,11 @@ class SessionStore:
     async def load_archived_session(self, archive_path: str) -> EngagementState | None:
         """Load an archived session from disk."""
         try:
-            with open(archive_path, encoding="utf-8") as f:
-                data = json.load(f)
+            data = self._read_session_file(Path(archive_path))
 
-            return self._dict_to_engagement_state(data)
+            engagement_state = self._dict_to_engagement_state(data)
+            self._check_integrity(engagement_state, "archive load")
+            return engagement_state
 
         except Exception as e:
             self.logger.error(f"Failed to load archived session {archive_path}: {e}")
@@ -146,30 +296,175 @@ class SessionStore:
         """Clean up old archive files."""
         cutoff_date = datetime.now() - timedelta(days=max_age_days)
 
-        archives = list(self.archives_dir.glob("*.json"))
-        archives.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+        catalog = self._load_archive_catalog()
+        archives = sorted(catalog, key=lambda name: catalog[name]["mtime_ns"], reverse=True)
 
-        # Delete old files
-        for archive_file in archives:
-            file_time = datetime.fromtimestamp(archive_file.stat().st_mtime)
+        # Delete old files, then enforce the file count limit
+        for index, name in enumerate(archives):
+            file_time = datetime.fromtimestamp(catalog[name]["mtime_ns"] / 1e9)
             if file_time < cutoff_date:
-                archive_file.unlink()
-                self.logger.info(f"Deleted old archive: {archive_file}")
+                reason = "old"
+            elif index >= max_count:
+                reason = "excess"
+            else:
+                continue
+
+            archive_file = self.archives_dir / name
+            archive_file.unlink(missing_ok=True)
+            del catalog[name]
+            self.logger.info(f"Deleted {reason} archive: {archive_file}")
+
+        self._save_archive_catalog(catalog)
+
+    def _load_archive_catalog(self) -> dict[str, dict[str, Any]]:
+        """Load the archive catalog, reconciling it with the archives directory if stale.
+
+        Returns:
+            Catalog entries keyed by archive file name
+        """
+        catalog: dict[str, Any] = {}
+        if self.archive_catalog_file.exists():
+            try:
+                with open(self.archive_catalog_file, encoding="utf-8") as f:
+                    catalog = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"Failed to read archive catalog, rebuilding: {e}")
+
+        entries: dict[str, dict[str, Any]] = {}
+        if catalog.get("version") == ARCHIVE_CATALOG_VERSION:
+            entries = catalog.get("archives", {})
+            # Adding, removing or replacing an archive updates the directory mtime
+            if catalog.get("dir_mtime_ns") == self.archives_dir.stat().st_mtime_ns:
+                return entries
+
+        # Stale or missing: only (re)read archives that are new or changed on disk
+        dir_mtime_ns = self.archives_dir.stat().st_mtime_ns
+        reconciled: dict[str, dict[str, Any]] = {}
+        for archive_file in self.archives_dir.iterdir():
+            if archive_file.suffix not in SESSION_FILE_SUFFIXES:
+                continue
+            stat = archive_file.stat()
+            entry = entries.get(archive_file.name)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                reconciled[archive_file.name] = entry
+                continue
+            try:
+                reconciled[archive_file.name] = self._archive_catalog_entry(
+                    archive_file, self._read_session_file(archive_file)
+                )
+            except Exception as e:
+                self.logger.warning(f"Failed to read archive {archive_file}: {e}")
 
-        # Enforce file count limit
-        remaining_archives = [f for f in archives if f.exists()]
-        if len(remaining_archives) > max_count:
-            for archive_file in remaining_archives[max_count:]:
-                archive_file.unlink()
-                self.logger.info(f"Deleted excess archive: {archive_file}")
+        self._save_archive_catalog(reconciled, dir_mtime_ns)
+        return reconciled
+
+    def _save_archive_catalog(self, entries: dict[str, dict[str, Any]], dir_mtime_ns: int | None = None) -> None:
+        """Write the archive catalog, stamped with the archives directory mtime it reflects."""
+        if dir_mtime_ns is None:
+            dir_mtime_ns = self.archives_dir.stat().st_mtime_ns
+        catalog = {
+            "version": ARCHIVE_CATALOG_VERSION,
+            "dir_mtime_ns": dir_mtime_ns,
+            "archives": entries,
+        }
+        try:
+            temp_file = self.archive_catalog_file.with_suffix(".tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(catalog, f, ensure_ascii=False)
+            temp_file.replace(self.archive_catalog_file)
+        except Exception as e:
+            # The catalog is a cache; it is rebuilt on the next read
+            self.logger.warning(f"Failed to write archive catalog: {e}")
+
+    def _archive_catalog_entry(self, archive_file: Path, data: dict[str, Any]) -> dict[str, Any]:
+        """Build the catalog entry for an archive from its data."""
+        stat = archive_file.stat()
+        session_metadata = data.get("session_metadata", {})
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "info": {
+                "file_path": str(archive_file),
+                "session_id": session_metadata.get("session_id"),
+                "engagement_name": data.get("name"),
+                "created_at": session_metadata.get("session_start"),
+                "last_activity": session_metadata.get("last_activity"),
+                "total_findings": session_metadata.get("total_findings", 0),
+                "current_mode": session_metadata.get("current_mode"),
+                "file_size": stat.st_size,
+                "archived_at": data.get("archived_at"),
+            },
+        }
+
+    def _current_session_files(self) -> list[Path]:
+        """Existing current session snapshots, the one in the configured format first."""
+        candidates = [self.current_session_file]
+        candidates += [self.sessions_dir / f"current_session{suffix}" for suffix in SESSION_FILE_SUFFIXES]
+        return [path for path in dict.fromkeys(candidates) if path.exists()]
 
     def _validate_session_data(self, data: dict[str, Any]) -> bool:
         """Validate session data structure."""
         required_fields = ["session_metadata", "targets", "hosts", "findings", "collected_data"]
         return all(field in data for field in required_fields)
 
-    def _engagement_state_to_dict(self, engagement_state: EngagementState) -> dict[str, Any]:
-        """Convert EngagementState to serializable dictionary."""
+    def _write_session_file(self, path: Path, data: dict[str, Any]) -> None:
+        """Serialize data and atomically replace the file (runs in a worker thread)."""
+        # Write to temporary file first, then atomic move
+        temp_file = path.with_suffix(".tmp")
+        temp_file.write_bytes(self.serializer.dumps(data))
+        temp_file.replace(path)
+
+    def _write_journal_records(self, records: list[dict[str, Any]]) -> None:
+        """Append records to the journal and fsync (runs in a worker thread)."""
+        lines = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records)
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_session_file(self, path: Path) -> dict[str, Any]:
+        """Read a snapshot or archive file, detecting its format."""
+        raw = path.read_bytes()
+        return detect_serializer(raw).loads(raw)
+
+    def _replay_journal(self, data: dict[str, Any]) -> int:
+        """Apply journal records on top of snapshot data in place.
+
+        Returns:
+            Number of journal records applied
+        """
+        if not self.journal_file.exists():
+            return 0
+
+        applied = 0
+        with open(self.journal_file, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn write at the tail: everything before it is intact
+                    self.logger.warning(f"Ignoring truncated journal record at line {line_number}")
+                    break
+
+                op = record.get("op")
+                if op == "begin":
+                    if record.get("generation") != data.get("journal_generation", 0):
+                        self.logger.warning("Discarding stale session journal from an older snapshot")
+                        return 0
+                elif op == "put":
+                    data[record["c"]][record["id"]] = record["d"]
+                elif op == "del":
+                    data[record["c"]].pop(record["id"], None)
+                elif op == "meta":
+                    data.update(record["d"])
+                applied += 1
+
+        if applied:
+            self.logger.info(f"Replayed {applied} session journal records")
+        return applied
+
+    def _state_header_to_dict(self, engagement_state: EngagementState) -> dict[str, Any]:
+        """Convert the non-collection part of EngagementState to a dictionary."""
         return {
             "id": engagement_state.id,
             "name": engagement_state.name,
@@ -183,6 +478,12 @@ class SessionStore:
                 "current_mode": engagement_state.session_metadata.current_mode,
                 "command_history": engagement_state.session_metadata.command_history,
             },
+        }
+
+    def _engagement_state_to_dict(self, engagement_state: EngagementState) -> dict[str, Any]:
+        """Convert EngagementState to serializable dictionary."""
+        return {
+            **self._state_header_to_dict(engagement_state),
             "targets": {tid: target.model_dump() for tid, target in engagement_state.targets.items()},
             "hosts": {hid: host.model_dump() for hid, host in engagement_state.hosts.items()},
             "findings": {fid: finding.model_dump() for fid, finding in engagement_state.findings.items()},
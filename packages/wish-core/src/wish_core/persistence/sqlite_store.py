@@ -0,0 +1,445 @@
+"""SQLite-backed engagement storage for wish-core."""
+
+import json
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from wish_models import CollectedData, EngagementState, Finding, Host, Service, SessionMetadata, Target
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    engagement_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS targets (
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    scope_type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_targets_scope ON targets(session_id, scope);
+
+CREATE TABLE IF NOT EXISTS hosts (
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    ip_address TEXT NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_hosts_ip ON hosts(session_id, ip_address);
+CREATE INDEX IF NOT EXISTS idx_hosts_status ON hosts(session_id, status);
+
+CREATE TABLE IF NOT EXISTS services (
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    host_id TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    protocol TEXT NOT NULL,
+    state TEXT NOT NULL,
+    service_name TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_services_host_port ON services(session_id, host_id, port, protocol);
+CREATE INDEX IF NOT EXISTS idx_services_port ON services(session_id, port, state);
+CREATE INDEX IF NOT EXISTS idx_services_name ON services(session_id, service_name);
+
+CREATE TABLE IF NOT EXISTS findings (
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    host_id TEXT,
+    severity TEXT NOT NULL,
+    category TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_findings_host ON findings(session_id, host_id);
+CREATE INDEX IF NOT EXISTS idx_findings_severity ON findings(session_id, severity);
+
+CREATE TABLE IF NOT EXISTS collected_data (
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    is_sensitive INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_collected_data_type ON collected_data(session_id, type);
+"""
+
+
+def _dumps(model: Any, **kwargs: Any) -> str:
+    """Serialize a pydantic model to compact JSON."""
+    return json.dumps(model.model_dump(mode="json", **kwargs), ensure_ascii=False, separators=(",", ":"))
+
+
+class SQLiteStore:
+    """Relational storage for engagement state.
+
+    Each entity is stored as a JSON document alongside the columns that are
+    used for lookups, so common queries ("all hosts with 445 open") run on
+    indexes without materializing the whole EngagementState. Several sessions
+    can share one database file; every row is keyed by session_id.
+    """
+
+    def __init__(self, db_path: str = "~/.wish/sessions/wish.db") -> None:
+        """Initialize the store and create the schema if needed.
+
+        Args:
+            db_path: Path to the SQLite database file, or ":memory:"
+        """
+        self.logger = logging.getLogger(__name__)
+
+        if db_path == ":memory:":
+            self.db_path = db_path
+        else:
+            path = Path(db_path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.db_path = str(path)
+
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block of writes in a single transaction."""
+        try:
+            yield self._conn
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    # Sessions
+
+    def save_session_header(self, state: EngagementState) -> None:
+        """Insert or update the engagement header and session metadata."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, engagement_id, name, created_at, updated_at, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                state.session_metadata.session_id,
+                state.id,
+                state.name,
+                state.created_at.isoformat(),
+                state.updated_at.isoformat(),
+                _dumps(state.session_metadata),
+            ),
+        )
+
+    def has_session(self, session_id: str) -> bool:
+        """Check whether a session exists."""
+        row = self._conn.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row is not None
+
+    def load_session_header(self, session_id: str) -> EngagementState | None:
+        """Load an EngagementState with metadata only (no entities)."""
+        row = self._conn.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+
+        return EngagementState(
+            id=row["engagement_id"],
+            name=row["name"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+            session_metadata=SessionMetadata.model_validate_json(row["metadata"]),
+        )
+
+    def list_session_metadata(self) -> list[SessionMetadata]:
+        """List metadata for every stored session, most recently updated first."""
+        rows = self._conn.execute("SELECT metadata FROM sessions ORDER BY updated_at DESC").fetchall()
+        return [SessionMetadata.model_validate_json(row["metadata"]) for row in rows]
+
+    def delete_session(self, session_id: str) -> None:
+        """Delete a session and all of its entities."""
+        with self.transaction() as conn:
+            for table in ("sessions", "targets", "hosts", "services", "findings", "collected_data"):
+                conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))  # noqa: S608
+
+    def save_state(self, state: EngagementState) -> None:
+        """Replace a session's stored contents with the given state."""
+        session_id = state.session_metadata.session_id
+        with self.transaction() as conn:
+            for table in ("targets", "hosts", "services", "findings", "collected_data"):
+                conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))  # noqa: S608
+            self.save_session_header(state)
+            for target in state.targets.values():
+                self.upsert_target(session_id, target)
+            self.upsert_hosts(session_id, state.hosts.values())
+            for finding in state.findings.values():
+                self.upsert_finding(session_id, finding)
+            for data in state.collected_data.values():
+                self.upsert_collected_data(session_id, data)
+
+    def load_state(self, session_id: str) -> EngagementState | None:
+        """Materialize the full EngagementState for a session."""
+        state = self.load_session_header(session_id)
+        if state is None:
+            return None
+
+        state.targets = {t.id: t for t in self.query_targets(session_id)}
+        state.hosts = {h.id: h for h in self.query_hosts(session_id)}
+        state.findings = {f.id: f for f in self.query_findings(session_id)}
+        state.collected_data = {d.id: d for d in self.query_collected_data(session_id)}
+        return state
+
+    # Targets
+
+    def upsert_target(self, session_id: str, target: Target) -> None:
+        """Insert or update a target."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO targets (session_id, id, scope, scope_type, data) VALUES (?, ?, ?, ?, ?)",
+            (session_id, target.id, target.scope, target.scope_type, _dumps(target)),
+        )
+
+    def delete_target_by_scope(self, session_id: str, scope: str) -> str | None:
+        """Delete the first target with the given scope. Returns its ID, or None if none matched."""
+        row = self._conn.execute(
+            "SELECT id FROM targets WHERE session_id = ? AND scope = ? LIMIT 1", (session_id, scope)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("DELETE FROM targets WHERE session_id = ? AND id = ?", (session_id, row["id"]))
+        target_id: str = row["id"]
+        return target_id
+
+    def query_targets(self, session_id: str) -> list[Target]:
+        """Get all targets of a session."""
+        rows = self._conn.execute("SELECT data FROM targets WHERE session_id = ?", (session_id,)).fetchall()
+        return [Target.model_validate_json(row["data"]) for row in rows]
+
+    # Hosts and services
+
+    def upsert_hosts(self, session_id: str, hosts: Iterable[Host]) -> None:
+        """Insert or update hosts; services are merged, never removed."""
+        for host in hosts:
+            self.upsert_host(session_id, host)
+            self.upsert_services(session_id, host.id, host.services)
+
+    def upsert_host(self, session_id: str, host: Host) -> None:
+        """Insert or update a host row without touching its services."""
+        self._conn.execute(
+            "INSERT INTO hosts (session_id, id, ip_address, status, data) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (session_id, id) DO UPDATE SET "
+            "ip_address = excluded.ip_address, status = excluded.status, data = excluded.data",
+            (session_id, host.id, host.ip_address, host.status, _dumps(host, exclude={"services"})),
+        )
+
+    def upsert_services(self, session_id: str, host_id: str, services: Iterable[Service]) -> None:
+        """Insert services of a host, updating only rows whose data changed.
+
+        Rows are updated in place, so they keep their rowid (and with it their
+        position in the host's service order). A service on a port/protocol the
+        host already has a row for replaces that row (last one wins), so
+        duplicate ports in parser output do not violate the unique index.
+        """
+        self._conn.executemany(
+            "INSERT INTO services (session_id, id, host_id, port, protocol, state, service_name, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (session_id, id) DO UPDATE SET "
+            "port = excluded.port, protocol = excluded.protocol, state = excluded.state, "
+            "service_name = excluded.service_name, data = excluded.data "
+            "WHERE services.data != excluded.data "
+            "ON CONFLICT (session_id, host_id, port, protocol) DO UPDATE SET "
+            "id = excluded.id, state = excluded.state, service_name = excluded.service_name, data = excluded.data",
+            [
+                (
+                    session_id,
+                    service.id,
+                    host_id,
+                    service.port,
+                    service.protocol,
+                    service.state,
+                    service.service_name,
+                    _dumps(service),
+                )
+                for service in services
+            ],
+        )
+
+    def delete_host(self, session_id: str, host_id: str) -> bool:
+        """Delete a host and its services. Returns False if the host did not exist."""
+        cursor = self._conn.execute("DELETE FROM hosts WHERE session_id = ? AND id = ?", (session_id, host_id))
+        self._conn.execute("DELETE FROM services WHERE session_id = ? AND host_id = ?", (session_id, host_id))
+        return cursor.rowcount > 0
+
+    def get_host(self, session_id: str, host_id: str) -> Host | None:
+        """Get a single host with its services."""
+        hosts = self._hosts_from_rows(
+            session_id,
+            self._conn.execute("SELECT * FROM hosts WHERE session_id = ? AND id = ?", (session_id, host_id)).fetchall(),
+        )
+        return hosts[0] if hosts else None
+
+    def get_host_ip(self, session_id: str, host_id: str) -> str | None:
+        """Get a host's IP address without loading the host."""
+        row = self._conn.execute(
+            "SELECT ip_address FROM hosts WHERE session_id = ? AND id = ?", (session_id, host_id)
+        ).fetchone()
+        return row["ip_address"] if row is not None else None
+
+    def get_host_header_by_ip(self, session_id: str, ip_address: str) -> Host | None:
+        """Get a host by IP address without loading its services."""
+        row = self._conn.execute(
+            "SELECT data FROM hosts WHERE session_id = ? AND ip_address = ? LIMIT 1", (session_id, ip_address)
+        ).fetchone()
+        return Host.model_validate_json(row["data"]) if row is not None else None
+
+    def get_service_keys(self, session_id: str, host_id: str) -> set[tuple[int, str]]:
+        """Get the (port, protocol) pairs a host has services on, without loading the services."""
+        rows = self._conn.execute(
+            "SELECT port, protocol FROM services WHERE session_id = ? AND host_id = ?", (session_id, host_id)
+        ).fetchall()
+        return {(row["port"], row["protocol"]) for row in rows}
+
+    def get_host_by_ip(self, session_id: str, ip_address: str) -> Host | None:
+        """Get a host by IP address."""
+        rows = self._conn.execute(
+            "SELECT * FROM hosts WHERE session_id = ? AND ip_address = ? LIMIT 1", (session_id, ip_address)
+        ).fetchall()
+        hosts = self._hosts_from_rows(session_id, rows)
+        return hosts[0] if hosts else None
+
+    def query_hosts(
+        self,
+        session_id: str,
+        status: str | None = None,
+        open_port: int | None = None,
+        protocol: str = "tcp",
+    ) -> list[Host]:
+        """Query hosts, optionally by status and/or an open port."""
+        sql = "SELECT h.* FROM hosts h WHERE h.session_id = ?"
+        params: list[Any] = [session_id]
+        if status is not None:
+            sql += " AND h.status = ?"
+            params.append(status)
+        if open_port is not None:
+            sql += (
+                " AND EXISTS (SELECT 1 FROM services s WHERE s.session_id = h.session_id AND s.host_id = h.id"
+                " AND s.port = ? AND s.protocol = ? AND s.state = 'open')"
+            )
+            params.extend([open_port, protocol])
+        return self._hosts_from_rows(session_id, self._conn.execute(sql, params).fetchall())
+
+    def query_services(
+        self,
+        session_id: str,
+        port: int | None = None,
+        service_name: str | None = None,
+        state: str | None = None,
+        host_id: str | None = None,
+    ) -> list[Service]:
+        """Query services by any combination of port, name, state and host."""
+        sql = "SELECT data FROM services WHERE session_id = ?"
+        params: list[Any] = [session_id]
+        for column, value in (("port", port), ("service_name", service_name), ("state", state), ("host_id", host_id)):
+            if value is not None:
+                sql += f" AND {column} = ?"
+                params.append(value)
+        rows = self._conn.execute(sql, params).fetchall()
+        return [Service.model_validate_json(row["data"]) for row in rows]
+
+    def count_hosts(self, session_id: str) -> int:
+        """Count hosts in a session."""
+        row = self._conn.execute("SELECT COUNT(*) FROM hosts WHERE session_id = ?", (session_id,)).fetchone()
+        return int(row[0])
+
+    def _hosts_from_rows(self, session_id: str, rows: list[sqlite3.Row]) -> list[Host]:
+        """Build Host models from host rows, attaching their services."""
+        if not rows:
+            return []
+
+        services_by_host: dict[str, list[Service]] = {row["id"]: [] for row in rows}
+        host_ids = list(services_by_host)
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(host_ids), 500):
+            chunk = host_ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            service_rows = self._conn.execute(
+                f"SELECT host_id, data FROM services WHERE session_id = ? AND host_id IN ({placeholders}) "  # noqa: S608
+                "ORDER BY rowid",
+                [session_id, *chunk],
+            ).fetchall()
+            for service_row in service_rows:
+                services_by_host[service_row["host_id"]].append(Service.model_validate_json(service_row["data"]))
+
+        hosts = []
+        for row in rows:
+            host = Host.model_validate_json(row["data"])
+            host.services = services_by_host[row["id"]]
+            hosts.append(host)
+        return hosts
+
+    # Findings and collected data
+
+    def upsert_finding(self, session_id: str, finding: Finding) -> bool:
+        """Insert or update a finding. Returns True if it was inserted, False if it replaced an existing one."""
+        exists = self._conn.execute(
+            "SELECT 1 FROM findings WHERE session_id = ? AND id = ?", (session_id, finding.id)
+        ).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO findings (session_id, id, host_id, severity, category, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (session_id, finding.id, finding.host_id, finding.severity, finding.category, _dumps(finding)),
+        )
+        return exists is None
+
+    def query_findings(
+        self,
+        session_id: str,
+        severity: str | None = None,
+        host_id: str | None = None,
+        category: str | None = None,
+    ) -> list[Finding]:
+        """Query findings by any combination of severity, host and category."""
+        sql = "SELECT data FROM findings WHERE session_id = ?"
+        params: list[Any] = [session_id]
+        for column, value in (("severity", severity), ("host_id", host_id), ("category", category)):
+            if value is not None:
+                sql += f" AND {column} = ?"
+                params.append(value)
+        rows = self._conn.execute(sql, params).fetchall()
+        return [Finding.model_validate_json(row["data"]) for row in rows]
+
+    def upsert_collected_data(self, session_id: str, data: CollectedData) -> None:
+        """Insert or update a collected data item."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO collected_data (session_id, id, type, is_sensitive, data) VALUES (?, ?, ?, ?, ?)",
+            (session_id, data.id, data.type, int(data.is_sensitive), _dumps(data)),
+        )
+
+    def query_collected_data(
+        self, session_id: str, data_type: str | None = None, sensitive_only: bool = False
+    ) -> list[CollectedData]:
+        """Query collected data by type and sensitivity."""
+        sql = "SELECT data FROM collected_data WHERE session_id = ?"
+        params: list[Any] = [session_id]
+        if data_type is not None:
+            sql += " AND type = ?"
+            params.append(data_type)
+        if sensitive_only:
+            sql += " AND is_sensitive = 1"
+        rows = self._conn.execute(sql, params).fetchall()
+        return [CollectedData.model_validate_json(row["data"]) for row in rows]
@@ -1,10 +1,15 @@
 """State change tracking for auto-save triggering."""
 
 import logging
+from typing import TYPE_CHECKING
 
 from wish_models import CollectedData, Finding, Host
 
 from .auto_save import AutoSaveManager
+from .session_store import JOURNAL_COLLECTIONS
+
+if TYPE_CHECKING:
+    from ..state.manager import StateManager
 
 
 class StateChangeTracker:
@@ -19,6 +24,27 @@ class StateChangeTracker:
         self.auto_save_manager = auto_save_manager
         self.logger = logging.getLogger(__name__)
 
+    def watch(self, state_manager: "StateManager") -> None:
+        """Mark every change the state manager makes for auto-save.
+
+        Args:
+            state_manager: State manager whose mutations should be tracked
+        """
+        state_manager.add_change_listener(self.track_state_change)
+
+    def track_state_change(self, collection: str, entity_id: str) -> None:
+        """Track a change recorded by a state manager.
+
+        Args:
+            collection: Changed collection, or "session_metadata"
+            entity_id: ID of the changed entity (empty for metadata changes)
+        """
+        if collection in JOURNAL_COLLECTIONS:
+            self.auto_save_manager.mark_changes(collection, entity_id)
+        elif collection == "session_metadata":
+            self.auto_save_manager.mark_changes("session_metadata")
+        # Service changes are always recorded along with their host
+
     def track_host_change(self, host: Host, operation: str) -> None:
         """Track changes to host information.
 
@@ -27,7 +53,7 @@ class StateChangeTracker:
             operation: Description of the operation (e.g., "added", "updated")
         """
         self.logger.debug(f"Host {operation}: {host.ip_address} ({host.id})")
-        self.auto_save_manager.mark_changes()
+        self.auto_save_manager.mark_changes("hosts", host.id)
 
     def track_finding_change(self, finding: Finding, operation: str) -> None:
         """Track changes to findings.
@@ -37,7 +63,7 @@ class StateChangeTracker:
             operation: Description of the operation (e.g., "added", "updated")
         """
         self.logger.debug(f"Finding {operation}: {finding.title} ({finding.id})")
-        self.auto_save_manager.mark_changes()
+        self.auto_save_manager.mark_changes("findings", finding.id)
 
     def track_data_collection(self, data: CollectedData, operation: str) -> None:
         """Track changes to collected data.
@@ -47,7 +73,7 @@ class StateChangeTracker:
             operation: Description of the operation (e.g., "added", "updated")
         """
         self.logger.debug(f"Data {operation}: {data.type} ({data.id})")
-        self.auto_save_manager.mark_changes()
+        self.auto_save_manager.mark_changes("collected_data", data.id)
 
     def track_mode_change(self, old_mode: str, new_mode: str) -> None:
         """Track engagement mode changes.
@@ -57,7 +83,7 @@ class StateChangeTracker:
             new_mode: New engagement mode
         """
         self.logger.debug(f"Mode changed: {old_mode} -> {new_mode}")
-        self.auto_save_manager.mark_changes()
+        self.auto_save_manager.mark_changes("session_metadata")
 
     def track_command_execution(self, command: str) -> None:
         """Track command execution.
@@ -66,7 +92,7 @@ class StateChangeTracker:
             command: The command that was executed
         """
         self.logger.debug(f"Command executed: {command}")
-        self.auto_save_manager.mark_changes()
+        self.auto_save_manager.mark_changes("session_metadata")
 
     def track_target_change(self, target_id: str, operation: str) -> None:
         """Track changes to targets.
@@ -76,7 +102,7 @@ class StateChangeTracker:
             operation: Description of the operation (e.g., "added", "updated", "removed")
         """
         self.logger.debug(f"Target {operation}: {target_id}")
-        self.auto_save_manager.mark_changes()
+        self.auto_save_manager.mark_changes("targets", target_id)
 
     def track_session_change(self, change_type: str, details: str = "") -> None:
         """Track general session changes.
@@ -4,7 +4,7 @@ from abc import ABC, abstractmethod
 
 from wish_models import EngagementState, SessionMetadata
 
-from .persistence import SessionStore
+from .persistence import SessionStore, SQLiteStore
 
 
 class SessionManager(ABC):
@@ -175,3 +175,63 @@ class FileSessionManager(SessionManager):
         import os
 
         return os.getcwd()
+
+
+class SQLiteSessionManager(SessionManager):
+    """Session manager storing every session in a SQLite database."""
+
+    def __init__(self, store: SQLiteStore) -> None:
+        """Initialize SQLite session manager.
+
+        Args:
+            store: SQLiteStore instance for persistence
+        """
+        self.store = store
+
+    async def save_session(self, state: EngagementState) -> None:
+        """Save the session state.
+
+        Entities of a stored session are already written through by
+        SQLiteStateManager, so only the header and metadata are updated; a
+        session that is not stored yet is imported whole.
+        """
+        if not self.store.has_session(state.session_metadata.session_id):
+            self.store.save_state(state)
+            return
+        with self.store.transaction():
+            self.store.save_session_header(state)
+
+    async def load_session(self, session_id: str) -> EngagementState | None:
+        """Load a session by ID."""
+        return self.store.load_state(session_id)
+
+    async def list_sessions(self) -> list[SessionMetadata]:
+        """List all stored sessions, most recently updated first."""
+        return self.store.list_session_metadata()
+
+    async def delete_session(self, session_id: str) -> None:
+        """Delete a session and all of its data."""
+        self.store.delete_session(session_id)
+
+    def create_session(self) -> SessionMetadata:
+        """Create a new session metadata."""
+        import uuid
+        from datetime import datetime
+
+        return SessionMetadata(
+            session_id=str(uuid.uuid4()),
+            engagement_name="Default Engagement",
+            current_mode="recon",
+            notes=None,
+            total_commands=0,
+            total_hosts_discovered=0,
+            total_findings=0,
+            session_start=datetime.now(),
+            last_activity=datetime.now(),
+        )
+
+    def get_current_directory(self) -> str:
+        """Get current working directory."""
+        import os
+
+        return os.getcwd()
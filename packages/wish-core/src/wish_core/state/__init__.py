@@ -1,5 +1,18 @@
 """State management for wish-core."""
 
+from .changes import ChangeListener, ChangeLog, StateChanges
+from .diff import CollectionDiff, StateDiff, diff_states
 from .manager import InMemoryStateManager, StateManager
+from .sqlite import SQLiteStateManager
 
-__all__ = ["StateManager", "InMemoryStateManager"]
+__all__ = [
+    "StateManager",
+    "InMemoryStateManager",
+    "SQLiteStateManager",
+    "ChangeLog",
+    "ChangeListener",
+    "StateChanges",
+    "CollectionDiff",
+    "StateDiff",
+    "diff_states",
+]
@@ -0,0 +1,141 @@
+"""Revisioned change log for incremental state updates."""
+
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Literal
+
+from .diff import CollectionDiff
+
+ChangeKind = Literal["added", "updated", "removed"]
+
+# Collections tracked by the change log ("services" are keyed by service ID)
+CHANGE_COLLECTIONS = ("targets", "hosts", "services", "findings", "collected_data")
+
+# Called with (collection, entity_id) for every recorded change; metadata
+# changes are reported as ("session_metadata", "")
+ChangeListener = Callable[[str, str], None]
+
+
+@dataclass
+class StateChanges:
+    """Changes to the engagement state since a given revision."""
+
+    revision: int
+    targets: CollectionDiff = field(default_factory=CollectionDiff)
+    hosts: CollectionDiff = field(default_factory=CollectionDiff)
+    services: CollectionDiff = field(default_factory=CollectionDiff)
+    findings: CollectionDiff = field(default_factory=CollectionDiff)
+    collected_data: CollectionDiff = field(default_factory=CollectionDiff)
+    metadata_changed: bool = False
+    # The log no longer covers the requested revision; re-read the full state
+    full_reload_required: bool = False
+
+    @property
+    def has_changes(self) -> bool:
+        """Check if anything changed since the requested revision."""
+        return (
+            self.full_reload_required
+            or self.metadata_changed
+            or any(getattr(self, collection) for collection in CHANGE_COLLECTIONS)
+        )
+
+
+class ChangeLog:
+    """Bounded log of entity changes, each stamped with a monotonically increasing revision."""
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self._revision = 0
+        self._entries: deque[tuple[int, str, str, ChangeKind]] = deque(maxlen=max_entries)
+        # Oldest revision changes_since() can still answer exactly
+        self._floor = 0
+        self._listeners: list[ChangeListener] = []
+
+    @property
+    def revision(self) -> int:
+        """Get the current revision."""
+        return self._revision
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """Register a callback invoked synchronously for every recorded change."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: ChangeListener) -> None:
+        """Unregister a change callback."""
+        self._listeners.remove(listener)
+
+    def record(self, collection: str, entity_id: str, kind: ChangeKind) -> int:
+        """Record an entity change and return the new revision."""
+        if collection not in CHANGE_COLLECTIONS:
+            raise ValueError(f"Unknown change collection: {collection}")
+        return self._append(collection, entity_id, kind)
+
+    def record_metadata(self) -> int:
+        """Record a session metadata change and return the new revision."""
+        return self._append("session_metadata", "", "updated")
+
+    def reset(self) -> int:
+        """Discard the log (e.g. after the whole state was replaced) and return the new revision."""
+        self._revision += 1
+        self._entries.clear()
+        self._floor = self._revision
+        return self._revision
+
+    def changes_since(self, revision: int) -> StateChanges:
+        """Summarize the net changes made after the given revision.
+
+        An entity added and then removed within the window is omitted, and
+        anything added and later updated is reported as added only.
+        """
+        changes = StateChanges(revision=self._revision)
+        if revision < self._floor or revision > self._revision:
+            changes.full_reload_required = True
+            return changes
+
+        net: dict[str, dict[str, ChangeKind | None]] = {collection: {} for collection in CHANGE_COLLECTIONS}
+        for entry_revision, collection, entity_id, kind in reversed(self._entries):
+            if entry_revision <= revision:
+                break
+            if collection == "session_metadata":
+                changes.metadata_changed = True
+                continue
+            # Walking backwards, so fold each change in front of the later ones
+            entity_changes = net[collection]
+            if entity_id in entity_changes:
+                entity_changes[entity_id] = self._fold(kind, entity_changes[entity_id])
+            else:
+                entity_changes[entity_id] = kind
+
+        for collection, collection_changes in net.items():
+            diff: CollectionDiff = getattr(changes, collection)
+            # Report in chronological order of each entity's latest change
+            for entity_id, net_kind in reversed(collection_changes.items()):
+                if net_kind == "added":
+                    diff.added.append(entity_id)
+                elif net_kind == "updated":
+                    diff.changed.append(entity_id)
+                elif net_kind == "removed":
+                    diff.removed.append(entity_id)
+        return changes
+
+    @staticmethod
+    def _fold(earlier: ChangeKind, later: ChangeKind | None) -> ChangeKind | None:
+        """Combine two consecutive changes to one entity (None means no net change)."""
+        if later is None:
+            # The later changes were an add followed by a remove
+            return earlier if earlier == "removed" else None
+        if earlier == "added":
+            return None if later == "removed" else "added"
+        if earlier == "removed" and later == "added":
+            return "updated"
+        return later
+
+    def _append(self, collection: str, entity_id: str, kind: ChangeKind) -> int:
+        """Append an entry, advancing the floor if the oldest entry is evicted."""
+        if self._entries.maxlen is not None and len(self._entries) == self._entries.maxlen:
+            self._floor = self._entries[0][0]
+        self._revision += 1
+        self._entries.append((self._revision, collection, entity_id, kind))
+        for listener in self._listeners:
+            listener(collection, entity_id)
+        return self._revision
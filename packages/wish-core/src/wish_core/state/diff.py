@@ -0,0 +1,74 @@
+"""Differences between two engagement state snapshots."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel
+from wish_models import EngagementState
+
+
+@dataclass
+class CollectionDiff:
+    """Entity IDs added, removed or changed in one state collection."""
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclass
+class StateDiff:
+    """Changes between two engagement states."""
+
+    targets: CollectionDiff
+    hosts: CollectionDiff
+    findings: CollectionDiff
+    collected_data: CollectionDiff
+    mode_change: tuple[str, str] | None = None
+    new_commands: list[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        """Check if anything changed between the two states."""
+        return bool(
+            self.targets or self.hosts or self.findings or self.collected_data or self.mode_change or self.new_commands
+        )
+
+
+def _diff_collection(before: Mapping[str, BaseModel], after: Mapping[str, BaseModel]) -> CollectionDiff:
+    """Compare two entity collections keyed by ID."""
+    diff = CollectionDiff(
+        added=[entity_id for entity_id in after if entity_id not in before],
+        removed=[entity_id for entity_id in before if entity_id not in after],
+    )
+    for entity_id, entity in after.items():
+        previous = before.get(entity_id)
+        # Entities shared between snapshots are unchanged without comparing fields
+        if previous is not None and previous is not entity and previous != entity:
+            diff.changed.append(entity_id)
+    return diff
+
+
+def diff_states(before: EngagementState, after: EngagementState) -> StateDiff:
+    """List what changed between two engagement states.
+
+    Cheapest on snapshots taken with ``StateManager.snapshot()``, where
+    unchanged entities are shared and detected by identity.
+    """
+    old_mode = before.session_metadata.current_mode
+    new_mode = after.session_metadata.current_mode
+    # The history is capped, so count new commands by the running total
+    new_command_count = after.session_metadata.total_commands - before.session_metadata.total_commands
+    new_history = after.session_metadata.command_history
+
+    return StateDiff(
+        targets=_diff_collection(before.targets, after.targets),
+        hosts=_diff_collection(before.hosts, after.hosts),
+        findings=_diff_collection(before.findings, after.findings),
+        collected_data=_diff_collection(before.collected_data, after.collected_data),
+        mode_change=(old_mode, new_mode) if old_mode != new_mode else None,
+        new_commands=list(new_history[-new_command_count:]) if new_command_count > 0 else [],
+    )
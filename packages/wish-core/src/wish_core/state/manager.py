@@ -11,7 +11,45 @@ from wish_models import (
     Target,
 )
 
-from ..events import DataCollected, EventBus, FindingAdded, HostDiscovered, ModeChanged
+from ..events import DataCollected, EventBus, FindingAdded, HostDiscovered, HostsMerged, ModeChanged
+from .changes import ChangeListener, ChangeLog, StateChanges
+
+
+def merge_host(existing_host: Host, host: Host) -> None:
+    """Merge a newly discovered host into an existing host record in place."""
+    existing_host.last_seen = host.discovered_at
+
+    # Merge services, avoiding duplicates (uses the host's port/protocol index)
+    for service in host.services:
+        existing_host.add_service_if_missing(service)
+
+    # Update OS info if more recent or more confident
+    if host.os_info and (
+        not existing_host.os_info
+        or (host.os_confidence and existing_host.os_confidence and host.os_confidence > existing_host.os_confidence)
+    ):
+        existing_host.os_info = host.os_info
+        existing_host.os_confidence = host.os_confidence
+
+    # Update status to most recent
+    if host.status != "unknown":
+        existing_host.status = host.status
+
+    # Merge hostnames
+    for hostname in host.hostnames:
+        if hostname not in existing_host.hostnames:
+            existing_host.hostnames.append(hostname)
+
+    # Update MAC address if available
+    if host.mac_address and not existing_host.mac_address:
+        existing_host.mac_address = host.mac_address
+
+
+def vulnerability_key(finding: Finding, host_ip: str | None) -> str | None:
+    """Get the duplicate-detection key for a vulnerability finding, if it has one."""
+    if finding.category != "vulnerability" or not finding.cve_ids:
+        return None
+    return f"{finding.cve_ids[0]}:{host_ip}" if finding.cve_ids and host_ip else f"{finding.title}:{host_ip}"
 
 
 class StateManager(ABC):
@@ -27,6 +65,11 @@ class StateManager(ABC):
         """Update host information with merge logic."""
         pass
 
+    @abstractmethod
+    async def merge_hosts(self, hosts: list[Host]) -> HostsMerged:
+        """Merge a batch of hosts in one pass and publish a single batch event."""
+        pass
+
     @abstractmethod
     async def add_finding(self, finding: Finding) -> None:
         """Add a finding to the engagement."""
@@ -62,9 +105,36 @@ class StateManager(ABC):
         """Add a command to the session history."""
         pass
 
+    @property
+    @abstractmethod
+    def revision(self) -> int:
+        """Get the current state revision, incremented on every change."""
+        pass
+
+    @abstractmethod
+    def changes_since(self, revision: int) -> StateChanges:
+        """Get the entities added, updated or removed after the given revision."""
+        pass
+
+    @abstractmethod
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Register a callback invoked for every entity or metadata change."""
+        pass
+
+    async def snapshot(self) -> EngagementState:
+        """Get a copy of the current state that later changes do not affect."""
+        state = await self.get_current_state()
+        return state.model_copy(deep=True)
+
 
 class InMemoryStateManager(StateManager):
-    """In-memory implementation of state management."""
+    """In-memory implementation of state management.
+
+    snapshot() uses structural sharing: the snapshot gets its own collection
+    dicts but shares the entity objects with the live state. Hosts are the
+    only entities the manager modifies in place, so a host shared with a
+    snapshot is copied before its next merge (copy-on-write).
+    """
 
     def __init__(self, event_bus: EventBus | None = None) -> None:
         self._state = EngagementState(
@@ -84,6 +154,15 @@ class InMemoryStateManager(StateManager):
         # Track reported vulnerabilities to avoid duplicates
         self._reported_vulns: set[str] = set()
 
+        # Secondary host indexes (ip/mac -> host_id, hostname -> host_ids)
+        self._hosts_by_ip: dict[str, str] = {}
+        self._hosts_by_mac: dict[str, str] = {}
+        self._hosts_by_hostname: dict[str, set[str]] = {}
+        self._indexed_host_count = 0
+        # Hosts shared with a snapshot, copied before they are next modified
+        self._shared_host_ids: set[str] = set()
+        self._change_log = ChangeLog()
+
     async def get_current_state(self) -> EngagementState:
         """Get the current engagement state."""
         return self._state
@@ -92,76 +171,221 @@ class InMemoryStateManager(StateManager):
         """Get the current engagement state synchronously."""
         return self._state
 
+    @property
+    def revision(self) -> int:
+        """Get the current state revision, incremented on every change."""
+        return self._change_log.revision
+
+    def changes_since(self, revision: int) -> StateChanges:
+        """Get the entities added, updated or removed after the given revision."""
+        return self._change_log.changes_since(revision)
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Register a callback invoked for every entity or metadata change."""
+        self._change_log.add_listener(listener)
+
+    async def snapshot(self) -> EngagementState:
+        """Get a copy-on-write snapshot of the current state.
+
+        Costs a shallow copy of each collection instead of a deep copy of every
+        entity. Entities in the snapshot are shared and must be treated as
+        read-only.
+        """
+        self._shared_host_ids = set(self._state.hosts)
+        return self._state.model_copy(
+            update={
+                "targets": dict(self._state.targets),
+                "hosts": dict(self._state.hosts),
+                "findings": dict(self._state.findings),
+                "collected_data": dict(self._state.collected_data),
+                "session_metadata": self._state.session_metadata.model_copy(deep=True),
+            }
+        )
+
     async def update_hosts(self, hosts: list[Host]) -> None:
         """Update host information with merge logic."""
+        self._ensure_host_indexes()
+
         for host in hosts:
-            # Find existing host by IP address instead of ID
-            existing_host = None
-            for _host_id, h in self._state.hosts.items():
-                if h.ip_address == host.ip_address:
-                    existing_host = h
-                    break
-
-            if existing_host:
-                # Update existing host
-                existing_host.last_seen = host.discovered_at
-
-                # Merge services, avoiding duplicates
-                existing_service_keys = {(s.port, s.protocol) for s in existing_host.services}
-                for service in host.services:
-                    if (service.port, service.protocol) not in existing_service_keys:
-                        existing_host.services.append(service)
-
-                # Update OS info if more recent or more confident
-                if host.os_info and (
-                    not existing_host.os_info
-                    or (
-                        host.os_confidence
-                        and existing_host.os_confidence
-                        and host.os_confidence > existing_host.os_confidence
-                    )
-                ):
-                    existing_host.os_info = host.os_info
-                    existing_host.os_confidence = host.os_confidence
-
-                # Update status to most recent
-                if host.status != "unknown":
-                    existing_host.status = host.status
-
-                # Merge hostnames
-                for hostname in host.hostnames:
-                    if hostname not in existing_host.hostnames:
-                        existing_host.hostnames.append(hostname)
-
-                # Update MAC address if available
-                if host.mac_address and not existing_host.mac_address:
-                    existing_host.mac_address = host.mac_address
-
-                # Publish event with the existing host
-                await self._event_bus.publish(HostDiscovered(host=existing_host))
-            else:
-                # Add new host
-                self._state.hosts[host.id] = host
-
-                # Publish host discovered event
-                await self._event_bus.publish(HostDiscovered(host=host))
+            # Merge into the existing host with the same IP address, or add it
+            stored_host, _ = self._store_host(host)
+
+            # Publish host discovered event
+            await self._event_bus.publish(HostDiscovered(host=stored_host))
 
         self._state.update_timestamp()
 
+    async def merge_hosts(self, hosts: list[Host]) -> HostsMerged:
+        """Merge a batch of hosts in one pass and publish a single batch event.
+
+        Unlike update_hosts, no per-host HostDiscovered events are published and
+        the session metadata is only touched once for the whole batch.
+        """
+        self._ensure_host_indexes()
+
+        added_host_ids: list[str] = []
+        updated_host_ids: list[str] = []
+        seen: set[str] = set()
+
+        for host in hosts:
+            stored_host, added = self._store_host(host)
+            if stored_host.id not in seen:
+                (added_host_ids if added else updated_host_ids).append(stored_host.id)
+                seen.add(stored_host.id)
+
+        event = HostsMerged(added_host_ids=added_host_ids, updated_host_ids=updated_host_ids)
+        if not added_host_ids and not updated_host_ids:
+            return event
+
+        self._state.session_metadata.total_hosts_discovered += len(added_host_ids)
+        self._state.update_timestamp()
+        self._change_log.record_metadata()
+
+        await self._event_bus.publish(event)
+        return event
+
+    async def remove_host(self, host_id: str) -> None:
+        """Remove a host from the engagement."""
+        host = self._state.hosts.get(host_id)
+        if host is None:
+            raise ValueError(f"Host '{host_id}' not found")
+
+        query_index = self._state.peek_query_index()
+        self._ensure_host_indexes()
+        self._unindex_host(host)
+        del self._state.hosts[host_id]
+        self._state.mark_changed("hosts")
+        if query_index is not None:
+            query_index.remove_host(host_id)
+            query_index.mark_current(self._state)
+        self._shared_host_ids.discard(host_id)
+        for service in host.services:
+            self._change_log.record("services", service.id, "removed")
+        self._change_log.record("hosts", host_id, "removed")
+        self._indexed_host_count = len(self._state.hosts)
+        self._state.update_timestamp()
+
+    def load_state(self, state: EngagementState) -> None:
+        """Replace the current state (e.g. after a session reload) and rebuild indexes."""
+        self._state = state
+        self._reported_vulns.clear()
+        self._shared_host_ids.clear()
+        self._change_log.reset()
+        self._rebuild_host_indexes()
+
+    def get_host_by_ip(self, ip_address: str) -> Host | None:
+        """Look up a host by IP address."""
+        self._ensure_host_indexes()
+        host_id = self._hosts_by_ip.get(ip_address)
+        return self._state.hosts.get(host_id) if host_id is not None else None
+
+    def get_host_by_mac(self, mac_address: str) -> Host | None:
+        """Look up a host by MAC address (case-insensitive)."""
+        self._ensure_host_indexes()
+        host_id = self._hosts_by_mac.get(mac_address.lower())
+        return self._state.hosts.get(host_id) if host_id is not None else None
+
+    def get_hosts_by_hostname(self, hostname: str) -> list[Host]:
+        """Look up all hosts carrying a hostname (case-insensitive)."""
+        self._ensure_host_indexes()
+        host_ids = self._hosts_by_hostname.get(hostname.lower(), set())
+        return [self._state.hosts[host_id] for host_id in host_ids if host_id in self._state.hosts]
+
+    def _store_host(self, host: Host) -> tuple[Host, bool]:
+        """Merge a host into the existing host with its IP, or add it.
+
+        Returns:
+            The stored host and whether it was newly added
+        """
+        query_index = self._state.peek_query_index()
+        existing_host = self.get_host_by_ip(host.ip_address)
+        if existing_host is None:
+            self._state.hosts[host.id] = host
+            self._index_host(host)
+            self._change_log.record("hosts", host.id, "added")
+            for service in host.services:
+                self._change_log.record("services", service.id, "added")
+            stored_host, added = host, True
+        else:
+            # merge_host only appends services, so new ones are at the end
+            known_services = len(existing_host.services)
+            stored_host = self._merge_host(existing_host, host)
+            self._change_log.record("hosts", stored_host.id, "updated")
+            for service in stored_host.services[known_services:]:
+                self._change_log.record("services", service.id, "added")
+            added = False
+
+        self._state.mark_changed("hosts")
+        if query_index is not None:
+            query_index.update_host(stored_host)
+            query_index.mark_current(self._state)
+        return stored_host, added
+
+    def _merge_host(self, existing_host: Host, host: Host) -> Host:
+        """Merge a newly discovered host into an existing one, keeping indexes current.
+
+        Returns:
+            The stored host, which is a private copy if the original was shared with a snapshot
+        """
+        if existing_host.id in self._shared_host_ids:
+            existing_host = existing_host.model_copy(deep=True)
+            self._state.hosts[existing_host.id] = existing_host
+            self._shared_host_ids.discard(existing_host.id)
+
+        merge_host(existing_host, host)
+
+        for hostname in existing_host.hostnames:
+            self._hosts_by_hostname.setdefault(hostname.lower(), set()).add(existing_host.id)
+        if existing_host.mac_address:
+            self._hosts_by_mac[existing_host.mac_address.lower()] = existing_host.id
+        return existing_host
+
+    def _index_host(self, host: Host) -> None:
+        """Add a host to the secondary indexes."""
+        self._hosts_by_ip[host.ip_address] = host.id
+        if host.mac_address:
+            self._hosts_by_mac[host.mac_address.lower()] = host.id
+        for hostname in host.hostnames:
+            self._hosts_by_hostname.setdefault(hostname.lower(), set()).add(host.id)
+        self._indexed_host_count = len(self._state.hosts)
+
+    def _unindex_host(self, host: Host) -> None:
+        """Remove a host from the secondary indexes."""
+        if self._hosts_by_ip.get(host.ip_address) == host.id:
+            del self._hosts_by_ip[host.ip_address]
+        if host.mac_address and self._hosts_by_mac.get(host.mac_address.lower()) == host.id:
+            del self._hosts_by_mac[host.mac_address.lower()]
+        for hostname in host.hostnames:
+            host_ids = self._hosts_by_hostname.get(hostname.lower())
+            if host_ids is not None:
+                host_ids.discard(host.id)
+                if not host_ids:
+                    del self._hosts_by_hostname[hostname.lower()]
+
+    def _rebuild_host_indexes(self) -> None:
+        """Rebuild all secondary host indexes from the current state."""
+        self._hosts_by_ip.clear()
+        self._hosts_by_mac.clear()
+        self._hosts_by_hostname.clear()
+        for host in self._state.hosts.values():
+            self._index_host(host)
+        self._indexed_host_count = len(self._state.hosts)
+
+    def _ensure_host_indexes(self) -> None:
+        """Rebuild indexes if hosts were added or removed outside the manager."""
+        if self._indexed_host_count != len(self._state.hosts):
+            self._rebuild_host_indexes()
+
     async def add_finding(self, finding: Finding) -> None:
         """Add a finding to the engagement."""
         # Check for duplicate vulnerabilities
-        if finding.category == "vulnerability" and finding.cve_ids:
-            # Create a unique key for this vulnerability
-            # Get host IP if host_id is available
-            host_ip = None
-            if finding.host_id and finding.host_id in self._state.hosts:
-                host_ip = self._state.hosts[finding.host_id].ip_address
-
-            vuln_key = (
-                f"{finding.cve_ids[0]}:{host_ip}" if finding.cve_ids and host_ip else f"{finding.title}:{host_ip}"
-            )
+        # Get host IP if host_id is available
+        host_ip = None
+        if finding.host_id and finding.host_id in self._state.hosts:
+            host_ip = self._state.hosts[finding.host_id].ip_address
 
+        vuln_key = vulnerability_key(finding, host_ip)
+        if vuln_key is not None:
             # Skip if already reported
             if vuln_key in self._reported_vulns:
                 return
@@ -169,16 +393,31 @@ class InMemoryStateManager(StateManager):
             # Mark as reported
             self._reported_vulns.add(vuln_key)
 
+        query_index = self._state.peek_query_index()
+        self._change_log.record("findings", finding.id, "updated" if finding.id in self._state.findings else "added")
         self._state.findings[finding.id] = finding
+        self._state.mark_changed("findings")
+        if query_index is not None:
+            query_index.update_finding(finding)
+            query_index.mark_current(self._state)
         self._state.session_metadata.total_findings += 1
         self._state.update_timestamp()
+        self._change_log.record_metadata()
 
         # Publish finding added event
         await self._event_bus.publish(FindingAdded(finding=finding))
 
     async def add_collected_data(self, data: CollectedData) -> None:
         """Add collected data to the engagement."""
+        query_index = self._state.peek_query_index()
+        self._change_log.record(
+            "collected_data", data.id, "updated" if data.id in self._state.collected_data else "added"
+        )
         self._state.collected_data[data.id] = data
+        self._state.mark_changed("collected_data")
+        if query_index is not None:
+            query_index.update_collected_data(data)
+            query_index.mark_current(self._state)
         self._state.update_timestamp()
 
         # Publish data collected event
@@ -188,12 +427,14 @@ class InMemoryStateManager(StateManager):
         """Set the current engagement mode."""
         old_mode = self._state.session_metadata.current_mode
         self._state.change_mode(mode)
+        self._change_log.record_metadata()
 
         # Publish mode changed event
         await self._event_bus.publish(ModeChanged(old_mode=old_mode, new_mode=mode))
 
     async def add_target(self, target: Target) -> None:
         """Add a target to the engagement."""
+        self._change_log.record("targets", target.id, "updated" if target.id in self._state.targets else "added")
         self._state.targets[target.id] = target
         self._state.update_timestamp()
 
@@ -210,6 +451,7 @@ class InMemoryStateManager(StateManager):
 
         del self._state.targets[target_to_remove]
         self._state.update_timestamp()
+        self._change_log.record("targets", target_to_remove, "removed")
 
     @property
     def event_bus(self) -> EventBus:
@@ -225,3 +467,4 @@ class InMemoryStateManager(StateManager):
         if self._state.session_metadata:
             self._state.session_metadata.add_command(command)
             self._state.update_timestamp()
+            self._change_log.record_metadata()
@@ -0,0 +1,294 @@
+"""SQLite-backed state management implementation."""
+
+from wish_models import (
+    CollectedData,
+    EngagementState,
+    Finding,
+    Host,
+    Service,
+    SessionMetadata,
+    Target,
+)
+
+from ..events import DataCollected, EventBus, FindingAdded, HostDiscovered, HostsMerged, ModeChanged
+from ..persistence.sqlite_store import SQLiteStore
+from .changes import ChangeListener, ChangeLog, StateChanges
+from .manager import StateManager, merge_host, vulnerability_key
+
+
+class SQLiteStateManager(StateManager):
+    """State manager that keeps engagement entities in SQLite instead of RAM.
+
+    Only the engagement header and session metadata are held in memory. Every
+    mutation is written through to the database, and the query methods below
+    answer common questions from indexes. get_current_state() still works: it
+    materializes the full EngagementState once and reuses it until the next
+    change made through this manager. The materialized state is a read-only
+    view; edits made to it directly are not written to the database, so
+    changes must go through the manager's methods.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteStore,
+        session_id: str = "default",
+        event_bus: EventBus | None = None,
+    ) -> None:
+        self._store = store
+        self._session_id = session_id
+        self._event_bus = event_bus or EventBus()
+        # Track reported vulnerabilities to avoid duplicates
+        self._reported_vulns: set[str] = set()
+        # Changes made through this manager (not persisted across restarts)
+        self._change_log = ChangeLog()
+        # Materialized state and the revision it was built at
+        self._state_cache: EngagementState | None = None
+        self._state_cache_revision = -1
+
+        header = store.load_session_header(session_id)
+        if header is None:
+            header = EngagementState(
+                id=session_id,
+                name="Default Engagement",
+                session_metadata=SessionMetadata(
+                    session_id=session_id,
+                    engagement_name="Default Engagement",
+                    current_mode="recon",
+                    notes=None,
+                    total_commands=0,
+                    total_hosts_discovered=0,
+                    total_findings=0,
+                ),
+            )
+            with store.transaction():
+                store.save_session_header(header)
+        self._header = header
+
+    @property
+    def session_id(self) -> str:
+        """Get the session ID this manager is bound to."""
+        return self._session_id
+
+    @property
+    def event_bus(self) -> EventBus:
+        """Get the event bus instance."""
+        return self._event_bus
+
+    @property
+    def revision(self) -> int:
+        """Get the current state revision, incremented on every change."""
+        return self._change_log.revision
+
+    def changes_since(self, revision: int) -> StateChanges:
+        """Get the entities added, updated or removed after the given revision."""
+        return self._change_log.changes_since(revision)
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Register a callback invoked for every entity or metadata change."""
+        self._change_log.add_listener(listener)
+
+    async def get_current_state(self) -> EngagementState:
+        """Get the current engagement state (materialized from the database)."""
+        return self.get_current_state_sync()
+
+    def get_current_state_sync(self) -> EngagementState:
+        """Get the current engagement state synchronously (rebuilt only after changes)."""
+        if self._state_cache is None or self._state_cache_revision != self.revision:
+            state = self._store.load_state(self._session_id)
+            self._state_cache = state if state is not None else self._header.model_copy(deep=True)
+            self._state_cache_revision = self.revision
+        return self._state_cache
+
+    async def snapshot(self) -> EngagementState:
+        """Get a deep copy of the current state."""
+        return self.get_current_state_sync().model_copy(deep=True)
+
+    async def update_hosts(self, hosts: list[Host]) -> None:
+        """Update host information with merge logic."""
+        merged_ids: list[str] = []
+        with self._store.transaction():
+            for host in hosts:
+                merged_ids.append(self._merge_into_store(host)[0])
+            self._touch()
+
+        # Per-host events carry the full stored host (merge_hosts avoids this load)
+        for host_id in merged_ids:
+            stored_host = self._store.get_host(self._session_id, host_id)
+            if stored_host is not None:
+                await self._event_bus.publish(HostDiscovered(host=stored_host))
+
+    async def merge_hosts(self, hosts: list[Host]) -> HostsMerged:
+        """Merge a batch of hosts in one transaction and publish a single batch event."""
+        added_host_ids: list[str] = []
+        updated_host_ids: list[str] = []
+        seen: set[str] = set()
+
+        with self._store.transaction():
+            for host in hosts:
+                host_id, added = self._merge_into_store(host)
+                if host_id in seen:
+                    continue
+                seen.add(host_id)
+                (added_host_ids if added else updated_host_ids).append(host_id)
+
+            if added_host_ids or updated_host_ids:
+                self._header.session_metadata.total_hosts_discovered += len(added_host_ids)
+                self._touch()
+                self._change_log.record_metadata()
+
+        event = HostsMerged(added_host_ids=added_host_ids, updated_host_ids=updated_host_ids)
+        if added_host_ids or updated_host_ids:
+            await self._event_bus.publish(event)
+        return event
+
+    async def remove_host(self, host_id: str) -> None:
+        """Remove a host and its services from the engagement."""
+        host = self._store.get_host(self._session_id, host_id)
+        with self._store.transaction():
+            if host is None or not self._store.delete_host(self._session_id, host_id):
+                raise ValueError(f"Host '{host_id}' not found")
+            self._touch()
+
+        for service in host.services:
+            self._change_log.record("services", service.id, "removed")
+        self._change_log.record("hosts", host_id, "removed")
+
+    async def add_finding(self, finding: Finding) -> None:
+        """Add a finding to the engagement."""
+        # Check for duplicate vulnerabilities
+        host_ip = self._store.get_host_ip(self._session_id, finding.host_id) if finding.host_id else None
+        vuln_key = vulnerability_key(finding, host_ip)
+        if vuln_key is not None:
+            # Skip if already reported
+            if vuln_key in self._reported_vulns:
+                return
+
+            # Mark as reported
+            self._reported_vulns.add(vuln_key)
+
+        with self._store.transaction():
+            added = self._store.upsert_finding(self._session_id, finding)
+            self._header.session_metadata.total_findings += 1
+            self._touch()
+        self._change_log.record("findings", finding.id, "added" if added else "updated")
+        self._change_log.record_metadata()
+
+        # Publish finding added event
+        await self._event_bus.publish(FindingAdded(finding=finding))
+
+    async def add_collected_data(self, data: CollectedData) -> None:
+        """Add collected data to the engagement."""
+        with self._store.transaction():
+            self._store.upsert_collected_data(self._session_id, data)
+            self._touch()
+        self._change_log.record("collected_data", data.id, "added")
+
+        # Publish data collected event
+        await self._event_bus.publish(DataCollected(data=data))
+
+    async def set_mode(self, mode: str) -> None:
+        """Set the current engagement mode."""
+        old_mode = self._header.session_metadata.current_mode
+        with self._store.transaction():
+            self._header.change_mode(mode)
+            self._store.save_session_header(self._header)
+        self._change_log.record_metadata()
+
+        # Publish mode changed event
+        await self._event_bus.publish(ModeChanged(old_mode=old_mode, new_mode=mode))
+
+    async def add_target(self, target: Target) -> None:
+        """Add a target to the engagement."""
+        with self._store.transaction():
+            self._store.upsert_target(self._session_id, target)
+            self._touch()
+        self._change_log.record("targets", target.id, "added")
+
+    async def remove_target(self, target_scope: str) -> None:
+        """Remove a target from the engagement."""
+        with self._store.transaction():
+            target_id = self._store.delete_target_by_scope(self._session_id, target_scope)
+            if not target_id:
+                raise ValueError(f"Target '{target_scope}' not found in scope")
+            self._touch()
+        self._change_log.record("targets", target_id, "removed")
+
+    async def initialize(self) -> None:
+        """Initialize the state manager."""
+        pass
+
+    async def add_command_to_history(self, command: str) -> None:
+        """Add a command to the session history."""
+        with self._store.transaction():
+            self._header.session_metadata.add_command(command)
+            self._touch()
+        self._change_log.record_metadata()
+
+    # Indexed queries (no full state materialization)
+
+    def get_host_by_ip(self, ip_address: str) -> Host | None:
+        """Look up a host by IP address."""
+        return self._store.get_host_by_ip(self._session_id, ip_address)
+
+    def get_hosts_with_open_port(self, port: int, protocol: str = "tcp") -> list[Host]:
+        """Get all hosts with the given port open."""
+        return self._store.query_hosts(self._session_id, open_port=port, protocol=protocol)
+
+    def get_active_hosts(self) -> list[Host]:
+        """Get all hosts that are up."""
+        return self._store.query_hosts(self._session_id, status="up")
+
+    def query_services(
+        self,
+        port: int | None = None,
+        service_name: str | None = None,
+        state: str | None = None,
+        host_id: str | None = None,
+    ) -> list[Service]:
+        """Query services by port, name, state and/or host."""
+        return self._store.query_services(
+            self._session_id, port=port, service_name=service_name, state=state, host_id=host_id
+        )
+
+    def query_findings(
+        self,
+        severity: str | None = None,
+        host_id: str | None = None,
+        category: str | None = None,
+    ) -> list[Finding]:
+        """Query findings by severity, host and/or category."""
+        return self._store.query_findings(self._session_id, severity=severity, host_id=host_id, category=category)
+
+    def count_hosts(self) -> int:
+        """Count hosts in the engagement."""
+        return self._store.count_hosts(self._session_id)
+
+    def _merge_into_store(self, host: Host) -> tuple[str, bool]:
+        """Merge a host into the database. Returns the stored host's ID and whether it was new."""
+        # Stored services are not materialized; their port/protocol keys are enough to merge
+        existing_host = self._store.get_host_header_by_ip(self._session_id, host.ip_address)
+        if existing_host is None:
+            self._store.upsert_hosts(self._session_id, [host])
+            self._change_log.record("hosts", host.id, "added")
+            for service in host.services:
+                self._change_log.record("services", service.id, "added")
+            return host.id, True
+
+        # The header has no services, so merge_host collects the incoming ones
+        # (deduplicated); only those on ports the host has no row for are new
+        known_keys = self._store.get_service_keys(self._session_id, existing_host.id)
+        merge_host(existing_host, host)
+        new_services = [
+            service for service in existing_host.services if (service.port, service.protocol) not in known_keys
+        ]
+        self._store.upsert_host(self._session_id, existing_host)
+        self._store.upsert_services(self._session_id, existing_host.id, new_services)
+        self._change_log.record("hosts", existing_host.id, "updated")
+        for service in new_services:
+            self._change_log.record("services", service.id, "added")
+        return existing_host.id, False
+
+    def _touch(self) -> None:
+        """Update timestamps and persist the header (inside the caller's transaction)."""
+        self._header.update_timestamp()
+        self._store.save_session_header(self._header)
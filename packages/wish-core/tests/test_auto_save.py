@@ -167,3 +167,99 @@ class TestAutoSaveManager:
         new_time = auto_save_manager.last_save_time
 
         assert new_time > old_time
+
+    async def test_incremental_save_uses_journal(self, temp_dir, sample_engagement_state):
+        """Test that entity-level changes are journaled instead of rewriting the snapshot."""
+        from wish_models import Host
+
+        session_store = SessionStore(base_path=temp_dir, journal_mode=True)
+        auto_save_manager = AutoSaveManager(
+            session_store=session_store,
+            state_provider=lambda: sample_engagement_state,
+        )
+
+        # First save writes the snapshot
+        auto_save_manager.mark_changes()
+        assert await auto_save_manager.force_save()
+        snapshot = session_store.current_session_file.read_text()
+
+        host = Host(id="host-1", ip_address="10.0.0.1", discovered_by="test")
+        sample_engagement_state.hosts[host.id] = host
+        auto_save_manager.mark_changes("hosts", host.id)
+        assert await auto_save_manager.force_save()
+
+        assert session_store.current_session_file.read_text() == snapshot
+        assert session_store.journal_record_count > 0
+        assert not auto_save_manager.has_unsaved_changes
+
+        loaded = await SessionStore(base_path=temp_dir).load_current_session()
+        assert "host-1" in loaded.hosts
+
+    async def test_debounce_coalesces_burst(self, session_store, sample_engagement_state):
+        """Test that a burst of changes is saved once the changes stop."""
+        auto_save_manager = AutoSaveManager(
+            session_store=session_store,
+            save_interval=10,
+            state_provider=lambda: sample_engagement_state,
+            debounce_delay=0.3,
+        )
+        await auto_save_manager.start_auto_save()
+
+        for i in range(5):
+            auto_save_manager.mark_changes("hosts", f"host-{i}")
+            await asyncio.sleep(0.1)
+
+        # Still inside the debounce window of the last change
+        assert not session_store.current_session_file.exists()
+        assert auto_save_manager.dirty_entities == {("hosts", f"host-{i}") for i in range(5)}
+
+        await asyncio.sleep(0.5)
+        assert session_store.current_session_file.exists()
+        assert not auto_save_manager.has_unsaved_changes
+        assert auto_save_manager.dirty_entities == frozenset()
+
+        await auto_save_manager.stop_auto_save()
+
+    async def test_max_latency_bounds_continuous_changes(self, session_store, sample_engagement_state):
+        """Test that continuous changes are still saved within save_interval."""
+        auto_save_manager = AutoSaveManager(
+            session_store=session_store,
+            save_interval=0.5,
+            state_provider=lambda: sample_engagement_state,
+            debounce_delay=5,
+        )
+        await auto_save_manager.start_auto_save()
+
+        for _ in range(8):
+            auto_save_manager.mark_changes("session_metadata")
+            await asyncio.sleep(0.1)
+
+        assert session_store.current_session_file.exists()
+
+        await auto_save_manager.stop_auto_save()
+
+    async def test_cancelled_save_keeps_pending_changes(self, session_store, sample_engagement_state):
+        """Test that changes taken by a save that gets cancelled are put back."""
+        save_started = asyncio.Event()
+
+        async def slow_save(engagement_state):
+            save_started.set()
+            await asyncio.sleep(10)
+
+        session_store.save_current_session = slow_save
+        auto_save_manager = AutoSaveManager(
+            session_store=session_store,
+            state_provider=lambda: sample_engagement_state,
+        )
+        auto_save_manager.mark_changes("hosts", "host-1")
+
+        save_task = asyncio.create_task(auto_save_manager.force_save())
+        await save_started.wait()
+        assert auto_save_manager.dirty_entities == frozenset()
+
+        save_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await save_task
+
+        assert auto_save_manager.dirty_entities == frozenset({("hosts", "host-1")})
+        assert auto_save_manager.has_unsaved_changes
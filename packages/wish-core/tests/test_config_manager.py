@@ -189,3 +189,55 @@ api_key = "config-key"
                 assert result["api_key_configured"] is False
                 assert result["api_key_source"] is None
                 assert len(result["issues"]) > 0
+
+    def test_load_config_is_cached_until_file_changes(self):
+        """Test that the parsed config is reused until the file's mtime/size changes."""
+        with patch.dict(os.environ, {}, clear=True):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                config_path = Path(temp_dir) / "config.toml"
+                config_path.write_text('[llm]\nmodel = "gpt-4o"\n')
+                manager = ConfigManager(config_path=config_path)
+
+                config = manager.load_config()
+                with patch("wish_core.config.manager.tomllib.load") as mock_load:
+                    assert manager.load_config() is config
+                    assert manager.get_llm_config() is config.llm
+                    mock_load.assert_not_called()
+
+                config_path.write_text('[llm]\nmodel = "gpt-4o-mini"\n')
+                os.utime(config_path, ns=(0, 0))
+
+                assert manager.get_llm_config().model == "gpt-4o-mini"
+
+    def test_env_override_change_invalidates_cache(self):
+        """Test that changing an override environment variable rebuilds the config."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = Path(temp_dir) / "config.toml"
+            config_path.write_text("")
+            manager = ConfigManager(config_path=config_path)
+
+            with patch.dict(os.environ, {"WISH_LLM_TIMEOUT": "30"}, clear=True):
+                assert manager.get_llm_config().timeout == 30
+            with patch.dict(os.environ, {"WISH_LLM_TIMEOUT": "60"}, clear=True):
+                assert manager.get_llm_config().timeout == 60
+
+    def test_reload_runs_hooks(self):
+        """Test that explicit and mtime-triggered reloads call the reload hooks."""
+        with patch.dict(os.environ, {}, clear=True):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                config_path = Path(temp_dir) / "config.toml"
+                config_path.write_text("[general]\ndebug_mode = false\n")
+                manager = ConfigManager(config_path=config_path)
+                seen = []
+                manager.add_reload_hook(lambda config: seen.append(config.general.debug_mode))
+
+                manager.load_config()
+                assert seen == []
+
+                manager.reload()
+                assert seen == [False]
+
+                config_path.write_text("[general]\ndebug_mode = true\n")
+                os.utime(config_path, ns=(0, 0))
+                manager.load_config()
+                assert seen == [False, True]
@@ -1,5 +1,7 @@
 """Tests for event system functionality."""
 
+import asyncio
+
 import pytest
 from wish_models import CollectedData, Finding, Host
 
@@ -189,3 +191,131 @@ class TestEventBus:
 
         # The successful handler should still have received the event
         assert len(successful_events) == 1
+
+    async def test_invalid_publish_mode(self):
+        """Test that an unknown publish mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown publish mode"):
+            EventBus(mode="parallel")
+
+    async def test_handler_stats(self, event_bus, sample_host):
+        """Test per-handler timing statistics."""
+
+        async def handler(event):
+            pass
+
+        async def failing_handler(event):
+            raise Exception("Handler failed")
+
+        event_bus.subscribe(HostDiscovered, handler)
+        event_bus.subscribe(HostDiscovered, failing_handler)
+
+        await event_bus.publish(HostDiscovered(host=sample_host))
+        await event_bus.publish(HostDiscovered(host=sample_host))
+
+        stats = event_bus.get_handler_stats()
+        handler_stats = next(s for s in stats if s.name.endswith(".handler"))
+        failing_stats = next(s for s in stats if s.name.endswith(".failing_handler"))
+        assert handler_stats.calls == 2
+        assert handler_stats.errors == 0
+        assert failing_stats.calls == 2
+        assert failing_stats.errors == 2
+        assert handler_stats.max_time >= handler_stats.average_time >= 0
+
+        event_bus.reset_stats()
+        assert event_bus.get_handler_stats() == []
+
+    async def test_handler_stats_keyed_by_handler(self, event_bus, sample_host):
+        """Test that handlers sharing a name (lambdas, methods of different instances) get separate stats."""
+
+        class Listener:
+            async def on_host(self, event):
+                pass
+
+        async def noop(event):
+            pass
+
+        first, second = Listener(), Listener()
+        event_bus.subscribe(HostDiscovered, first.on_host)
+        event_bus.subscribe(HostDiscovered, second.on_host)
+        event_bus.subscribe(HostDiscovered, lambda event: noop(event))
+        event_bus.subscribe(HostDiscovered, lambda event: noop(event))
+
+        await event_bus.publish(HostDiscovered(host=sample_host))
+
+        stats = event_bus.get_handler_stats()
+        assert len(stats) == 4
+        assert all(s.calls == 1 for s in stats)
+        assert sum(s.name.endswith("Listener.on_host") for s in stats) == 2
+
+
+@pytest.mark.unit
+class TestEventBusModes:
+    """Test concurrent and queued publish modes."""
+
+    @pytest.fixture
+    def sample_event(self):
+        """Create a sample ModeChanged event for testing."""
+        return ModeChanged(old_mode="recon", new_mode="exploit")
+
+    async def test_concurrent_mode_runs_handlers_together(self, sample_event):
+        """Test that concurrent mode overlaps slow handlers."""
+        event_bus = EventBus(mode="concurrent")
+        started = []
+        release = asyncio.Event()
+
+        async def slow_handler(event):
+            started.append("slow")
+            await release.wait()
+
+        async def fast_handler(event):
+            started.append("fast")
+            release.set()
+
+        event_bus.subscribe(ModeChanged, slow_handler)
+        event_bus.subscribe(ModeChanged, fast_handler)
+
+        # Sequential dispatch would deadlock here since slow_handler waits on fast_handler
+        await asyncio.wait_for(event_bus.publish(sample_event), timeout=1)
+        assert started == ["slow", "fast"]
+
+    async def test_queued_mode_does_not_wait_for_handlers(self, sample_event):
+        """Test that queued mode returns before slow handlers finish."""
+        event_bus = EventBus(mode="queued")
+        received = []
+        release = asyncio.Event()
+
+        async def slow_handler(event):
+            await release.wait()
+            received.append(event)
+
+        event_bus.subscribe(ModeChanged, slow_handler)
+
+        await asyncio.wait_for(event_bus.publish(sample_event), timeout=1)
+        assert received == []
+
+        release.set()
+        await event_bus.drain()
+        assert received == [sample_event]
+
+        await event_bus.close()
+        assert event_bus.pending_events == 0
+
+    async def test_queued_mode_backpressure(self, sample_event):
+        """Test that publish blocks when the queue is full."""
+        event_bus = EventBus(mode="queued", max_queue_size=1)
+        release = asyncio.Event()
+
+        async def blocking_handler(event):
+            await release.wait()
+
+        event_bus.subscribe(ModeChanged, blocking_handler)
+
+        await event_bus.publish(sample_event)  # picked up by the worker
+        await asyncio.sleep(0)
+        await event_bus.publish(sample_event)  # fills the queue
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(event_bus.publish(sample_event), timeout=0.05)
+
+        release.set()
+        await event_bus.close()
@@ -0,0 +1,90 @@
+"""Tests for the parser registry."""
+
+import pytest
+from wish_models import Finding, Host, Service
+
+from wish_core.parsers import SNIFF_CHARS, ParserRegistry, ToolParser
+
+
+class FakeParser(ToolParser):
+    """Parser recognizing output that starts with a marker."""
+
+    def __init__(self, name, marker):
+        self.name = name
+        self.marker = marker
+        self.sniffed: list[str] = []
+        self.formats_seen: list[str | None] = []
+
+    @property
+    def tool_name(self):
+        return self.name
+
+    @property
+    def supported_formats(self):
+        return ["text", "json"]
+
+    def can_parse(self, output, format_hint=None):
+        return output.startswith(self.marker)
+
+    def sniff(self, prefix):
+        self.sniffed.append(prefix)
+        return super().sniff(prefix)
+
+    def parse_hosts(self, output, format_hint=None) -> list[Host]:
+        self.formats_seen.append(format_hint)
+        return []
+
+    def parse_services(self, output, format_hint=None) -> list[Service]:
+        self.formats_seen.append(format_hint)
+        return []
+
+    def parse_findings(self, output, format_hint=None) -> list[Finding]:
+        self.formats_seen.append(format_hint)
+        return []
+
+
+@pytest.mark.unit
+class TestParserRegistry:
+    """Test ParserRegistry dispatch."""
+
+    @pytest.fixture
+    def parsers(self):
+        """Two parsers with distinct output markers."""
+        return FakeParser("alpha", "ALPHA"), FakeParser("beta", "BETA")
+
+    @pytest.fixture
+    def registry(self, parsers):
+        """Registry holding both parsers."""
+        return ParserRegistry(list(parsers))
+
+    def test_dispatch_by_tool_name(self, registry, parsers):
+        """Test that a known tool name selects its parser without sniffing the others."""
+        alpha, beta = parsers
+
+        match = registry.detect("ALPHA output", tool_name="Alpha")
+
+        assert match is not None
+        assert match.parser is alpha
+        assert match.format == "text"
+        assert beta.sniffed == []
+        assert registry.detect("BETA output", tool_name="alpha") is None
+
+    def test_sniff_uses_bounded_prefix(self, registry, parsers):
+        """Test that unknown tools are detected from the start of the output only."""
+        _, beta = parsers
+        output = "BETA" + "x" * (SNIFF_CHARS * 4)
+
+        assert registry.find_parser(output) is beta
+        assert all(len(prefix) == SNIFF_CHARS for prefix in beta.sniffed)
+        assert registry.find_parser("unrelated output") is None
+
+    def test_match_reuses_detected_format(self, registry, parsers):
+        """Test that a match passes its format to every parse call."""
+        alpha, _ = parsers
+
+        match = registry.detect("ALPHA output", format_hint="json")
+        assert match is not None
+        match.parse_all("ALPHA output")
+
+        assert alpha.formats_seen == ["json", "json", "json"]
+        assert registry.detect("ALPHA output", format_hint="xml") is None
@@ -0,0 +1,174 @@
+"""Tests for session serialization formats."""
+
+import os
+import tempfile
+import time
+
+import pytest
+from wish_models import EngagementState, Host, Service, SessionMetadata
+
+from wish_core.persistence.serializers import (
+    JSONSerializer,
+    MsgpackSerializer,
+    available_formats,
+    detect_serializer,
+    get_serializer,
+)
+from wish_core.persistence.session_store import SessionStore
+
+
+def _make_engagement(service_count: int, services_per_host: int = 10) -> EngagementState:
+    """Build a synthetic engagement with the given number of services."""
+    state = EngagementState(name="Benchmark", session_metadata=SessionMetadata(session_id="bench"))
+    for host_index in range(max(1, service_count // services_per_host)):
+        host = Host(
+            ip_address=f"10.{host_index // 65536 % 256}.{host_index // 256 % 256}.{host_index % 256}",
+            status="up",
+            discovered_by="nmap",
+        )
+        host.services = [
+            Service(
+                host_id=host.id,
+                port=1000 + port,
+                protocol="tcp",
+                state="open",
+                service_name="http",
+                product="nginx",
+                version="1.18.0",
+                discovered_by="nmap",
+            )
+            for port in range(services_per_host)
+        ]
+        state.hosts[host.id] = host
+    return state
+
+
+@pytest.mark.unit
+class TestSerializers:
+    """Test serializer selection and round-trips."""
+
+    @pytest.fixture
+    def session_store(self):
+        """Create a SessionStore instance for testing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield SessionStore(base_path=tmpdir)
+
+    @pytest.fixture
+    def sample_data(self, session_store):
+        """Session dictionary as produced by SessionStore."""
+        return session_store._engagement_state_to_dict(_make_engagement(20))
+
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+    def test_round_trip(self, name, session_store):
+        """Test that every available format round-trips an engagement."""
+        if name not in available_formats():
+            pytest.skip(f"{name} dependency not installed")
+
+        state = _make_engagement(20)
+        raw = get_serializer(name).dumps(session_store._engagement_state_to_dict(state))
+        loaded = session_store._dict_to_engagement_state(detect_serializer(raw).loads(raw))
+
+        assert loaded.hosts == state.hosts
+        assert loaded.session_metadata.session_start == state.session_metadata.session_start
+
+    def test_json_is_default_and_readable(self, sample_data):
+        """Test that the json format stays human-readable."""
+        assert "json" in available_formats()
+        raw = JSONSerializer().dumps(sample_data)
+        assert raw.startswith(b"{\n")
+
+    def test_msgpack_has_magic_header(self, sample_data):
+        """Test that msgpack output is identified by its magic header."""
+        if "msgpack" not in available_formats():
+            pytest.skip("msgspec not installed")
+
+        raw = get_serializer("msgpack").dumps(sample_data)
+        assert raw.startswith(MsgpackSerializer.magic)
+        assert isinstance(detect_serializer(raw), MsgpackSerializer)
+
+    def test_unknown_format(self):
+        """Test that an unknown format name is rejected."""
+        with pytest.raises(ValueError, match="Unknown session format"):
+            get_serializer("yaml")
+
+    @pytest.mark.parametrize("write_format", ["json", "orjson", "msgpack"])
+    async def test_session_store_reads_any_format(self, write_format):
+        """Test that a store loads sessions regardless of the format they were written in."""
+        if write_format not in available_formats():
+            pytest.skip(f"{write_format} dependency not installed")
+
+        state = _make_engagement(20)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            writer = SessionStore(base_path=tmpdir, serializer=write_format)
+            reader = SessionStore(base_path=tmpdir)
+
+            await writer.save_current_session(state)
+            snapshot_name = writer.current_session_file.name
+            loaded = await reader.load_current_session()
+
+            archive_path = await writer.archive_session(state)
+            archived = await reader.load_archived_session(archive_path)
+            listed = await reader.list_archived_sessions()
+
+        suffix = get_serializer(write_format).suffix
+        assert snapshot_name == f"current_session{suffix}"
+        assert archive_path.endswith(suffix)
+        assert loaded is not None and archived is not None
+        assert loaded.hosts.keys() == state.hosts.keys()
+        assert archived.hosts.keys() == state.hosts.keys()
+        assert len(listed) == 1
+
+    async def test_switching_format_replaces_snapshot(self):
+        """Test that saving in a new format loads the old snapshot and then replaces it."""
+        if "msgpack" not in available_formats():
+            pytest.skip("msgspec not installed")
+
+        state = _make_engagement(5)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            await SessionStore(base_path=tmpdir).save_current_session(state)
+            store = SessionStore(base_path=tmpdir, serializer="msgpack")
+
+            loaded = await store.load_current_session()
+            await store.save_current_session(loaded)
+            snapshots = sorted(path.name for path in store.sessions_dir.glob("current_session.*"))
+
+        assert loaded.hosts.keys() == state.hosts.keys()
+        assert snapshots == ["current_session.msgpack"]
+
+
+@pytest.mark.benchmark
+class TestSerializerBenchmark:
+    """Compare serializer throughput on synthetic engagements.
+
+    Only the smallest size runs by default; set WISH_RUN_BENCHMARKS=1 to
+    include the 10k and 100k service engagements. Run with -s to see timings.
+    """
+
+    @pytest.mark.parametrize("service_count", [1_000, 10_000, 100_000])
+    async def test_serializer_throughput(self, service_count):
+        """Time a full session save and load (model conversion included) for each available format."""
+        if service_count > 1_000 and not os.environ.get("WISH_RUN_BENCHMARKS"):
+            pytest.skip("set WISH_RUN_BENCHMARKS=1 to run large benchmarks")
+
+        state = _make_engagement(service_count)
+
+        print(f"\n{service_count} services:")
+        for name in available_formats():
+            with tempfile.TemporaryDirectory() as tmpdir:
+                session_store = SessionStore(base_path=tmpdir, serializer=name)
+
+                start = time.perf_counter()
+                await session_store.save_current_session(state)
+                save_time = time.perf_counter() - start
+                size = session_store.current_session_file.stat().st_size
+
+                start = time.perf_counter()
+                loaded = await session_store.load_current_session()
+                load_time = time.perf_counter() - start
+
+            assert loaded is not None
+            assert loaded.hosts.keys() == state.hosts.keys()
+            print(
+                f"  {name:8s} size={size / 1024:10.1f} KiB "
+                f"save={save_time * 1000:8.1f} ms load={load_time * 1000:8.1f} ms"
+            )
@@ -166,6 +166,36 @@ class TestSessionStore:
         archives_after = await session_store.list_archived_sessions()
         assert len(archives_after) == 3
 
+    async def test_list_archives_reads_only_catalog(self, session_store, sample_engagement_state):
+        """Test that listing uses the catalog instead of opening archives."""
+        await session_store.archive_session(sample_engagement_state, "catalog")
+        assert session_store.archive_catalog_file.exists()
+
+        def fail_read(path):
+            raise AssertionError(f"archive {path} was opened")
+
+        session_store._read_session_file = fail_read
+        archives = await session_store.list_archived_sessions()
+        assert [a["engagement_name"] for a in archives] == [sample_engagement_state.name]
+
+    async def test_archive_catalog_rebuilds_when_missing_or_stale(self, session_store, sample_engagement_state):
+        """Test that the catalog is rebuilt when deleted or out of date."""
+        first = await session_store.archive_session(sample_engagement_state, "first")
+        second = await session_store.archive_session(sample_engagement_state, "second")
+
+        # Missing catalog is rebuilt from the archives
+        session_store.archive_catalog_file.unlink()
+        assert len(await session_store.list_archived_sessions()) == 2
+        assert session_store.archive_catalog_file.exists()
+
+        # Archives removed or added behind the store's back are picked up
+        Path(first).unlink()
+        external = Path(second).with_name("external.json")
+        external.write_bytes(Path(second).read_bytes())
+
+        archives = await session_store.list_archived_sessions()
+        assert sorted(Path(a["file_path"]).name for a in archives) == sorted([Path(second).name, "external.json"])
+
     async def test_corrupted_session_file_handling(self, session_store, temp_dir):
         """Test handling of corrupted session files."""
         # Create a corrupted session file
@@ -199,3 +229,153 @@ class TestSessionStore:
             # Missing 'findings'
         }
         assert not session_store._validate_session_data(invalid_data)
+
+
+@pytest.mark.unit
+class TestSessionStoreJournal:
+    """Test write-ahead journal mode of SessionStore."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for testing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    @pytest.fixture
+    def session_store(self, temp_dir):
+        """Create a journaling SessionStore instance for testing."""
+        return SessionStore(base_path=temp_dir, journal_mode=True, compact_threshold=10)
+
+    @pytest.fixture
+    def engagement(self):
+        """Create an EngagementState for testing."""
+        return EngagementState(
+            id="journal-test",
+            name="Journal Test",
+            session_metadata=SessionMetadata(session_id="journal-123"),
+        )
+
+    def _make_host(self, index):
+        return Host(id=f"host-{index}", ip_address=f"10.0.0.{index}", discovered_by="test")
+
+    def test_from_config_enables_journal_by_default(self, temp_dir):
+        """Test that a store built from the default config journals its saves."""
+        from wish_core.config.manager import GeneralConfig
+
+        session_store = SessionStore.from_config(GeneralConfig(), base_path=temp_dir)
+        assert session_store.journal_mode
+        assert session_store.compact_threshold == 500
+
+        session_store = SessionStore.from_config(GeneralConfig(session_journal=False), base_path=temp_dir)
+        assert not session_store.journal_mode
+
+    async def test_first_append_writes_snapshot(self, session_store, engagement):
+        """Test that the first incremental save without a snapshot writes one."""
+        host = self._make_host(1)
+        engagement.hosts[host.id] = host
+
+        await session_store.append_changes(engagement, [("hosts", host.id)])
+
+        assert session_store.current_session_file.exists()
+        assert not session_store.journal_file.exists()
+
+    async def test_append_and_replay(self, session_store, engagement, temp_dir):
+        """Test that journaled changes are replayed on load."""
+        await session_store.save_current_session(engagement)
+        snapshot_before = session_store.current_session_file.read_text()
+
+        host = self._make_host(1)
+        engagement.hosts[host.id] = host
+        engagement.session_metadata.add_command("nmap 10.0.0.1")
+        await session_store.append_changes(engagement, [("hosts", host.id)])
+
+        # Snapshot untouched, change only in the journal
+        assert session_store.current_session_file.read_text() == snapshot_before
+        assert session_store.journal_file.exists()
+
+        # Remove the host again
+        del engagement.hosts[host.id]
+        await session_store.append_changes(engagement, [("hosts", host.id)])
+
+        host2 = self._make_host(2)
+        engagement.hosts[host2.id] = host2
+        await session_store.append_changes(engagement, [("hosts", host2.id)])
+
+        # Simulate a restart (crash recovery) with a fresh store
+        loaded = await SessionStore(base_path=temp_dir, journal_mode=True).load_current_session()
+        assert loaded is not None
+        assert list(loaded.hosts) == ["host-2"]
+        assert loaded.session_metadata.command_history == ["nmap 10.0.0.1"]
+
+    async def test_truncated_journal_tail_is_ignored(self, session_store, engagement, temp_dir):
+        """Test that a torn last journal record does not break loading."""
+        await session_store.save_current_session(engagement)
+        host = self._make_host(1)
+        engagement.hosts[host.id] = host
+        await session_store.append_changes(engagement, [("hosts", host.id)])
+
+        with open(session_store.journal_file, "a", encoding="utf-8") as f:
+            f.write('{"op":"put","c":"hosts","id":"host-9","d":{')
+
+        loaded = await SessionStore(base_path=temp_dir, journal_mode=True).load_current_session()
+        assert loaded is not None
+        assert list(loaded.hosts) == ["host-1"]
+
+    async def test_compaction(self, session_store, engagement, temp_dir):
+        """Test that the journal is folded into a snapshot at the threshold."""
+        await session_store.save_current_session(engagement)
+
+        for i in range(1, 12):
+            host = self._make_host(i)
+            engagement.hosts[host.id] = host
+            await session_store.append_changes(engagement, [("hosts", host.id)])
+
+        # Compaction happened at least once, so the journal is short again
+        assert session_store.journal_record_count < session_store.compact_threshold
+
+        loaded = await SessionStore(base_path=temp_dir).load_current_session()
+        assert loaded is not None
+        assert len(loaded.hosts) == 11
+
+    async def test_integrity_report_on_load_and_compaction(self, session_store, engagement):
+        """Test that loading and compaction run the engagement integrity pass."""
+        await session_store.save_current_session(engagement)
+        assert session_store.last_integrity_report is None
+
+        for i in range(1, 12):
+            host = self._make_host(i)
+            engagement.hosts[host.id] = host
+            await session_store.append_changes(engagement, [("hosts", host.id)])
+
+        assert session_store.last_integrity_report is not None
+        assert session_store.last_integrity_report.is_valid
+
+        session_store.last_integrity_report = None
+        await session_store.load_current_session()
+        report = session_store.last_integrity_report
+        assert report is not None
+        assert report.is_valid
+        assert report.checked_references >= 11
+
+    async def test_stale_journal_is_discarded(self, session_store, engagement, temp_dir):
+        """Test that a journal from an older snapshot generation is not replayed."""
+        await session_store.save_current_session(engagement)
+        host = self._make_host(1)
+        engagement.hosts[host.id] = host
+        await session_store.append_changes(engagement, [("hosts", host.id)])
+        stale_journal = session_store.journal_file.read_text()
+
+        # Compact, then simulate a crash that left the old journal behind
+        del engagement.hosts[host.id]
+        await session_store.compact(engagement)
+        session_store.journal_file.write_text(stale_journal)
+
+        loaded = await SessionStore(base_path=temp_dir).load_current_session()
+        assert loaded is not None
+        assert loaded.hosts == {}
+
+    async def test_unknown_collection_rejected(self, session_store, engagement):
+        """Test that unknown collections are rejected."""
+        await session_store.save_current_session(engagement)
+        with pytest.raises(ValueError, match="Unknown journal collection"):
+            await session_store.append_changes(engagement, [("services", "svc-1")])
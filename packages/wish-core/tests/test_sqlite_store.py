@@ -0,0 +1,299 @@
+"""Tests for SQLite-backed state and session management."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+from wish_models import CollectedData, EngagementState, Finding, Host, Service, SessionMetadata, Target
+
+from wish_core.events import EventBus, HostsMerged
+from wish_core.persistence.sqlite_store import SQLiteStore
+from wish_core.session import SQLiteSessionManager
+from wish_core.state.sqlite import SQLiteStateManager
+
+
+def _make_host(ip: str, ports: list[int], status: str = "up") -> Host:
+    host = Host(ip_address=ip, status=status, discovered_by="nmap")
+    host.services = [
+        Service(
+            host_id=host.id, port=port, protocol="tcp", state="open", service_name=f"svc{port}", discovered_by="nmap"
+        )
+        for port in ports
+    ]
+    return host
+
+
+@pytest.mark.unit
+class TestSQLiteStateManager:
+    """Test SQLiteStateManager implementation."""
+
+    @pytest.fixture
+    def db_path(self):
+        """Create a temporary database path for testing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield str(Path(tmpdir) / "wish.db")
+
+    @pytest.fixture
+    def store(self, db_path):
+        """Create a SQLiteStore instance for testing."""
+        store = SQLiteStore(db_path)
+        yield store
+        store.close()
+
+    @pytest.fixture
+    def event_bus(self):
+        """Create an EventBus instance for testing."""
+        return EventBus()
+
+    @pytest.fixture
+    def state_manager(self, store, event_bus):
+        """Create a SQLiteStateManager instance for testing."""
+        return SQLiteStateManager(store, session_id="sqlite-test", event_bus=event_bus)
+
+    async def test_default_state(self, state_manager):
+        """Test that a fresh session starts empty."""
+        state = await state_manager.get_current_state()
+        assert state.session_metadata.session_id == "sqlite-test"
+        assert state.session_metadata.current_mode == "recon"
+        assert state.hosts == {}
+
+    async def test_update_hosts_merges_by_ip(self, state_manager):
+        """Test that hosts with the same IP are merged and services deduplicated."""
+        await state_manager.update_hosts([_make_host("10.0.0.1", [22, 80])])
+        await state_manager.update_hosts([_make_host("10.0.0.1", [80, 445])])
+
+        state = await state_manager.get_current_state()
+        assert len(state.hosts) == 1
+        host = next(iter(state.hosts.values()))
+        assert sorted(s.port for s in host.services) == [22, 80, 445]
+
+    async def test_merge_hosts_batch_event(self, state_manager, event_bus):
+        """Test that merge_hosts publishes a single batch event."""
+        events = []
+
+        async def handler(event):
+            events.append(event)
+
+        event_bus.subscribe(HostsMerged, handler)
+
+        hosts = [_make_host(f"10.0.0.{i}", [22]) for i in range(1, 4)]
+        result = await state_manager.merge_hosts(hosts)
+
+        assert events == [result]
+        assert len(result.added_host_ids) == 3
+        assert state_manager.count_hosts() == 3
+        state = await state_manager.get_current_state()
+        assert state.session_metadata.total_hosts_discovered == 3
+
+    async def test_indexed_queries(self, state_manager):
+        """Test indexed queries without materializing the whole state."""
+        await state_manager.merge_hosts(
+            [
+                _make_host("10.0.0.1", [22, 445]),
+                _make_host("10.0.0.2", [80]),
+                _make_host("10.0.0.3", [445], status="down"),
+            ]
+        )
+
+        smb_hosts = state_manager.get_hosts_with_open_port(445)
+        assert sorted(h.ip_address for h in smb_hosts) == ["10.0.0.1", "10.0.0.3"]
+        assert sorted(h.ip_address for h in state_manager.get_active_hosts()) == ["10.0.0.1", "10.0.0.2"]
+        assert [s.port for s in state_manager.query_services(service_name="svc80")] == [80]
+        assert state_manager.get_host_by_ip("10.0.0.2").services[0].port == 80
+        assert state_manager.get_host_by_ip("10.0.0.9") is None
+
+    async def test_findings_and_deduplication(self, state_manager):
+        """Test findings are stored, queried and deduplicated."""
+        host = _make_host("10.0.0.1", [21])
+        await state_manager.update_hosts([host])
+
+        for _ in range(2):
+            await state_manager.add_finding(
+                Finding(
+                    title="vsftpd backdoor",
+                    description="vsftpd 2.3.4 backdoor",
+                    category="vulnerability",
+                    severity="critical",
+                    target_type="host",
+                    host_id=host.id,
+                    cve_ids=["CVE-2011-2523"],
+                    discovered_by="nmap",
+                )
+            )
+
+        assert len(state_manager.query_findings(severity="critical")) == 1
+        assert len(state_manager.query_findings(host_id=host.id)) == 1
+        assert state_manager.query_findings(severity="low") == []
+
+    async def test_targets_and_collected_data(self, state_manager):
+        """Test target and collected data persistence."""
+        await state_manager.add_target(Target(scope="10.0.0.0/24", scope_type="cidr"))
+        await state_manager.add_collected_data(
+            CollectedData(type="credentials", content="admin:admin", discovered_by="t")
+        )
+
+        state = await state_manager.get_current_state()
+        assert len(state.targets) == 1
+        assert len(state.collected_data) == 1
+
+        await state_manager.remove_target("10.0.0.0/24")
+        with pytest.raises(ValueError, match="not found in scope"):
+            await state_manager.remove_target("10.0.0.0/24")
+
+    async def test_remove_host(self, state_manager):
+        """Test removing a host also removes its services."""
+        host = _make_host("10.0.0.1", [22])
+        await state_manager.update_hosts([host])
+        await state_manager.remove_host(host.id)
+
+        assert state_manager.count_hosts() == 0
+        assert state_manager.query_services(port=22) == []
+        with pytest.raises(ValueError, match="not found"):
+            await state_manager.remove_host(host.id)
+
+    async def test_changes_since_revision(self, state_manager):
+        """Test that write-through mutations are recorded in the change log."""
+        host = _make_host("10.0.0.1", [22])
+        await state_manager.update_hosts([host])
+        start = state_manager.revision
+
+        await state_manager.update_hosts([_make_host("10.0.0.1", [22, 80])])
+        await state_manager.add_target(Target(scope="10.0.0.0/24", scope_type="cidr"))
+        await state_manager.remove_target("10.0.0.0/24")
+
+        changes = state_manager.changes_since(start)
+        assert changes.hosts.changed == [host.id]
+        assert len(changes.services.added) == 1
+        assert not changes.targets
+
+    async def test_current_state_cached_until_changed(self, state_manager):
+        """Test that the materialized state is reused until the next change."""
+        first = await state_manager.get_current_state()
+        assert await state_manager.get_current_state() is first
+
+        await state_manager.update_hosts([_make_host("10.0.0.1", [22])])
+        second = await state_manager.get_current_state()
+        assert second is not first
+        assert len(second.hosts) == 1
+
+        snapshot = await state_manager.snapshot()
+        assert snapshot is not second
+        assert snapshot == second
+
+    async def test_merge_writes_only_new_services(self, state_manager, store):
+        """Test that merging keeps existing service rows (and their order) untouched."""
+        await state_manager.update_hosts([_make_host("10.0.0.1", [80, 22])])
+        rowids_before = {
+            row["port"]: row["rowid"] for row in store._conn.execute("SELECT rowid, port FROM services").fetchall()
+        }
+
+        await state_manager.update_hosts([_make_host("10.0.0.1", [443, 22])])
+
+        rows = store._conn.execute("SELECT rowid, port FROM services ORDER BY rowid").fetchall()
+        assert [row["port"] for row in rows] == [80, 22, 443]
+        assert {row["port"]: row["rowid"] for row in rows if row["port"] != 443} == rowids_before
+        host = state_manager.get_host_by_ip("10.0.0.1")
+        assert [service.port for service in host.services] == [80, 22, 443]
+
+    async def test_finding_update_recorded_as_updated(self, state_manager):
+        """Test that re-adding a finding with the same ID is recorded as an update."""
+        finding = Finding(
+            title="Anonymous FTP",
+            description="Anonymous login allowed",
+            category="misconfiguration",
+            severity="medium",
+            target_type="host",
+            discovered_by="nmap",
+        )
+        await state_manager.add_finding(finding)
+        start = state_manager.revision
+
+        await state_manager.add_finding(finding.model_copy(update={"severity": "high"}))
+
+        changes = state_manager.changes_since(start)
+        assert changes.findings.changed == [finding.id]
+        assert changes.findings.added == []
+        assert [f.severity for f in state_manager.query_findings()] == ["high"]
+
+    async def test_duplicate_service_ports_are_upserted(self, state_manager):
+        """Test that duplicate port/protocol entries in parser output do not violate the unique index."""
+        host = _make_host("10.0.0.1", [80, 80])
+        host.services[1].service_name = "http-alt"
+        await state_manager.merge_hosts([host])
+
+        await state_manager.merge_hosts([_make_host("10.0.0.1", [80, 22])])
+
+        assert sorted(s.port for s in state_manager.query_services()) == [22, 80]
+        assert [s.service_name for s in state_manager.query_services(port=80)] == ["http-alt"]
+
+    async def test_merge_does_not_load_stored_services(self, state_manager, store, monkeypatch):
+        """Test that merging into an existing host never materializes its stored services."""
+        await state_manager.merge_hosts([_make_host("10.0.0.1", list(range(1, 101)))])
+
+        def fail(*args, **kwargs):
+            raise AssertionError("stored services were materialized")
+
+        monkeypatch.setattr(store, "_hosts_from_rows", fail)
+        event = await state_manager.merge_hosts([_make_host("10.0.0.1", [100, 443])])
+        monkeypatch.undo()
+
+        assert len(event.updated_host_ids) == 1
+        assert len(state_manager.query_services()) == 101
+
+    async def test_state_survives_reopen(self, db_path):
+        """Test that state persists across store instances."""
+        store = SQLiteStore(db_path)
+        manager = SQLiteStateManager(store, session_id="persist")
+        await manager.update_hosts([_make_host("10.0.0.1", [22])])
+        await manager.set_mode("exploit")
+        await manager.add_command_to_history("nmap 10.0.0.1")
+        store.close()
+
+        store = SQLiteStore(db_path)
+        manager = SQLiteStateManager(store, session_id="persist")
+        state = await manager.get_current_state()
+        store.close()
+
+        assert len(state.hosts) == 1
+        assert state.session_metadata.current_mode == "exploit"
+        assert state.session_metadata.command_history == ["nmap 10.0.0.1"]
+
+
+@pytest.mark.unit
+class TestSQLiteSessionManager:
+    """Test SQLiteSessionManager implementation."""
+
+    @pytest.fixture
+    def session_manager(self):
+        """Create a SQLiteSessionManager backed by an in-memory database."""
+        store = SQLiteStore(":memory:")
+        yield SQLiteSessionManager(store)
+        store.close()
+
+    async def test_save_load_list_delete(self, session_manager):
+        """Test the session lifecycle."""
+        state = EngagementState(name="SQLite Session", session_metadata=SessionMetadata(session_id="s-1"))
+        host = _make_host("10.0.0.1", [22, 80])
+        state.hosts[host.id] = host
+
+        await session_manager.save_session(state)
+
+        loaded = await session_manager.load_session("s-1")
+        assert loaded is not None
+        assert loaded.name == "SQLite Session"
+        assert len(loaded.hosts[host.id].services) == 2
+
+        sessions = await session_manager.list_sessions()
+        assert [s.session_id for s in sessions] == ["s-1"]
+
+        # Saving again only updates the metadata; entities are written through the state manager
+        state.hosts.clear()
+        state.name = "Renamed Session"
+        await session_manager.save_session(state)
+        loaded = await session_manager.load_session("s-1")
+        assert loaded.name == "Renamed Session"
+        assert list(loaded.hosts) == [host.id]
+
+        await session_manager.delete_session("s-1")
+        assert await session_manager.load_session("s-1") is None
+        assert await session_manager.load_session("missing") is None
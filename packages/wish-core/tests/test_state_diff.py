@@ -0,0 +1,114 @@
+"""Tests for engagement state diffs."""
+
+import pytest
+from wish_models import Finding, Host, Target
+
+from wish_core.state import ChangeLog, InMemoryStateManager, diff_states
+
+
+@pytest.mark.unit
+class TestStateDiff:
+    """Test diff_states."""
+
+    @pytest.fixture
+    def state_manager(self):
+        """Create a StateManager instance for testing."""
+        return InMemoryStateManager()
+
+    async def test_no_changes(self, state_manager):
+        """Test that identical snapshots produce an empty diff."""
+        await state_manager.update_hosts([Host(ip_address="10.0.0.1", discovered_by="nmap")])
+
+        diff = diff_states(await state_manager.snapshot(), await state_manager.snapshot())
+
+        assert not diff.has_changes
+        assert not diff.hosts
+
+    async def test_added_changed_and_removed(self, state_manager):
+        """Test that added, changed and removed entities are reported."""
+        kept = Host(ip_address="10.0.0.1", status="up", discovered_by="nmap")
+        removed = Host(ip_address="10.0.0.2", status="up", discovered_by="nmap")
+        await state_manager.update_hosts([kept, removed])
+        before = await state_manager.snapshot()
+
+        await state_manager.update_hosts([Host(ip_address="10.0.0.1", status="down", discovered_by="nmap")])
+        added = Host(ip_address="10.0.0.3", discovered_by="nmap")
+        await state_manager.update_hosts([added])
+        await state_manager.remove_host(removed.id)
+        await state_manager.add_target(Target(scope="10.0.0.0/24", scope_type="cidr"))
+        finding = Finding(
+            title="Open SSH",
+            description="SSH exposed",
+            category="information_disclosure",
+            severity="info",
+            target_type="host",
+            host_id=kept.id,
+            discovered_by="nmap",
+        )
+        await state_manager.add_finding(finding)
+        await state_manager.set_mode("exploit")
+        await state_manager.add_command_to_history("nmap -sV 10.0.0.1")
+
+        diff = diff_states(before, await state_manager.snapshot())
+
+        assert diff.has_changes
+        assert diff.hosts.added == [added.id]
+        assert diff.hosts.removed == [removed.id]
+        assert diff.hosts.changed == [kept.id]
+        assert len(diff.targets.added) == 1
+        assert diff.findings.added == [finding.id]
+        assert not diff.collected_data
+        assert diff.mode_change == ("recon", "exploit")
+        assert diff.new_commands == ["nmap -sV 10.0.0.1"]
+
+    async def test_diff_of_deep_copies(self, state_manager):
+        """Test that diffs also work on independently copied states."""
+        await state_manager.update_hosts([Host(ip_address="10.0.0.1", discovered_by="nmap")])
+        state = await state_manager.get_current_state()
+
+        before = state.model_copy(deep=True)
+        after = state.model_copy(deep=True)
+        assert not diff_states(before, after).has_changes
+
+        next(iter(after.hosts.values())).status = "down"
+        assert diff_states(before, after).hosts.changed == list(after.hosts)
+
+
+@pytest.mark.unit
+class TestChangeLog:
+    """Test ChangeLog revision tracking."""
+
+    def test_net_changes(self):
+        """Test folding of consecutive changes to one entity."""
+        log = ChangeLog()
+        log.record("hosts", "a", "added")
+        start = log.revision
+        log.record("hosts", "a", "updated")
+        log.record("hosts", "b", "added")
+        log.record("hosts", "b", "updated")
+        log.record("hosts", "c", "added")
+        log.record("hosts", "c", "removed")
+        log.record("findings", "f", "removed")
+        log.record("findings", "f", "added")
+
+        changes = log.changes_since(start)
+        assert changes.hosts.changed == ["a"]
+        assert changes.hosts.added == ["b"]
+        assert changes.hosts.removed == []
+        assert changes.findings.changed == ["f"]
+        assert not changes.metadata_changed
+
+    def test_truncated_log_requires_reload(self):
+        """Test that revisions older than the bounded log ask for a full reload."""
+        log = ChangeLog(max_entries=2)
+        for entity_id in ("a", "b", "c"):
+            log.record("hosts", entity_id, "added")
+
+        assert log.changes_since(0).full_reload_required
+        assert log.changes_since(1).hosts.added == ["b", "c"]
+        assert log.changes_since(log.revision + 1).full_reload_required
+
+    def test_unknown_collection(self):
+        """Test that unknown collections are rejected."""
+        with pytest.raises(ValueError, match="Unknown change collection"):
+            ChangeLog().record("sessions", "x", "added")
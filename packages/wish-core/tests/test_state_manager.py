@@ -1,5 +1,7 @@
 """Tests for state management functionality."""
 
+import asyncio
+import time
 from datetime import UTC
 
 import pytest
@@ -344,3 +346,257 @@ class TestInMemoryStateManager:
     async def test_event_bus_property(self, state_manager, event_bus):
         """Test event bus property access."""
         assert state_manager.event_bus is event_bus
+
+    async def test_host_indexes_track_merges(self, state_manager):
+        """Test that IP, MAC and hostname indexes stay consistent across merges."""
+        host1 = Host(ip_address="10.0.0.1", hostnames=["alpha.local"], discovered_by="nmap")
+        await state_manager.update_hosts([host1])
+
+        host2 = Host(
+            ip_address="10.0.0.1",
+            hostnames=["Beta.local"],
+            mac_address="AA:BB:CC:DD:EE:FF",
+            discovered_by="nmap",
+        )
+        await state_manager.update_hosts([host2])
+
+        assert state_manager.get_host_by_ip("10.0.0.1") is not None
+        assert state_manager.get_host_by_ip("10.0.0.1").id == host1.id
+        assert state_manager.get_host_by_mac("aa:bb:cc:dd:ee:ff").id == host1.id
+        assert [h.id for h in state_manager.get_hosts_by_hostname("beta.local")] == [host1.id]
+        assert state_manager.get_host_by_ip("10.0.0.2") is None
+
+    async def test_remove_host_updates_indexes(self, state_manager):
+        """Test that removing a host drops it from all indexes."""
+        host = Host(
+            ip_address="10.0.0.5",
+            hostnames=["gamma.local"],
+            mac_address="00:11:22:33:44:55",
+            discovered_by="nmap",
+        )
+        await state_manager.update_hosts([host])
+        await state_manager.remove_host(host.id)
+
+        state = await state_manager.get_current_state()
+        assert host.id not in state.hosts
+        assert state_manager.get_host_by_ip("10.0.0.5") is None
+        assert state_manager.get_host_by_mac("00:11:22:33:44:55") is None
+        assert state_manager.get_hosts_by_hostname("gamma.local") == []
+
+        with pytest.raises(ValueError, match="not found"):
+            await state_manager.remove_host(host.id)
+
+    async def test_load_state_rebuilds_indexes(self, state_manager):
+        """Test that indexes are rebuilt when a session is reloaded."""
+        from wish_models import EngagementState, SessionMetadata
+
+        host = Host(ip_address="10.0.0.9", discovered_by="nmap")
+        loaded = EngagementState(name="Reloaded", session_metadata=SessionMetadata(session_id="reloaded"))
+        loaded.hosts[host.id] = host
+
+        state_manager.load_state(loaded)
+        assert state_manager.get_host_by_ip("10.0.0.9").id == host.id
+
+        # Merging into the reloaded state must not create a duplicate host
+        await state_manager.update_hosts([Host(ip_address="10.0.0.9", discovered_by="nmap")])
+        state = await state_manager.get_current_state()
+        assert len(state.hosts) == 1
+
+    async def test_merge_hosts_publishes_single_batch_event(self, state_manager, event_bus):
+        """Test that merge_hosts merges a batch and publishes one HostsMerged event."""
+        from wish_core.events import HostsMerged
+
+        batch_events = []
+        host_events = []
+
+        async def batch_handler(event):
+            batch_events.append(event)
+
+        async def host_handler(event):
+            host_events.append(event)
+
+        event_bus.subscribe(HostsMerged, batch_handler)
+        event_bus.subscribe(HostDiscovered, host_handler)
+
+        existing = Host(ip_address="10.0.1.1", discovered_by="nmap")
+        await state_manager.update_hosts([existing])
+        host_events.clear()
+
+        new_hosts = [Host(ip_address=f"10.0.1.{i}", status="up", discovered_by="nmap") for i in range(1, 6)]
+        result = await state_manager.merge_hosts(new_hosts)
+
+        state = await state_manager.get_current_state()
+        assert len(state.hosts) == 5
+        assert result.updated_host_ids == [existing.id]
+        assert result.added_host_ids == [h.id for h in new_hosts[1:]]
+        assert state.hosts[existing.id].status == "up"
+        assert state.session_metadata.total_hosts_discovered == 4
+
+        assert batch_events == [result]
+        assert host_events == []
+
+    async def test_merge_hosts_empty_batch(self, state_manager, event_bus):
+        """Test that an empty batch publishes nothing."""
+        from wish_core.events import HostsMerged
+
+        events = []
+
+        async def handler(event):
+            events.append(event)
+
+        event_bus.subscribe(HostsMerged, handler)
+
+        result = await state_manager.merge_hosts([])
+        assert result.added_host_ids == []
+        assert result.updated_host_ids == []
+        assert events == []
+
+    async def test_snapshot_is_isolated_from_later_changes(self, state_manager):
+        """Test that snapshots share unchanged hosts and copy modified ones."""
+        from wish_models import Service
+
+        host = Host(ip_address="10.0.0.1", status="up", discovered_by="nmap")
+        other = Host(ip_address="10.0.0.2", status="up", discovered_by="nmap")
+        await state_manager.update_hosts([host, other])
+
+        snapshot = await state_manager.snapshot()
+
+        update = Host(ip_address="10.0.0.1", status="down", discovered_by="nmap")
+        update.services = [
+            Service(host_id=update.id, port=22, protocol="tcp", state="open", discovered_by="nmap"),
+        ]
+        await state_manager.update_hosts([update, Host(ip_address="10.0.0.3", discovered_by="nmap")])
+        await state_manager.set_mode("exploit")
+
+        # Snapshot still reflects the state at the time it was taken
+        assert len(snapshot.hosts) == 2
+        assert snapshot.hosts[host.id].status == "up"
+        assert snapshot.hosts[host.id].services == []
+        assert snapshot.session_metadata.current_mode == "recon"
+
+        # Live state has the merged copy; untouched hosts are still shared
+        state = await state_manager.get_current_state()
+        assert state.hosts[host.id] is not snapshot.hosts[host.id]
+        assert state.hosts[host.id].status == "down"
+        assert len(state.hosts[host.id].services) == 1
+        assert state.hosts[other.id] is snapshot.hosts[other.id]
+        assert state_manager.get_host_by_ip("10.0.0.1") is state.hosts[host.id]
+
+    async def test_changes_since_revision(self, state_manager):
+        """Test that the change log reports net changes since a revision."""
+        from wish_models import Service
+
+        host = Host(ip_address="10.0.0.1", status="up", discovered_by="nmap")
+        await state_manager.update_hosts([host])
+        start = state_manager.revision
+
+        update = Host(ip_address="10.0.0.1", status="up", discovered_by="nmap")
+        service = Service(host_id=update.id, port=80, protocol="tcp", state="open", discovered_by="nmap")
+        update.services = [service]
+        transient = Host(ip_address="10.0.0.2", discovered_by="nmap")
+        await state_manager.merge_hosts([update, transient])
+        await state_manager.remove_host(transient.id)
+        await state_manager.add_collected_data(CollectedData(type="credentials", content="a:b", discovered_by="t"))
+
+        changes = state_manager.changes_since(start)
+        assert changes.revision == state_manager.revision > start
+        assert changes.hosts.changed == [host.id]
+        assert changes.hosts.added == []
+        assert changes.hosts.removed == []  # added and removed within the window
+        assert changes.services.added == [service.id]
+        assert len(changes.collected_data.added) == 1
+        assert changes.metadata_changed
+
+        # Nothing new since the current revision
+        assert not state_manager.changes_since(state_manager.revision).has_changes
+
+    async def test_changes_since_requires_reload_after_load_state(self, state_manager):
+        """Test that replacing the state invalidates older revisions."""
+        revision = state_manager.revision
+        await state_manager.update_hosts([Host(ip_address="10.0.0.1", discovered_by="nmap")])
+
+        state_manager.load_state(await state_manager.snapshot())
+
+        assert state_manager.changes_since(revision).full_reload_required
+        assert not state_manager.changes_since(state_manager.revision).has_changes
+
+    async def test_query_index_maintained_incrementally(self, state_manager):
+        """Test that manager mutations keep a built query index current without a rebuild."""
+        from wish_models import Service
+
+        host = Host(ip_address="10.0.0.1", status="up", discovered_by="nmap")
+        await state_manager.update_hosts([host])
+        state = await state_manager.get_current_state()
+        query = state.query()
+
+        update = Host(ip_address="10.0.0.1", status="up", discovered_by="nmap")
+        update.services = [Service(host_id=update.id, port=445, protocol="tcp", state="open", discovered_by="nmap")]
+        other = Host(ip_address="10.0.0.2", status="up", discovered_by="nmap")
+        await state_manager.merge_hosts([update, other])
+        finding = Finding(
+            title="SMB signing disabled",
+            description="Test",
+            category="vulnerability",
+            severity="medium",
+            target_type="host",
+            discovered_by="test",
+            host_id=host.id,
+        )
+        await state_manager.add_finding(finding)
+        await state_manager.remove_host(other.id)
+
+        assert query.is_current(state)
+        assert state.query() is query
+        assert [s.port for s in query.services(port=445, host_id=host.id)] == [445]
+        assert [f.id for f in query.findings_for_host(state.hosts[host.id])] == [finding.id]
+        assert [h.id for h in query.active_hosts()] == [host.id]
+
+    async def test_merging_after_query_scales_linearly(self):
+        """Test that a built query index does not make host merging quadratic."""
+
+        async def merge_time(host_count: int) -> float:
+            manager = InMemoryStateManager()
+            state = await manager.get_current_state()
+            query = state.query()
+            hosts = [
+                Host(ip_address=f"10.{i // 65536}.{i // 256 % 256}.{i % 256}", discovered_by="nmap")
+                for i in range(host_count)
+            ]
+            start = time.perf_counter()
+            await manager.merge_hosts(hosts)
+            elapsed = time.perf_counter() - start
+            assert state.peek_query_index() is query
+            assert len(query.hosts()) == host_count
+            return elapsed
+
+        small, large = await merge_time(2000), await merge_time(8000)
+
+        # 4x the hosts: about 4x the time when linear, 16x when quadratic
+        assert large < small * 10
+
+    async def test_slow_subscriber_does_not_delay_merge_hosts(self):
+        """Test that with the configured publish mode a blocked subscriber does not hold up merges."""
+        from wish_core.config.manager import GeneralConfig
+        from wish_core.events import HostsMerged
+
+        event_bus = EventBus(mode=GeneralConfig().event_bus_mode)
+        manager = InMemoryStateManager(event_bus=event_bus)
+        release = asyncio.Event()
+        received: list[HostsMerged] = []
+
+        async def slow_subscriber(event: HostsMerged) -> None:
+            await release.wait()
+            received.append(event)
+
+        event_bus.subscribe(HostsMerged, slow_subscriber)
+
+        # A sequential bus would block here until release is set
+        event = await asyncio.wait_for(
+            manager.merge_hosts([Host(ip_address="10.0.0.1", discovered_by="nmap")]), timeout=1
+        )
+        assert len(event.added_host_ids) == 1
+        assert received == []
+
+        release.set()
+        await event_bus.close()
+        assert received == [event]
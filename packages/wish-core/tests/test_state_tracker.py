@@ -141,6 +141,21 @@ class TestStateChangeTracker:
         # Should have been called once for each change
         assert auto_save_manager.mark_changes.call_count == 3
 
+    async def test_watch_marks_state_manager_changes(
+        self, state_tracker, auto_save_manager, sample_host, sample_finding
+    ):
+        """Test that a watched state manager marks its mutations for auto-save."""
+        from wish_core.state.manager import InMemoryStateManager
+
+        state_manager = InMemoryStateManager()
+        state_tracker.watch(state_manager)
+
+        await state_manager.merge_hosts([sample_host])
+        await state_manager.add_finding(sample_finding)
+
+        assert auto_save_manager.has_unsaved_changes
+        assert auto_save_manager.dirty_entities == {("hosts", sample_host.id), ("findings", sample_finding.id)}
+
     def test_tracker_with_real_auto_save(self, session_store):
         """Test state tracker with real auto save manager."""
         from wish_models import EngagementState, SessionMetadata
@@ -7,8 +7,11 @@ for the wish penetration testing command center.
 
 from .data import CollectedData
 from .engagement import EngagementState, Target
+from .factory import TrustedModelFactory
 from .finding import Finding
 from .host import Host, Service, SMBInfo, SMBShare
+from .query import EngagementIndex
+from .scope import ScopeIndex
 from .session import SessionMetadata
 from .validation import ValidationError, ValidationResult
 
@@ -25,6 +28,8 @@ SessionMetadata.model_rebuild()
 
 __all__ = [
     "EngagementState",
+    "EngagementIndex",
+    "ScopeIndex",
     "Target",
     "Host",
     "Service",
@@ -33,6 +38,7 @@ __all__ = [
     "Finding",
     "CollectedData",
     "SessionMetadata",
+    "TrustedModelFactory",
     "ValidationError",
     "ValidationResult",
 ]
@@ -6,15 +6,55 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Literal
 from uuid import uuid4
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator, model_validator
 
 if TYPE_CHECKING:
     from .data import CollectedData
     from .finding import Finding
     from .host import Host, Service
+    from .query import EngagementIndex
+    from .scope import ScopeIndex
     from .session import SessionMetadata
 
 
+def _new_query_index() -> "EngagementIndex":
+    """Create an empty query index (imported lazily: query imports the entity modules)"""
+    from .query import EngagementIndex
+
+    return EngagementIndex()
+
+
+class _ScopeCache:
+    """Scope index cached per target fingerprint (never affects model equality)"""
+
+    __slots__ = ("fingerprint", "index")
+
+    def __init__(self) -> None:
+        self.fingerprint: tuple[tuple[str, str, str, bool], ...] | None = None
+        self.index: ScopeIndex | None = None
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _ScopeCache)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class _CollectionRevisions:
+    """Change counters of the indexed collections (never affect model equality)"""
+
+    __slots__ = ("hosts", "findings", "collected_data")
+
+    def __init__(self) -> None:
+        self.hosts = 0
+        self.findings = 0
+        self.collected_data = 0
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _CollectionRevisions)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
 class Target(BaseModel):
     """Definition of penetration test target"""
 
@@ -73,6 +113,58 @@ class EngagementState(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), description="Creation date and time")
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC), description="Last update date and time")
 
+    # Query and scope indexes (not serialized, populated on first use)
+    _query_index: "EngagementIndex" = PrivateAttr(default_factory=_new_query_index)
+    _revisions: _CollectionRevisions = PrivateAttr(default_factory=_CollectionRevisions)
+
+    _scope_cache: _ScopeCache = PrivateAttr(default_factory=_ScopeCache)
+
+    def query(self) -> "EngagementIndex":
+        """Get the indexed query engine, rebuilding it if the collections changed since it was synchronized"""
+        index = self._query_index
+        if index.owner is not None and index.owner is not self:
+            # Copies share private attributes; give this state its own index
+            index = _new_query_index()
+            self._query_index = index
+        if not index.is_current(self):
+            index.rebuild(self)
+        return index
+
+    def peek_query_index(self) -> "EngagementIndex | None":
+        """Get the query index only if it is built and current (for incremental maintenance)"""
+        index = self._query_index
+        return index if index.is_current(self) else None
+
+    def mark_changed(self, *collections: Literal["hosts", "findings", "collected_data"]) -> None:
+        """Record that entities of the given collections were edited in place
+
+        Entities added to or removed from a collection are noticed by query()
+        on its own; edits to existing hosts (services included), findings or
+        collected data must be reported here so the next query() reindexes.
+        """
+        revisions = self._revisions
+        for collection in collections:
+            setattr(revisions, collection, getattr(revisions, collection) + 1)
+
+    def scope_index(self) -> "ScopeIndex":
+        """Get the scope membership index, rebuilt only when targets change"""
+        from .scope import ScopeIndex
+
+        fingerprint = tuple(
+            (target.id, target.scope, target.scope_type, target.in_scope) for target in self.targets.values()
+        )
+        cache = self._scope_cache
+        if cache.index is None or cache.fingerprint != fingerprint:
+            cache = _ScopeCache()
+            cache.fingerprint = fingerprint
+            cache.index = ScopeIndex(self.targets.values())
+            self._scope_cache = cache
+        return cache.index
+
+    def is_in_scope(self, value: str) -> bool:
+        """Check whether an IP address, CIDR, URL or domain is covered by the in-scope targets"""
+        return self.scope_index().is_in_scope(value)
+
     # Helper methods
     def get_active_hosts(self) -> list["Host"]:
         """Get list of active hosts"""
@@ -0,0 +1,247 @@
+"""
+Trusted bulk construction of models from machine-generated tool output.
+"""
+
+import copy
+import ipaddress
+import re
+import sys
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+from .finding import Finding
+from .host import Host, Service
+from .validation import ValidationError, validate_datetime_not_future
+
+_HOST_STATUSES = frozenset({"up", "down", "unknown"})
+_PROTOCOLS = frozenset({"tcp", "udp"})
+_PORT_STATES = frozenset({"open", "closed", "filtered"})
+_SEVERITIES = frozenset({"info", "low", "medium", "high", "critical"})
+_TARGET_TYPES = frozenset({"host", "service", "application", "network"})
+_CATEGORIES = frozenset(
+    {
+        "vulnerability",
+        "misconfiguration",
+        "information_disclosure",
+        "weak_authentication",
+        "encryption_issue",
+        "other",
+    }
+)
+
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
+
+_MISSING = object()
+_IMMUTABLE_DEFAULTS = (type(None), str, int, float, bool, tuple, frozenset)
+
+_MAC_PATTERN = re.compile(r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$")
+_CVE_PATTERN = re.compile(r"^CVE-\d{4}-\d{4,}$")
+
+
+class _ModelTemplate(Generic[_ModelT]):
+    """Precomputed field layout for building a model instance without validation
+
+    pydantic's model_construct() re-inspects every field on each call and ends
+    up slower than validation for these models; this resolves defaults once.
+    """
+
+    def __init__(self, model: type[_ModelT]) -> None:
+        self.model = model
+        self.required = frozenset(name for name, field in model.model_fields.items() if field.is_required())
+        # Field order is kept so the instance __dict__ matches a validated one
+        self.layout: dict[str, Any] = {}
+        self.factories: dict[str, Callable[[], Any]] = {}
+        for name, field in model.model_fields.items():
+            self.layout[name] = _MISSING
+            if field.default_factory is not None:
+                self.factories[name] = field.default_factory  # type: ignore[assignment]
+            elif not field.is_required():
+                if isinstance(field.default, _IMMUTABLE_DEFAULTS):
+                    self.layout[name] = field.default
+                else:
+                    self.factories[name] = partial(copy.deepcopy, field.default)
+        # Resolved without ModelPrivateAttr.get_default(), whose signature differs across pydantic 2.x
+        self.private_factories: dict[str, Callable[[], Any]] = {}
+        for name, attr in model.__private_attributes__.items():
+            if attr.default_factory is not None:
+                self.private_factories[name] = attr.default_factory  # type: ignore[assignment]
+            elif attr.default is not PydanticUndefined:
+                self.private_factories[name] = partial(copy.deepcopy, attr.default)
+
+    def build(self, values: dict[str, Any]) -> _ModelT:
+        """Create an instance from already-trusted field values"""
+        missing = self.required.difference(values)
+        if missing:
+            raise ValidationError([f"Missing required field(s): {', '.join(sorted(missing))}"])
+
+        data = self.layout.copy()
+        data.update(values)
+        for name, factory in self.factories.items():
+            if data[name] is _MISSING:
+                data[name] = factory()
+
+        instance = self.model.__new__(self.model)
+        object.__setattr__(instance, "__dict__", data)
+        object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(
+            instance,
+            "__pydantic_private__",
+            {name: factory() for name, factory in self.private_factories.items()}
+            if self.model.__private_attributes__
+            else None,
+        )
+        return instance
+
+
+def _check_confidence(value: float | None, field: str) -> None:
+    if value is not None and not 0.0 <= value <= 1.0:
+        raise ValidationError([f"{field} {value} must be between 0.0 and 1.0"])
+
+
+def _check_choice(value: str, choices: frozenset[str], field: str) -> None:
+    if value not in choices:
+        raise ValidationError([f"Invalid {field}: {value}"])
+
+
+class TrustedModelFactory:
+    """Builds Host/Service/Finding models without running pydantic validation
+
+    For parsers of machine-generated output (nmap etc.). Discovery metadata is
+    validated once per factory; each model only gets cheap invariant checks
+    (IP parse, MAC/CVE regex, range and choice checks), raising the same
+    ValidationError the model validators raise. Field types are trusted:
+    callers must pass values of the annotated types.
+    """
+
+    _host_template = _ModelTemplate(Host)
+    _service_template = _ModelTemplate(Service)
+    _finding_template = _ModelTemplate(Finding)
+
+    def __init__(self, discovered_by: str, discovered_at: datetime | None = None) -> None:
+        if discovered_at is None:
+            discovered_at = datetime.now(UTC)
+        self.discovered_by = discovered_by
+        self.discovered_at = validate_datetime_not_future(discovered_at).raise_if_invalid()
+
+    def host(
+        self,
+        ip_address: str,
+        *,
+        hostnames: list[str] | None = None,
+        status: str = "unknown",
+        os_info: str | None = None,
+        os_confidence: float | None = None,
+        mac_address: str | None = None,
+        **fields: Any,
+    ) -> Host:
+        """Build a host (extra keyword arguments are set as-is)"""
+        try:
+            ipaddress.ip_address(ip_address)
+        except ValueError:
+            raise ValidationError([f"Invalid IP address format: {ip_address}"]) from None
+        _check_choice(status, _HOST_STATUSES, "host status")
+        _check_confidence(os_confidence, "OS confidence")
+        if mac_address is not None and not _MAC_PATTERN.match(mac_address):
+            raise ValidationError([f"Invalid MAC address format: {mac_address}"])
+
+        return self._host_template.build(
+            dict(
+                ip_address=ip_address,
+                hostnames=hostnames if hostnames is not None else [],
+                status=status,
+                os_info=os_info,
+                os_confidence=os_confidence,
+                mac_address=mac_address,
+                discovered_by=self.discovered_by,
+                discovered_at=self.discovered_at,
+                last_seen=self.discovered_at,
+                **fields,
+            )
+        )
+
+    def service(
+        self,
+        host_id: str,
+        port: int,
+        protocol: str,
+        state: str,
+        *,
+        service_name: str | None = None,
+        product: str | None = None,
+        version: str | None = None,
+        extrainfo: str | None = None,
+        confidence: float | None = None,
+        banner: str | None = None,
+        **fields: Any,
+    ) -> Service:
+        """Build a service (extra keyword arguments are set as-is)"""
+        if not 1 <= port <= 65535:
+            raise ValidationError([f"Port {port} is out of valid range (1-65535)"])
+        _check_choice(protocol, _PROTOCOLS, "protocol")
+        _check_choice(state, _PORT_STATES, "port state")
+        _check_confidence(confidence, "Confidence score")
+        # Large scans repeat the same few names thousands of times; share one copy of each
+        if service_name is not None:
+            service_name = sys.intern(service_name)
+        if product is not None:
+            product = sys.intern(product)
+        if version is not None:
+            version = sys.intern(version)
+
+        return self._service_template.build(
+            dict(
+                host_id=host_id,
+                port=port,
+                protocol=protocol,
+                service_name=service_name,
+                product=product,
+                version=version,
+                extrainfo=extrainfo,
+                state=state,
+                confidence=confidence,
+                banner=banner,
+                discovered_by=self.discovered_by,
+                discovered_at=self.discovered_at,
+                **fields,
+            )
+        )
+
+    def finding(
+        self,
+        title: str,
+        description: str,
+        category: str,
+        target_type: str,
+        *,
+        severity: str = "info",
+        cve_ids: list[str] | None = None,
+        **fields: Any,
+    ) -> Finding:
+        """Build a finding (extra keyword arguments are set as-is; url is not checked)"""
+        _check_choice(category, _CATEGORIES, "finding category")
+        _check_choice(target_type, _TARGET_TYPES, "target type")
+        _check_choice(severity, _SEVERITIES, "severity")
+        cve_ids = cve_ids if cve_ids is not None else []
+        for cve_id in cve_ids:
+            if not _CVE_PATTERN.match(cve_id):
+                raise ValidationError([f"Invalid CVE ID format: {cve_id}. Expected format: CVE-YYYY-NNNN"])
+
+        return self._finding_template.build(
+            dict(
+                title=title,
+                description=description,
+                category=category,
+                target_type=target_type,
+                severity=severity,
+                cve_ids=cve_ids,
+                discovered_by=self.discovered_by,
+                discovered_at=self.discovered_at,
+                **fields,
+            )
+        )
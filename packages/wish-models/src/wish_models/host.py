@@ -6,7 +6,7 @@ from datetime import UTC, datetime
 from typing import Any, Literal
 from uuid import uuid4
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 
 
 class SMBShare(BaseModel):
@@ -102,6 +102,22 @@ class Service(BaseModel):
     model_config = ConfigDict()
 
 
+class _ServiceIndex:
+    """(port, protocol) -> service lookup cache for a Host (never affects model equality)"""
+
+    __slots__ = ("by_key", "services", "count")
+
+    def __init__(self) -> None:
+        self.by_key: dict[tuple[int, str], Service] = {}
+        self.services: list[Service] | None = None
+        self.count = 0
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _ServiceIndex)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
 class Host(BaseModel):
     """Information about discovered hosts"""
 
@@ -131,6 +147,9 @@ class Host(BaseModel):
     tags: list[str] = Field(default_factory=list, description="Tags (DMZ, internal network, etc.)")
     notes: str | None = Field(None, description="Manually added notes")
 
+    # Service lookup index (not serialized, rebuilt when services change outside add_service)
+    _service_index: _ServiceIndex = PrivateAttr(default_factory=_ServiceIndex)
+
     @field_validator("ip_address")
     @classmethod
     def validate_ip_format(cls, v: str) -> str:
@@ -167,25 +186,55 @@ class Host(BaseModel):
         result = validate_datetime_not_future(v)
         return result.raise_if_invalid()
 
+    def get_service(self, port: int, protocol: str = "tcp") -> Service | None:
+        """Get the service on a port/protocol"""
+        return self._get_service_index().get((port, protocol))
+
     def add_service(self, service: Service) -> None:
         """Add or update service"""
         # Check for existing service (same port/protocol)
-        for existing_service in self.services:
-            if existing_service.port == service.port and existing_service.protocol == service.protocol:
-                # Update existing service
-                existing_service.service_name = service.service_name or existing_service.service_name
-                existing_service.product = service.product or existing_service.product
-                existing_service.version = service.version or existing_service.version
-                existing_service.extrainfo = service.extrainfo or existing_service.extrainfo
-                existing_service.banner = service.banner or existing_service.banner
-                existing_service.ssl_info = service.ssl_info or existing_service.ssl_info
-                existing_service.state = service.state
-                existing_service.confidence = service.confidence or existing_service.confidence
-                return
+        existing_service = self.get_service(service.port, service.protocol)
+        if existing_service is not None:
+            # Update existing service
+            existing_service.service_name = service.service_name or existing_service.service_name
+            existing_service.product = service.product or existing_service.product
+            existing_service.version = service.version or existing_service.version
+            existing_service.extrainfo = service.extrainfo or existing_service.extrainfo
+            existing_service.banner = service.banner or existing_service.banner
+            existing_service.ssl_info = service.ssl_info or existing_service.ssl_info
+            existing_service.state = service.state
+            existing_service.confidence = service.confidence or existing_service.confidence
+            return
 
         # Add new service
         service.host_id = self.id
+        self._append_service(service)
+
+    def add_service_if_missing(self, service: Service) -> bool:
+        """Add service unless one with the same port/protocol exists (existing one is kept)"""
+        if self.get_service(service.port, service.protocol) is not None:
+            return False
+        self._append_service(service)
+        return True
+
+    def _append_service(self, service: Service) -> None:
+        """Append a service, keeping the lookup index current"""
+        by_key = self._get_service_index()
         self.services.append(service)
+        by_key[(service.port, service.protocol)] = service
+        self._service_index.count = len(self.services)
+
+    def _get_service_index(self) -> dict[tuple[int, str], Service]:
+        """Get the service index, rebuilding it if services were replaced or changed directly"""
+        index = self._service_index
+        if index.services is not self.services or index.count != len(self.services):
+            # First service wins, matching the order add_service would have produced
+            index.by_key = {}
+            for service in self.services:
+                index.by_key.setdefault((service.port, service.protocol), service)
+            index.services = self.services
+            index.count = len(self.services)
+        return index.by_key
 
     def update_last_seen(self) -> None:
         """Update last seen time"""
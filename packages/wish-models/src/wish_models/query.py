@@ -0,0 +1,367 @@
+"""
+Indexed queries over an engagement state.
+"""
+
+import ipaddress
+import re
+from collections.abc import Collection, Iterable
+from typing import TYPE_CHECKING, TypeVar
+
+from .data import CollectedData
+from .finding import Finding
+from .host import Host, Service
+
+if TYPE_CHECKING:
+    from .engagement import EngagementState
+
+# IP addresses mentioned in finding titles/descriptions; IPv6 candidates are
+# validated (and normalized) with the ipaddress module
+_IPV4_PATTERN = re.compile(r"(?<![\d.])(?:\d{1,3}\.){3}\d{1,3}(?![\d.])")
+_IPV6_PATTERN = re.compile(
+    r"(?<![\w:])(?:[0-9A-Fa-f]{0,4}:){2,7}(?:(?:\d{1,3}\.){3}\d{1,3}|[0-9A-Fa-f]{1,4})?(?![\w:]|\.\d)"
+)
+
+_SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3, "info": 4}
+
+_K = TypeVar("_K")
+_T = TypeVar("_T")
+
+
+def _add(index: dict[_K, dict[str, _T]], key: _K, entity_id: str, entity: _T) -> None:
+    """Add an entity to an index bucket"""
+    index.setdefault(key, {})[entity_id] = entity
+
+
+def _discard(index: dict[_K, dict[str, _T]], key: _K, entity_id: str) -> None:
+    """Remove an entity from an index bucket, dropping the bucket when empty"""
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.pop(entity_id, None)
+        if not bucket:
+            del index[key]
+
+
+def _normalize_ipv6(text: str) -> str | None:
+    """Compressed form of an IPv6 address, or None if the text is not one"""
+    try:
+        return ipaddress.IPv6Address(text).compressed
+    except ValueError:
+        return None
+
+
+def _ip_key(ip_address: str) -> str:
+    """Key of an IP address in the mentioned-IP index (IPv6 addresses are compressed)"""
+    if ":" in ip_address:
+        return _normalize_ipv6(ip_address) or ip_address
+    return ip_address
+
+
+class EngagementIndex:
+    """Maintained lookup indexes over the hosts, services, findings and collected data of an engagement
+
+    Indexes: port -> services, service name -> services, host status -> hosts,
+    severity / host ID / CVE / mentioned IP -> findings, and sensitive collected data.
+    Obtain it with EngagementState.query(); it is rebuilt when a collection was
+    replaced or resized, or reported edited with EngagementState.mark_changed(),
+    since it was last synchronized. Checking this is O(1). The state manager
+    keeps it current incrementally.
+    """
+
+    def __init__(self) -> None:
+        self.owner: EngagementState | None = None
+        self._signature: tuple[object, ...] | None = None
+        self._clear()
+
+    def _clear(self) -> None:
+        """Drop all index contents"""
+        self._hosts: dict[str, Host] = {}
+        self._hosts_by_status: dict[str, dict[str, Host]] = {}
+        # service ID -> (port, service name key, host ID) as indexed, for removal
+        self._service_keys: dict[str, tuple[int, str, str]] = {}
+        self._services_by_port: dict[int, dict[str, Service]] = {}
+        self._services_by_name: dict[str, dict[str, Service]] = {}
+        self._services_by_host: dict[str, dict[str, Service]] = {}
+
+        self._findings: dict[str, Finding] = {}
+        self._findings_by_severity: dict[str, dict[str, Finding]] = {}
+        self._findings_by_host: dict[str, dict[str, Finding]] = {}
+        self._findings_by_cve: dict[str, dict[str, Finding]] = {}
+        self._findings_by_ip: dict[str, dict[str, Finding]] = {}
+
+        self._sensitive_data: dict[str, CollectedData] = {}
+
+    def __eq__(self, other: object) -> bool:
+        # Derived data: never affects model equality
+        return isinstance(other, EngagementIndex)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    # Synchronization
+
+    def is_current(self, state: "EngagementState") -> bool:
+        """Check whether the index reflects the given state's collections"""
+        return self.owner is state and self._signature == self._signature_of(state)
+
+    def invalidate(self) -> None:
+        """Force a full rebuild on the next query"""
+        self._signature = None
+
+    def rebuild(self, state: "EngagementState") -> None:
+        """Rebuild all indexes from the state"""
+        self._clear()
+        self.owner = state
+        for host in state.hosts.values():
+            self.update_host(host)
+        for finding in state.findings.values():
+            self.update_finding(finding)
+        for data in state.collected_data.values():
+            self.update_collected_data(data)
+        self.mark_current(state)
+
+    def mark_current(self, state: "EngagementState") -> None:
+        """Record that the index reflects the state's collections (after incremental updates)"""
+        self._signature = self._signature_of(state)
+
+    @staticmethod
+    def _signature_of(state: "EngagementState") -> tuple[object, ...]:
+        # Sizes catch entities added or removed directly; revisions catch edits
+        # reported with mark_changed()
+        revisions = state._revisions
+        return (
+            id(state.hosts),
+            len(state.hosts),
+            revisions.hosts,
+            id(state.findings),
+            len(state.findings),
+            revisions.findings,
+            id(state.collected_data),
+            len(state.collected_data),
+            revisions.collected_data,
+        )
+
+    # Incremental maintenance
+
+    def update_host(self, host: Host) -> None:
+        """Index a new host or re-index a changed one (services included)"""
+        previous = self._hosts.get(host.id)
+        if previous is not None and previous.status != host.status:
+            _discard(self._hosts_by_status, previous.status, host.id)
+        self._hosts[host.id] = host
+        _add(self._hosts_by_status, host.status, host.id, host)
+
+        indexed = self._services_by_host.get(host.id, {})
+        current_ids = {service.id for service in host.services}
+        for service_id in [service_id for service_id in indexed if service_id not in current_ids]:
+            self._unindex_service(service_id)
+        for service in host.services:
+            self._index_service(host.id, service)
+
+    def remove_host(self, host_id: str) -> None:
+        """Remove a host and its services from the indexes"""
+        host = self._hosts.pop(host_id, None)
+        if host is None:
+            return
+        _discard(self._hosts_by_status, host.status, host_id)
+        for service_id in list(self._services_by_host.get(host_id, {})):
+            self._unindex_service(service_id)
+
+    def update_finding(self, finding: Finding) -> None:
+        """Index a new finding or re-index a changed one"""
+        if finding.id in self._findings:
+            self.remove_finding(finding.id)
+        self._findings[finding.id] = finding
+        _add(self._findings_by_severity, finding.severity, finding.id, finding)
+        if finding.host_id:
+            _add(self._findings_by_host, finding.host_id, finding.id, finding)
+        for cve_id in finding.cve_ids:
+            _add(self._findings_by_cve, cve_id.upper(), finding.id, finding)
+        for ip_address in self._mentioned_ips(finding):
+            _add(self._findings_by_ip, ip_address, finding.id, finding)
+
+    def remove_finding(self, finding_id: str) -> None:
+        """Remove a finding from the indexes"""
+        finding = self._findings.pop(finding_id, None)
+        if finding is None:
+            return
+        _discard(self._findings_by_severity, finding.severity, finding_id)
+        if finding.host_id:
+            _discard(self._findings_by_host, finding.host_id, finding_id)
+        for cve_id in finding.cve_ids:
+            _discard(self._findings_by_cve, cve_id.upper(), finding_id)
+        for ip_address in self._mentioned_ips(finding):
+            _discard(self._findings_by_ip, ip_address, finding_id)
+
+    def update_collected_data(self, data: CollectedData) -> None:
+        """Index new or changed collected data"""
+        if data.is_sensitive:
+            self._sensitive_data[data.id] = data
+        else:
+            self._sensitive_data.pop(data.id, None)
+
+    def remove_collected_data(self, data_id: str) -> None:
+        """Remove collected data from the indexes"""
+        self._sensitive_data.pop(data_id, None)
+
+    def _index_service(self, host_id: str, service: Service) -> None:
+        key = (service.port, (service.service_name or "").lower(), host_id)
+        previous_key = self._service_keys.get(service.id)
+        if previous_key is not None and previous_key != key:
+            self._unindex_service(service.id)
+        self._service_keys[service.id] = key
+        # Assigning an existing key keeps its position, so ordering stays stable on re-index
+        _add(self._services_by_port, service.port, service.id, service)
+        if key[1]:
+            _add(self._services_by_name, key[1], service.id, service)
+        _add(self._services_by_host, host_id, service.id, service)
+
+    def _unindex_service(self, service_id: str) -> None:
+        key = self._service_keys.pop(service_id, None)
+        if key is None:
+            return
+        port, name, host_id = key
+        _discard(self._services_by_port, port, service_id)
+        if name:
+            _discard(self._services_by_name, name, service_id)
+        _discard(self._services_by_host, host_id, service_id)
+
+    @staticmethod
+    def _mentioned_ips(finding: Finding) -> set[str]:
+        ips: set[str] = set()
+        for text in (finding.title, finding.description):
+            ips.update(_IPV4_PATTERN.findall(text))
+            if ":" in text:
+                for candidate in _IPV6_PATTERN.findall(text):
+                    normalized = _normalize_ipv6(candidate)
+                    if normalized is not None:
+                        ips.add(normalized)
+        return ips
+
+    # Queries
+
+    def hosts(
+        self,
+        status: str | None = None,
+        port: int | None = None,
+        service_name: str | None = None,
+    ) -> list[Host]:
+        """Get hosts by status and/or exposed port / service name (all filters combined)"""
+        if port is not None or service_name is not None:
+            services = self.services(port=port, service_name=service_name, state="open")
+            host_ids = dict.fromkeys(self._service_keys[service.id][2] for service in services)
+            candidates: Iterable[Host] = (self._hosts[host_id] for host_id in host_ids)
+        elif status is not None:
+            return list(self._hosts_by_status.get(status, {}).values())
+        else:
+            candidates = self._hosts.values()
+        return [host for host in candidates if status is None or host.status == status]
+
+    def active_hosts(self) -> list[Host]:
+        """Get hosts that are up"""
+        return self.hosts(status="up")
+
+    def services(
+        self,
+        port: int | None = None,
+        service_name: str | None = None,
+        state: str | None = None,
+        protocol: str | None = None,
+        host_id: str | None = None,
+    ) -> list[Service]:
+        """Get services matching all given filters
+
+        The narrowest of the port, service name and host indexes is used as the
+        candidate set; the remaining filters are applied to it.
+        """
+        buckets: list[dict[str, Service]] = []
+        if port is not None:
+            buckets.append(self._services_by_port.get(port, {}))
+        if service_name is not None:
+            buckets.append(self._services_by_name.get(service_name.lower(), {}))
+        if host_id is not None:
+            buckets.append(self._services_by_host.get(host_id, {}))
+
+        candidates: Iterable[Service]
+        if buckets:
+            candidates = min(buckets, key=len).values()
+        else:
+            # Unfiltered listing: walk hosts to keep per-host service order
+            candidates = (service for host in self._hosts.values() for service in host.services)
+
+        results = []
+        for service in candidates:
+            if port is not None and service.port != port:
+                continue
+            if service_name is not None and (service.service_name or "").lower() != service_name.lower():
+                continue
+            if state is not None and service.state != state:
+                continue
+            if protocol is not None and service.protocol != protocol:
+                continue
+            if host_id is not None and self._service_keys[service.id][2] != host_id:
+                continue
+            results.append(service)
+        return results
+
+    def open_services(self) -> list[Service]:
+        """Get open services"""
+        return self.services(state="open")
+
+    def findings(
+        self,
+        severity: str | Collection[str] | None = None,
+        host_id: str | None = None,
+        cve: str | None = None,
+        category: str | None = None,
+        ip_address: str | None = None,
+    ) -> list[Finding]:
+        """Get findings matching all given filters
+
+        Args:
+            severity: Severity level, or a collection of accepted levels
+            host_id: Related host ID
+            cve: CVE ID (case-insensitive)
+            category: Finding category
+            ip_address: IP address mentioned in the finding title or description
+        """
+        severities = {severity} if isinstance(severity, str) else set(severity) if severity is not None else None
+
+        buckets: list[dict[str, Finding]] = []
+        if severities is not None:
+            merged: dict[str, Finding] = {}
+            for level in severities:
+                merged.update(self._findings_by_severity.get(level, {}))
+            buckets.append(merged)
+        if host_id is not None:
+            buckets.append(self._findings_by_host.get(host_id, {}))
+        if cve is not None:
+            buckets.append(self._findings_by_cve.get(cve.upper(), {}))
+        if ip_address is not None:
+            buckets.append(self._findings_by_ip.get(_ip_key(ip_address), {}))
+
+        if not buckets:
+            candidates: Iterable[Finding] = self._findings.values()
+        else:
+            smallest = min(buckets, key=len)
+            others = [bucket for bucket in buckets if bucket is not smallest]
+            candidates = (f for f in smallest.values() if all(f.id in bucket for bucket in others))
+
+        return [finding for finding in candidates if category is None or finding.category == category]
+
+    def findings_for_host(self, host: Host) -> list[Finding]:
+        """Get findings linked to a host by ID or mentioning its IP address"""
+        related = dict(self._findings_by_host.get(host.id, {}))
+        related.update(self._findings_by_ip.get(_ip_key(host.ip_address), {}))
+        return list(related.values())
+
+    def severity_counts(self) -> dict[str, int]:
+        """Count findings per severity, most severe first"""
+        return {
+            severity: len(self._findings_by_severity[severity])
+            for severity in sorted(
+                self._findings_by_severity, key=lambda s: _SEVERITY_ORDER.get(s, len(_SEVERITY_ORDER))
+            )
+        }
+
+    def sensitive_collected_data(self) -> list[CollectedData]:
+        """Get sensitive collected data"""
+        return list(self._sensitive_data.values())
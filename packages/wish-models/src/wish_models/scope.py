@@ -0,0 +1,184 @@
+"""
+Scope membership index over engagement targets.
+"""
+
+import ipaddress
+from bisect import bisect_right
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from .engagement import Target
+    from .host import Host
+
+_IPAddress = ipaddress.IPv4Address | ipaddress.IPv6Address
+_IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+class _AddressRanges:
+    """Disjoint sorted integer intervals of one IP version, searched by bisection"""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, networks: Iterable[_IPNetwork]) -> None:
+        merged: list[list[int]] = []
+        for start, end in sorted((int(net.network_address), int(net.broadcast_address)) for net in networks):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def contains(self, start: int, end: int) -> bool:
+        """Check whether [start, end] lies inside a single interval"""
+        position = bisect_right(self.starts, start) - 1
+        return position >= 0 and end <= self.ends[position]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check whether [start, end] intersects any interval"""
+        position = bisect_right(self.starts, end) - 1
+        return position >= 0 and self.ends[position] >= start
+
+
+class _DomainTrie:
+    """Reversed-label trie: "example.com" covers subdomains, URL hosts match exactly"""
+
+    _SUBTREE = "*"
+    _EXACT = "="
+
+    def __init__(self) -> None:
+        self.root: dict[str, Any] = {}
+        self.size = 0
+
+    def add(self, domain: str, include_subdomains: bool) -> None:
+        node = self.root
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        node[self._SUBTREE if include_subdomains else self._EXACT] = {}
+        self.size += 1
+
+    def contains(self, domain: str) -> bool:
+        node = self.root
+        labels = domain.split(".")
+        for depth, label in enumerate(reversed(labels), start=1):
+            child = node.get(label)
+            if child is None:
+                return False
+            node = child
+            if self._SUBTREE in node or (depth == len(labels) and self._EXACT in node):
+                return True
+        return False
+
+
+def _normalize_domain(domain: str) -> str:
+    return domain.strip().rstrip(".").lower()
+
+
+def _parse_address(value: str) -> _IPNetwork | str | None:
+    """Parse an IP, CIDR, URL or domain into a network or a normalized host name"""
+    value = value.strip()
+    if "://" in value:
+        host = urlsplit(value).hostname
+        if not host:
+            return None
+        value = host
+    try:
+        address: _IPAddress = ipaddress.ip_address(value.strip("[]"))
+        return ipaddress.ip_network(address)
+    except ValueError:
+        pass
+    if "/" in value:
+        try:
+            return ipaddress.ip_network(value, strict=False)
+        except ValueError:
+            return None
+    # host:port (IPv6 addresses were handled above)
+    host, _, port = value.rpartition(":")
+    if host and port.isdigit():
+        return _parse_address(host)
+    return _normalize_domain(value) or None
+
+
+class _ScopeSet:
+    """IP ranges plus domain trie for one side (included or excluded) of the scope"""
+
+    def __init__(self) -> None:
+        self.networks: dict[int, list[_IPNetwork]] = {4: [], 6: []}
+        self.domains = _DomainTrie()
+        self.ranges: dict[int, _AddressRanges] = {}
+
+    def add(self, target: "Target") -> None:
+        parsed = _parse_address(target.scope)
+        if isinstance(parsed, str):
+            # Domains cover their subdomains; a URL covers only its exact host
+            self.domains.add(parsed, include_subdomains=target.scope_type != "url")
+        elif parsed is not None:
+            self.networks[parsed.version].append(parsed)
+
+    def freeze(self) -> None:
+        self.ranges = {version: _AddressRanges(networks) for version, networks in self.networks.items()}
+
+    def __bool__(self) -> bool:
+        return self.domains.size > 0 or any(self.ranges.values())
+
+
+class ScopeIndex:
+    """Answers whether an address, network, URL or host name is in scope
+
+    IPv4/IPv6 targets (ip, cidr and URL hosts) are merged into sorted disjoint
+    ranges searched by bisection in O(log n); domains live in a reversed-label
+    trie where a domain target also covers its subdomains. Targets marked
+    out of scope are indexed the same way and take precedence.
+    """
+
+    def __init__(self, targets: Iterable["Target"] = ()) -> None:
+        self._included = _ScopeSet()
+        self._excluded = _ScopeSet()
+        for target in targets:
+            (self._included if target.in_scope else self._excluded).add(target)
+        self._included.freeze()
+        self._excluded.freeze()
+
+    @property
+    def is_empty(self) -> bool:
+        """Check whether no in-scope targets are defined"""
+        return not self._included
+
+    def is_in_scope(self, value: str) -> bool:
+        """Check an IP address, CIDR (entirely in scope), URL, host[:port] or domain name"""
+        included, excluded = self._match(value)
+        return included and not excluded
+
+    def is_host_in_scope(self, host: "Host") -> bool:
+        """Check a host by IP address or host names (an excluded IP address always wins)"""
+        included, excluded = self._match(host.ip_address)
+        if excluded:
+            return False
+        return included or any(self.is_in_scope(name) for name in host.hostnames)
+
+    def filter_hosts(self, hosts: Iterable["Host"]) -> tuple[list["Host"], list["Host"]]:
+        """Split hosts into (in scope, out of scope), keeping their order"""
+        in_scope: list[Host] = []
+        out_of_scope: list[Host] = []
+        for host in hosts:
+            (in_scope if self.is_host_in_scope(host) else out_of_scope).append(host)
+        return in_scope, out_of_scope
+
+    def _match(self, value: str) -> tuple[bool, bool]:
+        """Check a value against the included and excluded sides"""
+        parsed = _parse_address(value)
+        if parsed is None:
+            return False, False
+        if isinstance(parsed, str):
+            return self._included.domains.contains(parsed), self._excluded.domains.contains(parsed)
+
+        start, end = int(parsed.network_address), int(parsed.broadcast_address)
+        return (
+            self._included.ranges[parsed.version].contains(start, end),
+            self._excluded.ranges[parsed.version].overlaps(start, end),
+        )
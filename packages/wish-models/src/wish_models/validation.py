@@ -4,8 +4,13 @@ Validation utilities and error handling for wish-models.
 
 import ipaddress
 import re
+import time
+from collections.abc import Collection
 from datetime import UTC, datetime
-from typing import Generic, TypeVar
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from .engagement import EngagementState
 
 T = TypeVar("T")
 
@@ -170,12 +175,85 @@ def validate_scope_type_and_value(scope_type: str, scope_value: str) -> Validati
     return ValidationResult.success((scope_type, scope_value))
 
 
+class IntegrityReport(ValidationResult["EngagementState"]):
+    """Result of a whole-engagement integrity pass, with its size and timing"""
+
+    def __init__(self, data: "EngagementState", errors: list[str], checked_references: int, elapsed: float) -> None:
+        super().__init__(data=data, errors=errors)
+        self.checked_references = checked_references
+        self.elapsed = elapsed
+
+    def summary(self) -> str:
+        """One-line description of the pass"""
+        status = "ok" if self.is_valid else f"{len(self.errors)} error(s)"
+        return f"integrity {status}: {self.checked_references} references in {self.elapsed * 1000:.1f} ms"
+
+
 class ModelValidator:
     """Class for validating relationships between models"""
 
+    @staticmethod
+    def validate_engagement(state: "EngagementState") -> IntegrityReport:
+        """Check every host/service/finding/collected data cross-reference in one linear sweep
+
+        ID sets are built once, so each reference costs one set lookup instead of
+        a scan of the referenced collection.
+        """
+        start = time.perf_counter()
+        errors: list[str] = []
+        checked = 0
+
+        for collection in ("targets", "hosts", "findings", "collected_data"):
+            for key, entity in getattr(state, collection).items():
+                checked += 1
+                if entity.id != key:
+                    errors.append(f"{collection} entry {key} holds entity with id {entity.id}")
+
+        host_ids = state.hosts.keys()
+        service_ids: set[str] = set()
+        for host_id, host in state.hosts.items():
+            for service in host.services:
+                checked += 2
+                if service.host_id != host_id:
+                    errors.append(f"Service {service.id} on host {host_id} references host_id: {service.host_id}")
+                if service.id in service_ids:
+                    errors.append(f"Duplicate service id: {service.id}")
+                service_ids.add(service.id)
+
+        finding_ids = state.findings.keys()
+        data_ids = state.collected_data.keys()
+
+        for finding in state.findings.values():
+            checked += 2 + len(finding.related_collected_data_ids)
+            if finding.host_id is not None and finding.host_id not in host_ids:
+                errors.append(f"Finding {finding.id} references non-existent host_id: {finding.host_id}")
+            if finding.service_id is not None and finding.service_id not in service_ids:
+                errors.append(f"Finding {finding.id} references non-existent service_id: {finding.service_id}")
+            for data_id in finding.related_collected_data_ids:
+                if data_id not in data_ids:
+                    errors.append(f"Finding {finding.id} references non-existent collected data: {data_id}")
+
+        for data in state.collected_data.values():
+            checked += 3 + len(data.derived_finding_ids)
+            if data.source_host_id is not None and data.source_host_id not in host_ids:
+                errors.append(f"CollectedData {data.id} references non-existent source_host_id: {data.source_host_id}")
+            if data.source_service_id is not None and data.source_service_id not in service_ids:
+                errors.append(
+                    f"CollectedData {data.id} references non-existent source_service_id: {data.source_service_id}"
+                )
+            if data.source_finding_id is not None and data.source_finding_id not in finding_ids:
+                errors.append(
+                    f"CollectedData {data.id} references non-existent source_finding_id: {data.source_finding_id}"
+                )
+            for finding_id in data.derived_finding_ids:
+                if finding_id not in finding_ids:
+                    errors.append(f"CollectedData {data.id} references non-existent derived finding: {finding_id}")
+
+        return IntegrityReport(state, errors, checked, time.perf_counter() - start)
+
     @staticmethod
     def validate_service_host_relationship(
-        service_host_id: str, available_host_ids: list[str]
+        service_host_id: str, available_host_ids: Collection[str]
     ) -> ValidationResult[str]:
         """Validate that service host_id references a valid host ID"""
         if service_host_id not in available_host_ids:
@@ -192,8 +270,8 @@ class ModelValidator:
     def validate_finding_references(
         finding_host_id: str | None,
         finding_service_id: str | None,
-        available_host_ids: list[str],
-        available_service_ids: list[str],
+        available_host_ids: Collection[str],
+        available_service_ids: Collection[str],
     ) -> ValidationResult[tuple[str | None, str | None]]:
         """Validate finding references"""
         errors = []
@@ -214,9 +292,9 @@ class ModelValidator:
         data_source_host_id: str | None,
         data_source_service_id: str | None,
         data_source_finding_id: str | None,
-        available_host_ids: list[str],
-        available_service_ids: list[str],
-        available_finding_ids: list[str],
+        available_host_ids: Collection[str],
+        available_service_ids: Collection[str],
+        available_finding_ids: Collection[str],
     ) -> ValidationResult[tuple[str | None, str | None, str | None]]:
         """Validate collected data references"""
         errors = []
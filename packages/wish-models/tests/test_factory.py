@@ -0,0 +1,223 @@
+"""Tests for trusted model construction."""
+
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from wish_models.factory import TrustedModelFactory
+from wish_models.finding import Finding
+from wish_models.host import Host, Service
+from wish_models.validation import ValidationError
+
+SCAN_TIME = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+class TestTrustedModelFactory:
+    """Test TrustedModelFactory output and invariants."""
+
+    @pytest.fixture
+    def factory(self):
+        """Factory for nmap results."""
+        return TrustedModelFactory("nmap", SCAN_TIME)
+
+    def test_matches_validated_models(self, factory):
+        """Test that trusted models equal the validated equivalents."""
+        host = factory.host("192.168.1.10", hostnames=["web"], status="up", mac_address="00:11:22:33:44:55")
+        service = factory.service(host.id, 443, "tcp", "open", service_name="https", confidence=1.0)
+        host.add_service(service)
+
+        validated = Host(
+            id=host.id,
+            ip_address="192.168.1.10",
+            hostnames=["web"],
+            status="up",
+            mac_address="00:11:22:33:44:55",
+            discovered_by="nmap",
+            discovered_at=SCAN_TIME,
+            last_seen=SCAN_TIME,
+        )
+        validated.add_service(
+            Service(
+                id=service.id,
+                host_id=host.id,
+                port=443,
+                protocol="tcp",
+                state="open",
+                service_name="https",
+                confidence=1.0,
+                discovered_by="nmap",
+                discovered_at=SCAN_TIME,
+            )
+        )
+
+        assert host == validated
+        assert Host.model_validate(host.model_dump()) == host
+        assert host.get_service(443) is service
+
+    def test_finding(self, factory):
+        """Test finding construction and defaults."""
+        finding = factory.finding(
+            "Samba RCE", "usermap script", "vulnerability", "service", severity="critical", cve_ids=["CVE-2007-2447"]
+        )
+
+        assert isinstance(finding, Finding)
+        assert finding.status == "new"
+        assert finding.discovered_at == SCAN_TIME
+        assert Finding.model_validate(finding.model_dump()) == finding
+
+    @pytest.mark.parametrize(
+        "build",
+        [
+            lambda f: f.host("not-an-ip"),
+            lambda f: f.host("10.0.0.1", status="sleeping"),
+            lambda f: f.host("10.0.0.1", mac_address="zz:11:22:33:44:55"),
+            lambda f: f.host("10.0.0.1", os_confidence=1.5),
+            lambda f: f.service("h", 0, "tcp", "open"),
+            lambda f: f.service("h", 80, "sctp", "open"),
+            lambda f: f.service("h", 80, "tcp", "open|filtered"),
+            lambda f: f.finding("t", "d", "vulnerability", "host", cve_ids=["CVE-1"]),
+            lambda f: f.finding("t", "d", "bug", "host"),
+        ],
+    )
+    def test_invariants(self, factory, build):
+        """Test that cheap invariants reject invalid values like the model validators."""
+        with pytest.raises(ValidationError):
+            build(factory)
+
+    def test_skips_pydantic_validation(self, factory, monkeypatch):
+        """Test that trusted construction never calls the pydantic validators."""
+
+        class _NoValidation:
+            def __getattr__(self, name):
+                raise AssertionError(f"pydantic validator called: {name}")
+
+        for model in (Host, Service, Finding):
+            monkeypatch.setattr(model, "__pydantic_validator__", _NoValidation())
+
+        host = factory.host("10.0.0.1", hostnames=["web"])
+        service = factory.service(host.id, 80, "tcp", "open", service_name="http")
+        finding = factory.finding("t", "d", "vulnerability", "service")
+        host.add_service(service)
+
+        assert (host.ip_address, host.hostnames, host.discovered_by) == ("10.0.0.1", ["web"], "nmap")
+        assert (service.port, service.service_name, service.discovered_at) == (80, "http", SCAN_TIME)
+        assert (finding.title, finding.status) == ("t", "new")
+
+    def test_discovery_time_validated_once(self):
+        """Test that a future discovery time is rejected when the factory is created."""
+        with pytest.raises(ValidationError):
+            TrustedModelFactory("nmap", datetime.now(UTC) + timedelta(days=1))
+
+
+@pytest.mark.benchmark
+class TestConstructionBenchmark:
+    """Compare per-host construction cost (run with -s to see timings)."""
+
+    HOSTS = 200
+    SERVICES_PER_HOST = 20
+
+    def _build_validated(self) -> None:
+        for index in range(self.HOSTS):
+            host = Host(
+                ip_address=f"10.0.{index // 256}.{index % 256}",
+                status="up",
+                discovered_by="nmap",
+                discovered_at=SCAN_TIME,
+                last_seen=SCAN_TIME,
+            )
+            for port in range(1, self.SERVICES_PER_HOST + 1):
+                host.add_service(
+                    Service(
+                        host_id=host.id,
+                        port=port,
+                        protocol="tcp",
+                        state="open",
+                        service_name="http",
+                        product="nginx",
+                        confidence=1.0,
+                        discovered_by="nmap",
+                        discovered_at=SCAN_TIME,
+                    )
+                )
+
+    def _build_trusted(self) -> None:
+        factory = TrustedModelFactory("nmap", SCAN_TIME)
+        for index in range(self.HOSTS):
+            host = factory.host(f"10.0.{index // 256}.{index % 256}", status="up")
+            for port in range(1, self.SERVICES_PER_HOST + 1):
+                host.add_service(
+                    factory.service(host.id, port, "tcp", "open", service_name="http", product="nginx", confidence=1.0)
+                )
+
+    def test_construction_cost(self):
+        """Time validated vs trusted construction of hosts with services."""
+        timings = {}
+        for name, build in (("validated", self._build_validated), ("trusted", self._build_trusted)):
+            start = time.perf_counter()
+            build()
+            timings[name] = (time.perf_counter() - start) / self.HOSTS
+
+        print(
+            f"\nper host with {self.SERVICES_PER_HOST} services: "
+            f"validated={timings['validated'] * 1e6:.1f} us trusted={timings['trusted'] * 1e6:.1f} us"
+        )
+
+
+@pytest.mark.benchmark
+class TestServiceMemoryBenchmark:
+    """Measure the memory held per service (run with -s to see sizes)."""
+
+    SERVICES = 5000
+
+    @staticmethod
+    def _parsed(text: str) -> str:
+        # Parsers produce a fresh string object for every attribute they read
+        return "".join(list(text))
+
+    def _measure(self, build: Callable[[int], Service]) -> float:
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            services = [build(port) for port in range(1, self.SERVICES + 1)]
+            used = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert len(services) == self.SERVICES
+        return used / self.SERVICES
+
+    def test_bytes_per_service(self):
+        """Interned names make trusted services smaller than validated ones."""
+        factory = TrustedModelFactory("nmap", SCAN_TIME)
+        host_id = "host-1"
+
+        def validated(port: int) -> Service:
+            return Service(
+                host_id=host_id,
+                port=port,
+                protocol="tcp",
+                state="open",
+                service_name=self._parsed("microsoft-ds"),
+                product=self._parsed("Samba smbd"),
+                version=self._parsed("4.6.2"),
+                discovered_by="nmap",
+                discovered_at=SCAN_TIME,
+            )
+
+        def trusted(port: int) -> Service:
+            return factory.service(
+                host_id,
+                port,
+                "tcp",
+                "open",
+                service_name=self._parsed("microsoft-ds"),
+                product=self._parsed("Samba smbd"),
+                version=self._parsed("4.6.2"),
+            )
+
+        sizes = {"validated": self._measure(validated), "trusted": self._measure(trusted)}
+
+        print(f"\nbytes per service: validated={sizes['validated']:.0f} trusted={sizes['trusted']:.0f}")
+        assert sizes["trusted"] < sizes["validated"]
@@ -132,6 +132,39 @@ class TestHost:
                 discovered_by="nmap",
             )
 
+    def test_host_service_index(self):
+        """Test port/protocol lookups and merges through the service index."""
+        host = Host(ip_address="192.168.1.100", discovered_by="nmap")
+        host.add_service(Service(host_id=host.id, port=22, protocol="tcp", state="open", discovered_by="nmap"))
+        host.add_service(
+            Service(host_id=host.id, port=22, protocol="tcp", state="open", product="OpenSSH", discovered_by="nmap")
+        )
+        assert len(host.services) == 1
+        assert host.get_service(22).product == "OpenSSH"
+        assert host.get_service(22, "udp") is None
+
+        udp = Service(host_id=host.id, port=22, protocol="udp", state="open", discovered_by="nmap")
+        assert host.add_service_if_missing(udp)
+        assert not host.add_service_if_missing(udp.model_copy())
+        assert host.get_service(22, "udp") is udp
+
+    def test_host_service_index_not_serialized_and_rebuilt(self):
+        """Test that the index is excluded from serialization and follows direct edits."""
+        host = Host(ip_address="192.168.1.100", discovered_by="nmap")
+        host.add_service(Service(host_id=host.id, port=80, protocol="tcp", state="open", discovered_by="nmap"))
+
+        data = host.model_dump()
+        assert "_service_index" not in data
+        loaded = Host.model_validate_json(host.model_dump_json())
+        assert loaded == host
+        assert loaded.get_service(80).port == 80
+
+        # Direct list edits and reassignment are picked up
+        host.services.append(Service(host_id=host.id, port=443, protocol="tcp", state="open", discovered_by="nmap"))
+        assert host.get_service(443) is host.services[1]
+        host.services = []
+        assert host.get_service(80) is None
+
 
 class TestService:
     """Test Service model."""
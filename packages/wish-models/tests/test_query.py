@@ -0,0 +1,180 @@
+"""Tests for indexed engagement queries."""
+
+import pytest
+
+from wish_models.data import CollectedData
+from wish_models.engagement import EngagementState
+from wish_models.finding import Finding
+from wish_models.host import Host, Service
+from wish_models.session import SessionMetadata
+
+
+def _service(host: Host, port: int, name: str | None, state: str = "open", protocol: str = "tcp") -> Service:
+    return Service(host_id=host.id, port=port, protocol=protocol, state=state, service_name=name, discovered_by="nmap")
+
+
+def _finding(title: str, severity: str = "info", **kwargs) -> Finding:
+    return Finding(
+        title=title,
+        description=kwargs.pop("description", "Test"),
+        category=kwargs.pop("category", "vulnerability"),
+        severity=severity,
+        target_type="host",
+        discovered_by="test",
+        **kwargs,
+    )
+
+
+class TestEngagementIndex:
+    """Test EngagementState.query() indexes and filters."""
+
+    @pytest.fixture
+    def state(self):
+        """Engagement with a web host, a file server and a down host."""
+        state = EngagementState(name="Query Test", session_metadata=SessionMetadata(engagement_name="Query Test"))
+
+        web = Host(ip_address="10.0.0.1", status="up", discovered_by="nmap")
+        web.services = [_service(web, 80, "http"), _service(web, 22, "ssh"), _service(web, 8080, "http", "closed")]
+        smb = Host(ip_address="10.0.0.2", status="up", discovered_by="nmap")
+        smb.services = [
+            _service(smb, 445, "microsoft-ds"),
+            _service(smb, 22, "ssh"),
+            _service(smb, 53, "dns", "open", "udp"),
+        ]
+        down = Host(ip_address="10.0.0.10", status="down", discovered_by="nmap")
+        for host in (web, smb, down):
+            state.hosts[host.id] = host
+
+        for finding in (
+            _finding("SMB signing disabled", "medium", host_id=smb.id),
+            _finding("Samba RCE", "critical", host_id=smb.id, cve_ids=["CVE-2007-2447"]),
+            _finding("Outdated nginx on 10.0.0.1", "high"),
+            _finding("Banner disclosure", "low", category="information_disclosure"),
+        ):
+            state.findings[finding.id] = finding
+
+        secret = CollectedData(type="credentials", content="admin:admin", is_sensitive=True, discovered_by="manual")
+        public = CollectedData(type="file", content="readme", is_sensitive=False, discovered_by="manual")
+        state.collected_data[secret.id] = secret
+        state.collected_data[public.id] = public
+        return state
+
+    def _host(self, state: EngagementState, ip_address: str) -> Host:
+        return next(host for host in state.hosts.values() if host.ip_address == ip_address)
+
+    def test_host_and_service_indexes(self, state):
+        """Test host status and service port/name lookups."""
+        query = state.query()
+
+        assert {host.ip_address for host in query.active_hosts()} == {"10.0.0.1", "10.0.0.2"}
+        assert [service.port for service in query.services(port=22)] == [22, 22]
+        assert [service.port for service in query.services(service_name="HTTP")] == [80, 8080]
+        assert len(query.open_services()) == 5
+        assert state.get_open_services() == query.open_services()
+
+    def test_compound_filters(self, state):
+        """Test combining service and finding filters."""
+        query = state.query()
+        web = self._host(state, "10.0.0.1")
+        smb = self._host(state, "10.0.0.2")
+
+        assert [s.port for s in query.services(service_name="http", state="open")] == [80]
+        assert [s.port for s in query.services(port=22, host_id=smb.id)] == [22]
+        assert [s.port for s in query.services(host_id=smb.id, protocol="udp")] == [53]
+        assert [host.id for host in query.hosts(port=22)] == [web.id, smb.id]
+        assert [host.id for host in query.hosts(service_name="microsoft-ds", status="up")] == [smb.id]
+        assert query.hosts(port=8080) == []  # closed ports do not expose hosts
+
+        assert [f.title for f in query.findings(severity=("high", "critical"), host_id=smb.id)] == ["Samba RCE"]
+        assert [f.title for f in query.findings(cve="cve-2007-2447")] == ["Samba RCE"]
+        assert [f.title for f in query.findings(category="information_disclosure")] == ["Banner disclosure"]
+        assert query.findings(severity="critical", ip_address="10.0.0.1") == []
+
+    def test_findings_for_host(self, state):
+        """Test findings linked by host ID or an exact IP mention."""
+        query = state.query()
+
+        assert [f.title for f in query.findings_for_host(self._host(state, "10.0.0.1"))] == [
+            "Outdated nginx on 10.0.0.1"
+        ]
+        # 10.0.0.1 is a prefix of 10.0.0.10 but not the same address
+        assert query.findings_for_host(self._host(state, "10.0.0.10")) == []
+        assert len(query.findings_for_host(self._host(state, "10.0.0.2"))) == 2
+
+    def test_severity_counts_and_sensitive_data(self, state):
+        """Test severity aggregation order and the sensitive data index."""
+        assert list(state.query().severity_counts().items()) == [
+            ("critical", 1),
+            ("high", 1),
+            ("medium", 1),
+            ("low", 1),
+        ]
+        assert [data.type for data in state.get_sensitive_collected_data()] == ["credentials"]
+
+    def test_rebuilds_after_collection_changes(self, state):
+        """Test that adding or replacing collections outside the index triggers a rebuild."""
+        query = state.query()
+        new_host = Host(ip_address="10.0.0.3", status="up", discovered_by="nmap")
+        new_host.services = [_service(new_host, 3306, "mysql")]
+        state.hosts[new_host.id] = new_host
+
+        assert state.query() is query
+        assert [s.port for s in query.services(service_name="mysql")] == [3306]
+
+        state.findings = {}
+        assert state.query().severity_counts() == {}
+
+    def test_in_place_edits_reported_with_mark_changed(self, state):
+        """Test that entities edited in place are reindexed once reported."""
+        state.query()
+        self._host(state, "10.0.0.1").status = "down"
+        state.mark_changed("hosts")
+        assert [h.ip_address for h in state.query().active_hosts()] == ["10.0.0.2"]
+
+        smb = self._host(state, "10.0.0.2")
+        smb.services.append(_service(smb, 139, "netbios-ssn"))
+        web = self._host(state, "10.0.0.1")
+        web.add_service(_service(web, 445, "microsoft-ds"))
+        state.mark_changed("hosts")
+        assert [s.port for s in state.query().services(port=139)] == [139]
+        assert {h.ip_address for h in state.query().hosts(port=445)} == {"10.0.0.1", "10.0.0.2"}
+
+        finding = state.query().findings(severity="low")[0]
+        finding.severity = "high"
+        finding.add_cve("CVE-2021-44228")
+        state.mark_changed("findings")
+        assert state.query().findings(severity="low") == []
+        assert state.query().findings(cve="cve-2021-44228") == [finding]
+
+    def test_findings_mentioning_ipv6_hosts(self, state):
+        """Test that IPv6 addresses mentioned in findings are matched in any notation."""
+        host = Host(ip_address="2001:db8::10", status="up", discovered_by="nmap")
+        state.hosts[host.id] = host
+        finding = _finding("Open resolver on 2001:DB8:0:0::10", "medium")
+        state.findings[finding.id] = finding
+
+        assert state.query().findings_for_host(host) == [finding]
+        assert state.query().findings(ip_address="2001:db8:0::10") == [finding]
+        assert state.query().findings(ip_address="10.0.0.1")[0].title == "Outdated nginx on 10.0.0.1"
+
+    def test_index_excluded_from_equality_and_serialization(self, state):
+        """Test that the index is not part of the model's data."""
+        copy = state.model_copy(deep=True)
+        state.query()
+
+        assert state == copy
+        assert "query_index" not in state.model_dump_json()
+        assert EngagementState.model_validate(state.model_dump()).query().severity_counts() == (
+            state.query().severity_counts()
+        )
+
+    def test_copies_get_their_own_index(self, state):
+        """Test that shallow and deep copies never reuse the original's index."""
+        query = state.query()
+        shallow = state.model_copy(update={"hosts": dict(state.hosts)})
+        deep = state.model_copy(deep=True)
+
+        assert shallow.query() is not query
+        assert deep.query() is not query
+        assert len(deep.query().open_services()) == 5
+        assert state.query() is query
@@ -0,0 +1,97 @@
+"""Tests for the scope membership index."""
+
+import pytest
+
+from wish_models.engagement import EngagementState, Target
+from wish_models.host import Host
+from wish_models.scope import ScopeIndex
+from wish_models.session import SessionMetadata
+
+
+class TestScopeIndex:
+    """Test ScopeIndex membership checks."""
+
+    @pytest.fixture
+    def scope(self):
+        """Scope with networks, a single IP, a domain, a URL and exclusions."""
+        return ScopeIndex(
+            [
+                Target(scope="10.0.0.0/24", scope_type="cidr"),
+                Target(scope="10.0.1.0/24", scope_type="cidr"),
+                Target(scope="192.168.1.50", scope_type="ip"),
+                Target(scope="2001:db8::/64", scope_type="cidr"),
+                Target(scope="Example.com", scope_type="domain"),
+                Target(scope="https://app.partner.org/login", scope_type="url"),
+                Target(scope="10.0.0.128/25", scope_type="cidr", in_scope=False),
+                Target(scope="vpn.example.com", scope_type="domain", in_scope=False),
+            ]
+        )
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("10.0.0.5", True),
+            ("10.0.1.255", True),  # adjacent ranges are merged
+            ("10.0.0.200", False),  # excluded half of the /24
+            ("10.0.2.1", False),
+            ("192.168.1.50", True),
+            ("192.168.1.51", False),
+            ("2001:db8::1", True),
+            ("2001:db9::1", False),
+            ("10.0.0.0/26", True),  # whole network inside the scope
+            ("10.0.0.0/24", False),  # overlaps the excluded range
+            ("10.0.0.0/23", False),
+            ("example.com", True),
+            ("www.EXAMPLE.com.", True),
+            ("notexample.com", False),
+            ("vpn.example.com", False),
+            ("a.vpn.example.com", False),
+            ("app.partner.org", True),  # URL target covers its exact host
+            ("x.app.partner.org", False),
+            ("partner.org", False),
+            ("http://www.example.com:8080/admin", True),
+            ("www.example.com:443", True),
+            ("[2001:db8::5]", True),
+            ("", False),
+        ],
+    )
+    def test_is_in_scope(self, scope, value, expected):
+        """Test addresses, networks, URLs and domains against the scope."""
+        assert scope.is_in_scope(value) is expected
+
+    def test_filter_hosts(self, scope):
+        """Test bulk filtering of parsed hosts by IP address and host names."""
+        hosts = [
+            Host(ip_address="10.0.0.5", discovered_by="nmap"),
+            Host(ip_address="172.16.0.1", hostnames=["mail.example.com"], discovered_by="nmap"),
+            Host(ip_address="172.16.0.2", discovered_by="nmap"),
+            Host(ip_address="10.0.0.129", hostnames=["www.example.com"], discovered_by="nmap"),
+        ]
+
+        in_scope, out_of_scope = scope.filter_hosts(hosts)
+
+        assert [host.ip_address for host in in_scope] == ["10.0.0.5", "172.16.0.1"]
+        # An excluded IP address wins over an in-scope host name
+        assert [host.ip_address for host in out_of_scope] == ["172.16.0.2", "10.0.0.129"]
+
+    def test_empty_scope(self):
+        """Test that nothing is in scope when no targets are defined."""
+        scope = ScopeIndex()
+
+        assert scope.is_empty
+        assert not scope.is_in_scope("10.0.0.1")
+
+    def test_engagement_scope_index_cached_until_targets_change(self):
+        """Test that EngagementState rebuilds its scope index only when targets change."""
+        state = EngagementState(name="Scope", session_metadata=SessionMetadata(engagement_name="Scope"))
+        target = Target(scope="10.0.0.0/24", scope_type="cidr")
+        state.add_target(target)
+
+        index = state.scope_index()
+        assert state.scope_index() is index
+        assert state.is_in_scope("10.0.0.7")
+
+        target.in_scope = False
+        assert state.scope_index() is not index
+        assert not state.is_in_scope("10.0.0.7")
+        assert state == state.model_copy(deep=True)
@@ -2,6 +2,11 @@
 
 from datetime import UTC, datetime, timedelta
 
+from wish_models.data import CollectedData
+from wish_models.engagement import EngagementState
+from wish_models.finding import Finding
+from wish_models.host import Host, Service
+from wish_models.session import SessionMetadata
 from wish_models.validation import (
     ModelValidator,
     validate_cidr,
@@ -351,3 +356,60 @@ class TestModelValidator:
         )
         assert not result.is_valid
         assert len(result.errors) == 3  # All three references are invalid
+
+    def _engagement(self):
+        """Build a consistent engagement with one host, service, finding and collected data."""
+        state = EngagementState(name="Integrity", session_metadata=SessionMetadata(engagement_name="Integrity"))
+        host = Host(ip_address="10.0.0.1", discovered_by="nmap")
+        service = Service(host_id=host.id, port=22, protocol="tcp", state="open", discovered_by="nmap")
+        host.services.append(service)
+        state.hosts[host.id] = host
+        finding = Finding(
+            title="Weak SSH",
+            description="Password authentication enabled",
+            category="weak_authentication",
+            target_type="service",
+            host_id=host.id,
+            service_id=service.id,
+            discovered_by="manual",
+        )
+        state.findings[finding.id] = finding
+        data = CollectedData(
+            type="credentials",
+            content="root:toor",
+            source_host_id=host.id,
+            source_service_id=service.id,
+            source_finding_id=finding.id,
+            discovered_by="manual",
+        )
+        state.collected_data[data.id] = data
+        return state
+
+    def test_validate_engagement_valid(self):
+        """Test that a consistent engagement passes the integrity pass."""
+        report = ModelValidator.validate_engagement(self._engagement())
+
+        assert report.is_valid
+        assert report.checked_references > 0
+        assert report.elapsed >= 0
+        assert report.summary().startswith("integrity ok")
+
+    def test_validate_engagement_broken_references(self):
+        """Test that dangling references and mismatched keys are all reported."""
+        state = self._engagement()
+        finding = next(iter(state.findings.values()))
+        finding.service_id = "missing-service"
+        data = next(iter(state.collected_data.values()))
+        data.derived_finding_ids.append("missing-finding")
+        host = next(iter(state.hosts.values()))
+        state.hosts["other-key"] = state.hosts.pop(host.id)
+
+        report = ModelValidator.validate_engagement(state)
+
+        assert not report.is_valid
+        assert any("hosts entry other-key" in error for error in report.errors)
+        assert any("missing-service" in error for error in report.errors)
+        assert any("missing-finding" in error for error in report.errors)
+        # The host no longer lives under its own id, so host references dangle too
+        assert any("non-existent host_id" in error for error in report.errors)
+        assert f"{len(report.errors)} error(s)" in report.summary()
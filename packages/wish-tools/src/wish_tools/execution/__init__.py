@@ -2,6 +2,17 @@
 Tool execution
 """
 
-from .executor import ExecutionResult, ToolExecutor
+from .executor import CommandStream, ExecutionResult, ToolExecutor
+from .msfconsole_pool import MsfconsolePool
+from .spool import SpooledOutput, spool_path_for
+from .streaming import OutputChunk
 
-__all__ = ["ToolExecutor", "ExecutionResult"]
+__all__ = [
+    "ToolExecutor",
+    "ExecutionResult",
+    "CommandStream",
+    "OutputChunk",
+    "MsfconsolePool",
+    "SpooledOutput",
+    "spool_path_for",
+]
@@ -25,6 +25,33 @@ class AnsiFilter:
     # Backspace sequences
     BACKSPACE_PATTERN = re.compile(r"\x08+")
 
+    # Any complete escape sequence: CSI, OSC/DCS strings terminated by BEL or ST,
+    # and the remaining two-character escapes (charset selection, keypad modes, ...)
+    ESCAPE_SEQUENCE_PATTERN = re.compile(r"\x1b(?:\[[0-?]*[ -/]*[@-~]|[\]PX^_][^\x07\x1b]*(?:\x07|\x1b\\)|[ -/]*[0-~])")
+
+    # Control characters except tab, newline and carriage return (covers bell,
+    # backspace and stray ESC); for ASCII text str.translate deletes them far
+    # faster than a regex scan, otherwise CONTROL_CHARS is used
+    CONTROL_CHAR_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+
+    # Whitespace cleanup
+    BLANK_LINES_PATTERN = re.compile(r"\n\s*\n\s*\n")
+    TRAILING_WHITESPACE_PATTERN = re.compile(r"[ \t]+\n")
+
+    # An escape sequence cut off at the end of a chunk
+    PARTIAL_ESCAPE_PATTERN = re.compile(r"\x1b(?:\[[0-?]*[ -/]*|[\]PX^_][^\x07\x1b]*\x1b?|[ -/]*)\Z")
+
+    # msfconsole job status lines, blank lines, prompts and status indicators
+    MSFCONSOLE_LINE_PATTERN = re.compile(
+        r"^(?:"
+        r"\[\*\][ \t]*(?:Started|Stopping)[ \t].*(?:\n|\Z)"
+        r"|[ \t]*\n"
+        r"|(?:\[[*!+-]\][ \t]*)?msf\d*[ \t]*(?:(?:exploit|auxiliary)\([^)\n]+\)[ \t]*)?>[ \t]*"
+        r"|\[[*!+-]\][ \t]*"
+        r")",
+        re.MULTILINE,
+    )
+
     @classmethod
     def strip_ansi_codes(cls, text: str) -> str:
         """Remove ANSI color codes and formatting sequences"""
@@ -72,19 +99,26 @@ class AnsiFilter:
 
     @classmethod
     def sanitize_terminal_output(cls, text: str) -> str:
-        """Comprehensive sanitization of terminal output"""
+        """Comprehensive sanitization of terminal output
+
+        Escape sequences are removed with one precompiled pattern and control
+        characters in one more pass; the whitespace cleanup is skipped when
+        there is nothing for it to do.
+        """
         if not text:
             return text
 
-        # Apply all filters
-        text = cls.strip_ansi_codes(text)
-        text = cls.strip_cursor_controls(text)
-        text = cls.strip_screen_controls(text)
-        text = cls.strip_control_chars(text)
+        if "\x1b" in text:
+            text = cls.ESCAPE_SEQUENCE_PATTERN.sub("", text)
+        if text.isascii():
+            text = text.translate(cls.CONTROL_CHAR_TABLE)
+        else:
+            text = cls.CONTROL_CHARS.sub("", text)
 
         # Clean up excessive whitespace
-        text = re.sub(r"\n\s*\n\s*\n", "\n\n", text)  # Multiple empty lines
-        text = re.sub(r"[ \t]+\n", "\n", text)  # Trailing whitespace
+        text = cls.BLANK_LINES_PATTERN.sub("\n\n", text)
+        if " \n" in text or "\t\n" in text:
+            text = cls.TRAILING_WHITESPACE_PATTERN.sub("\n", text)
 
         return text
 
@@ -97,24 +131,39 @@ class AnsiFilter:
         # First apply general sanitization
         text = cls.sanitize_terminal_output(text)
 
-        # Remove msfconsole-specific patterns
-        # Remove progress indicators and status messages
-        text = re.sub(r"^\[\*\]\s*", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^\[!\]\s*", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^\[+\]\s*", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^\[-\]\s*", "", text, flags=re.MULTILINE)
-
-        # Remove MSF prompt indicators
-        text = re.sub(r"^msf\d*\s*>\s*", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^msf\d*\s*exploit\([^)]+\)\s*>\s*", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^msf\d*\s*auxiliary\([^)]+\)\s*>\s*", "", text, flags=re.MULTILINE)
-
-        # Remove job status lines
-        text = re.sub(r"^\[\*\]\s*Started\s+.*$", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^\[\*\]\s*Stopping\s+.*$", "", text, flags=re.MULTILINE)
-
-        # Clean up remaining empty lines
-        text = re.sub(r"\n\s*\n\s*\n", "\n\n", text)
-        text = text.strip()
-
-        return text
+        # Remove job status lines, empty lines, prompts and status indicators
+        text = cls.MSFCONSOLE_LINE_PATTERN.sub("", text)
+        return text.strip()
+
+
+class IncrementalAnsiFilter:
+    """Sanitizes terminal output that arrives in chunks
+
+    An escape sequence split across chunks is held back until it is complete,
+    so it is removed exactly as if the output had been sanitized whole.
+    Whitespace is cleaned up per chunk, which matches whole-output results
+    when chunks end at line breaks (as LineDecoder releases them).
+    """
+
+    # Longest partial escape sequence held back before it is treated as text
+    MAX_PENDING_ESCAPE = 256
+
+    def __init__(self) -> None:
+        self._pending = ""
+
+    def feed(self, text: str) -> str:
+        """Sanitize a chunk, returning the text that is safe to release"""
+        text = self._pending + text
+        self._pending = ""
+        if "\x1b" in text[-self.MAX_PENDING_ESCAPE :]:
+            match = AnsiFilter.PARTIAL_ESCAPE_PATTERN.search(text, max(len(text) - self.MAX_PENDING_ESCAPE, 0))
+            if match is not None:
+                self._pending = text[match.start() :]
+                text = text[: match.start()]
+        return AnsiFilter.sanitize_terminal_output(text)
+
+    def flush(self) -> str:
+        """Sanitize whatever is still held back at end of stream"""
+        text = self._pending
+        self._pending = ""
+        return AnsiFilter.sanitize_terminal_output(text)
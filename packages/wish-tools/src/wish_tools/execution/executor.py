@@ -3,18 +3,32 @@ Tool execution management
 """
 
 import asyncio
+import inspect
 import logging
+import os
 import shlex
 import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Literal
 
-from .ansi_filter import AnsiFilter
+from .ansi_filter import AnsiFilter, IncrementalAnsiFilter
 from .msfconsole_executor import MsfconsoleExecutor
+from .msfconsole_pool import MsfconsolePool
+from .streaming import LineDecoder, OutputChunk
 
 logger = logging.getLogger(__name__)
 
+# Lines of each stream kept in memory by stream_command() unless told otherwise
+DEFAULT_TAIL_LINES = 1000
+_READ_SIZE = 64 * 1024
+# Read chunks buffered between the pipe readers and a slow consumer
+_QUEUE_SIZE = 64
+
+OutputCallback = Callable[[OutputChunk], Awaitable[None] | None]
+
 
 @dataclass
 class ExecutionResult:
@@ -29,15 +43,219 @@ class ExecutionResult:
     success: bool
     working_directory: str | None = None
     timeout_occurred: bool = False
+    # stdout/stderr hold only the last lines of the output (streaming with a bounded tail)
+    output_truncated: bool = False
+    # File holding the complete raw stdout when it was spooled to disk
+    output_file: str | None = None
+
+
+class CommandStream:
+    """Async iterator over the output of a running command
+
+    Yields OutputChunk objects as lines arrive on stdout and stderr. Only the
+    last tail_lines lines of each stream are kept in memory (all of them when
+    tail_lines is None); once iteration ends, result holds an ExecutionResult
+    built from them. With a spool_path, the raw stdout bytes are also written
+    to that file as they arrive (see SpooledOutput for reading it back).
+    """
+
+    def __init__(
+        self,
+        executor: "ToolExecutor",
+        command: str,
+        tool_name: str,
+        timeout: int,
+        working_directory: str | None,
+        env_vars: dict[str, str] | None,
+        tail_lines: int | None,
+        spool_path: str | Path | None = None,
+    ) -> None:
+        self.command = command
+        self.tool_name = tool_name
+        self.timeout = timeout
+        self.working_directory = working_directory
+        self.env_vars = env_vars
+        self.spool_path = Path(spool_path).expanduser() if spool_path is not None else None
+        self.result: ExecutionResult | None = None
+        self._executor = executor
+        self._tails: dict[str, deque[str]] = {"stdout": deque(maxlen=tail_lines), "stderr": deque(maxlen=tail_lines)}
+        self._line_counts = {"stdout": 0, "stderr": 0}
+        self._iterator: AsyncGenerator[OutputChunk, None] | None = None
+
+    def __aiter__(self) -> AsyncIterator[OutputChunk]:
+        if self._iterator is None:
+            self._iterator = self._run()
+        return self._iterator
+
+    async def aclose(self) -> None:
+        """Stop reading and terminate the process if it is still running"""
+        if self._iterator is not None:
+            await self._iterator.aclose()
+
+    def tail(self, stream: Literal["stdout", "stderr"] = "stdout") -> str:
+        """Text of the lines currently kept for a stream"""
+        return "".join(self._tails[stream])
+
+    async def _run(self) -> AsyncGenerator[OutputChunk, None]:
+        start_time = time.time()
+
+        if not self.command or not self.command.strip():
+            self.result = self._error_result(-5, "Empty command provided", start_time)
+            return
+
+        try:
+            args = shlex.split(self.command)
+            if not args:
+                raise ValueError("Command parsed to empty arguments")
+        except ValueError as e:
+            logger.error(f"Failed to parse command: {e}")
+            self.result = self._error_result(-6, f"Failed to parse command: {str(e)}", start_time)
+            return
+
+        spool: BinaryIO | None = None
+        if self.spool_path is not None:
+            try:
+                self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+                # Closed when the stream ends; unbuffered (reads are already up to
+                # _READ_SIZE) so write errors surface while streaming, not on close
+                spool = open(self.spool_path, "wb", buffering=0)
+            except OSError as e:
+                self.result = self._error_result(-4, f"Cannot open output spool {self.spool_path}: {e}", start_time)
+                return
+
+        try:
+            process = await self._executor._start_process(args, self.working_directory, self.env_vars)
+        except (FileNotFoundError, PermissionError) as e:
+            if spool is not None:
+                spool.close()
+            if isinstance(e, FileNotFoundError):
+                self.result = self._error_result(-2, f"Tool not found: {self.tool_name}. {str(e)}", start_time)
+            else:
+                self.result = self._error_result(-3, f"Permission denied: {str(e)}", start_time)
+            return
+        except Exception as e:
+            # Invalid working directory or any other failure to start the process
+            if spool is not None:
+                spool.close()
+            self.result = self._error_result(-4, f"Unexpected error executing command: {str(e)}", start_time)
+            return
+
+        process_id = f"{self.tool_name}_{start_time}"
+        self._executor.active_processes[process_id] = process
+        logger.info(f"Streaming command: {self.command} (tool: {self.tool_name}, timeout: {self.timeout}s)")
+
+        queue: asyncio.Queue[tuple[Literal["stdout", "stderr"], bytes | None]] = asyncio.Queue(_QUEUE_SIZE)
+
+        async def pump(name: Literal["stdout", "stderr"], reader: asyncio.StreamReader | None) -> None:
+            try:
+                while reader is not None and (data := await reader.read(_READ_SIZE)):
+                    await queue.put((name, data))
+            finally:
+                await queue.put((name, None))
+
+        readers = [
+            asyncio.create_task(pump("stdout", process.stdout)),
+            asyncio.create_task(pump("stderr", process.stderr)),
+        ]
+        decoders = {"stdout": LineDecoder(), "stderr": LineDecoder()}
+        filters = {"stdout": IncrementalAnsiFilter(), "stderr": IncrementalAnsiFilter()}
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        open_streams = len(readers)
+
+        try:
+            while open_streams:
+                name, data = await asyncio.wait_for(queue.get(), timeout=max(deadline - loop.time(), 0))
+                if data is None:
+                    open_streams -= 1
+                    text = filters[name].feed(decoders[name].flush()) + filters[name].flush()
+                else:
+                    if spool is not None and name == "stdout":
+                        spool.write(data)
+                    text = filters[name].feed(decoders[name].feed(data))
+                chunk = self._record(name, text)
+                if chunk is not None:
+                    yield chunk
+
+            await asyncio.wait_for(process.wait(), timeout=max(deadline - loop.time(), 0))
+            self.result = self._final_result(process.returncode or 0, start_time)
+            logger.info(
+                f"Command completed: {self.command} "
+                f"(exit_code: {self.result.exit_code}, duration: {self.result.duration:.2f}s)"
+            )
+
+        except TimeoutError:
+            logger.warning(f"Command timed out after {self.timeout}s: {self.command}")
+            await self._executor._terminate_process(process, timeout=10)
+            self.result = self._final_result(-1, start_time)
+            self.result.success = False
+            self.result.timeout_occurred = True
+            self.result.stderr += f"Command timed out after {self.timeout} seconds"
+
+        except Exception as e:
+            # Such as a failed write to the spool file (disk full)
+            self.result = self._error_result(-4, f"Unexpected error executing command: {str(e)}", start_time)
+
+        finally:
+            for reader in readers:
+                reader.cancel()
+            if process.returncode is None:
+                # The consumer stopped early or was cancelled
+                await self._executor._terminate_process(process, timeout=10)
+            if spool is not None:
+                spool.close()
+            self._executor.active_processes.pop(process_id, None)
+
+    def _record(self, name: Literal["stdout", "stderr"], text: str) -> OutputChunk | None:
+        if not text:
+            return None
+        lines = text.splitlines(keepends=True)
+        self._line_counts[name] += len(lines)
+        self._tails[name].extend(lines)
+        return OutputChunk(name, text)
+
+    def _final_result(self, exit_code: int, start_time: float) -> ExecutionResult:
+        truncated = any(count > len(self._tails[name]) for name, count in self._line_counts.items())
+        return ExecutionResult(
+            command=self.command,
+            exit_code=exit_code,
+            stdout=self.tail("stdout"),
+            stderr=self.tail("stderr"),
+            duration=time.time() - start_time,
+            tool_name=self.tool_name,
+            success=exit_code == 0,
+            working_directory=self.working_directory,
+            output_truncated=truncated,
+            output_file=str(self.spool_path) if self.spool_path is not None else None,
+        )
+
+    def _error_result(self, exit_code: int, error_msg: str, start_time: float) -> ExecutionResult:
+        logger.error(error_msg)
+        return ExecutionResult(
+            command=self.command,
+            exit_code=exit_code,
+            stdout="",
+            stderr=error_msg,
+            duration=time.time() - start_time,
+            tool_name=self.tool_name,
+            success=False,
+            working_directory=self.working_directory,
+        )
 
 
 class ToolExecutor:
     """Tool execution manager with async support"""
 
-    def __init__(self):
-        """Initialize executor"""
+    def __init__(self, msfconsole_pool: MsfconsolePool | None = None):
+        """Initialize executor
+
+        Args:
+            msfconsole_pool: Long-lived msfconsole workers to run msfconsole
+                commands on; without one every command starts a new msfconsole
+        """
         self.active_processes: dict[str, asyncio.subprocess.Process] = {}
         self.msfconsole_executor = MsfconsoleExecutor()
+        self.msfconsole_pool = msfconsole_pool
 
     async def execute_command(
         self,
@@ -46,8 +264,17 @@ class ToolExecutor:
         timeout: int = 300,
         working_directory: str | None = None,
         env_vars: dict[str, str] | None = None,
+        on_output: OutputCallback | None = None,
+        spool_path: str | Path | None = None,
     ) -> ExecutionResult:
-        """Execute a command with timeout"""
+        """Execute a command with timeout
+
+        When on_output is given, output is streamed to it line by line while
+        the command runs (see stream_command); the full output is still
+        returned in the result. When spool_path is given, the raw stdout is
+        written to that file and the result only holds the last
+        DEFAULT_TAIL_LINES lines, with output_file pointing at the spool.
+        """
         # Validate command is not empty
         if not command or not command.strip():
             return ExecutionResult(
@@ -73,25 +300,32 @@ class ToolExecutor:
         if tool_name == "msfconsole" or command.startswith("msfconsole"):
             return await self._execute_msfconsole_command(command, tool_name, timeout, working_directory, env_vars)
 
+        if on_output is not None or spool_path is not None:
+            # Without a spool file the full output has to stay in memory
+            stream = self.stream_command(
+                command,
+                tool_name,
+                timeout,
+                working_directory,
+                env_vars,
+                tail_lines=DEFAULT_TAIL_LINES if spool_path is not None else None,
+                spool_path=spool_path,
+            )
+            async for chunk in stream:
+                if on_output is None:
+                    continue
+                outcome = on_output(chunk)
+                if inspect.isawaitable(outcome):
+                    await outcome
+            if stream.result is None:
+                raise RuntimeError(f"Output stream of {command!r} ended without a result")
+            return stream.result
+
         # Prepare execution environment
         start_time = time.time()
         process_id = f"{tool_name}_{start_time}"
 
-        # Set up environment variables
-        env = None
-        if env_vars:
-            import os
-
-            env = os.environ.copy()
-            env.update(env_vars)
-
-        # Validate working directory
-        if working_directory:
-            work_dir = Path(working_directory)
-            if not work_dir.exists():
-                raise ValueError(f"Working directory does not exist: {working_directory}")
-            if not work_dir.is_dir():
-                raise ValueError(f"Working directory is not a directory: {working_directory}")
+        self._validate_working_directory(working_directory)
 
         logger.info(f"Executing command: {command} (tool: {tool_name}, timeout: {timeout}s)")
 
@@ -120,14 +354,7 @@ class ToolExecutor:
             # Shell metacharacters are allowed since all commands require explicit user approval
 
             # Create subprocess using exec (not shell) for security
-            process = await asyncio.create_subprocess_exec(
-                args[0],
-                *args[1:],
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=working_directory,
-                env=env,
-            )
+            process = await self._start_process(args, working_directory, env_vars)
 
             # Track active process
             self.active_processes[process_id] = process
@@ -235,6 +462,60 @@ class ToolExecutor:
             # Clean up process tracking
             self.active_processes.pop(process_id, None)
 
+    def stream_command(
+        self,
+        command: str,
+        tool_name: str,
+        timeout: int = 300,
+        working_directory: str | None = None,
+        env_vars: dict[str, str] | None = None,
+        tail_lines: int | None = DEFAULT_TAIL_LINES,
+        spool_path: str | Path | None = None,
+    ) -> CommandStream:
+        """Run a command and iterate over its decoded, ANSI-filtered output as it arrives
+
+        Usage:
+            stream = executor.stream_command("nmap -sV 10.0.0.0/24", "nmap")
+            async for chunk in stream:
+                ui.print(chunk.text)
+            result = stream.result
+
+        Only the last tail_lines lines of stdout and stderr are kept in memory
+        and returned in stream.result (None keeps everything). With spool_path,
+        the complete raw stdout is written to that file as well.
+        """
+        return CommandStream(self, command, tool_name, timeout, working_directory, env_vars, tail_lines, spool_path)
+
+    async def _start_process(
+        self, args: list[str], working_directory: str | None, env_vars: dict[str, str] | None
+    ) -> asyncio.subprocess.Process:
+        """Start a subprocess with piped stdout/stderr"""
+        env = None
+        if env_vars:
+            env = os.environ.copy()
+            env.update(env_vars)
+
+        self._validate_working_directory(working_directory)
+
+        return await asyncio.create_subprocess_exec(
+            args[0],
+            *args[1:],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=working_directory,
+            env=env,
+        )
+
+    @staticmethod
+    def _validate_working_directory(working_directory: str | None) -> None:
+        """Raise ValueError unless the working directory (if any) is an existing directory"""
+        if working_directory:
+            work_dir = Path(working_directory)
+            if not work_dir.exists():
+                raise ValueError(f"Working directory does not exist: {working_directory}")
+            if not work_dir.is_dir():
+                raise ValueError(f"Working directory is not a directory: {working_directory}")
+
     async def _execute_msfconsole_command(
         self,
         command: str,
@@ -259,12 +540,16 @@ class ToolExecutor:
                     # Fallback to removing msfconsole prefix
                     command = command.replace("msfconsole -q -x ", "").strip("\"'")
 
-            stdout, stderr, exit_code = await self.msfconsole_executor.execute_msfconsole_command(
-                command=command,
-                timeout=timeout,
-                working_directory=working_directory,
-                env_vars=env_vars,
-            )
+            if self.msfconsole_pool is not None and working_directory is None and not env_vars:
+                # Pooled workers share one working directory and environment
+                stdout, stderr, exit_code = await self.msfconsole_pool.execute(command, timeout)
+            else:
+                stdout, stderr, exit_code = await self.msfconsole_executor.execute_msfconsole_command(
+                    command=command,
+                    timeout=timeout,
+                    working_directory=working_directory,
+                    env_vars=env_vars,
+                )
 
             duration = time.time() - start_time
 
@@ -356,6 +641,12 @@ class ToolExecutor:
 
         self.active_processes.clear()
 
+    async def shutdown(self) -> None:
+        """Cancel active executions and stop pooled msfconsole workers"""
+        await self.cancel_all_executions()
+        if self.msfconsole_pool is not None:
+            await self.msfconsole_pool.close()
+
     def get_active_executions(self) -> dict[str, dict[str, Any]]:
         """Get information about currently active executions"""
         active = {}
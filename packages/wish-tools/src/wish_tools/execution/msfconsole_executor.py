@@ -3,22 +3,43 @@ Specialized executor for msfconsole with PTY support
 """
 
 import asyncio
+import codecs
 import logging
 import os
 import pty
-import select
 import signal
-import time
 from pathlib import Path
+from typing import Any
 
 from .ansi_filter import AnsiFilter
 
 logger = logging.getLogger(__name__)
 
+# Bytes read from the PTY per read call
+_READ_SIZE = 64 * 1024
+
+# Environment msfconsole runs with
+MSFCONSOLE_ENV = {
+    "TERM": "xterm",
+    "COLUMNS": "80",
+    "LINES": "24",
+    "MSF_DATABASE_CONFIG": "/dev/null",  # Disable database to avoid warnings
+}
+
 
 class MsfconsoleExecutor:
     """Specialized executor for msfconsole with proper TTY handling"""
 
+    # Output that means msfconsole has finished execution
+    FINISH_INDICATORS = (
+        "Interrupt: use the 'exit' command to quit",
+        "Thank you for using Metasploit",
+        "Database connection isn't established",
+        "Session",  # Session created or finished
+        "Exploit completed",
+        "Auxiliary module execution completed",
+    )
+
     def __init__(self):
         """Initialize the msfconsole executor"""
         self.process: asyncio.subprocess.Process | None = None
@@ -43,14 +64,7 @@ class MsfconsoleExecutor:
             env.update(env_vars)
 
         # Add msfconsole-specific environment variables
-        env.update(
-            {
-                "TERM": "xterm",
-                "COLUMNS": "80",
-                "LINES": "24",
-                "MSF_DATABASE_CONFIG": "/dev/null",  # Disable database to avoid warnings
-            }
-        )
+        env.update(MSFCONSOLE_ENV)
 
         # Validate working directory
         if working_directory:
@@ -110,80 +124,64 @@ class MsfconsoleExecutor:
             await self._cleanup()
 
     async def _read_pty_output(self, master_fd: int, timeout: int) -> str:
-        """Read output from PTY with timeout"""
-        output_buffer = bytearray()
-        start_time = time.time()
-
-        # Set non-blocking mode
-        import fcntl
-
-        flags = fcntl.fcntl(master_fd, fcntl.F_GETFL)
-        fcntl.fcntl(master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
-
-        while time.time() - start_time < timeout:
-            try:
-                # Use select to check for data availability
-                ready, _, _ = select.select([master_fd], [], [], 0.1)
-
-                if ready:
-                    try:
-                        data = os.read(master_fd, 4096)
-                        if not data:
-                            break  # EOF
-                        output_buffer.extend(data)
-
-                        # Check for msfconsole exit indicators
-                        text = output_buffer.decode("utf-8", errors="replace")
-                        if self._is_msfconsole_finished(text):
-                            break
-
-                    except OSError as e:
-                        if e.errno == 11:  # EAGAIN - no data available
-                            continue
-                        else:
-                            break
-
-                # Check if process has terminated
-                if self.process and self.process.returncode is not None:
-                    # Read any remaining data
-                    try:
-                        remaining = os.read(master_fd, 4096)
-                        if remaining:
-                            output_buffer.extend(remaining)
-                    except OSError:
-                        pass
-                    break
-
-                await asyncio.sleep(0.1)
+        """Read output from PTY with timeout
 
-            except Exception as e:
-                logger.warning(f"Error reading PTY output: {e}")
-                break
+        The PTY is watched with loop.add_reader, so nothing runs while msfconsole
+        is silent. Output is decoded incrementally and only new text (plus an
+        overlap the length of the longest indicator) is checked for completion.
+        """
+        loop = asyncio.get_running_loop()
+        finished: asyncio.Future[None] = loop.create_future()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        overlap = max(len(indicator) for indicator in self.FINISH_INDICATORS) - 1
+        chunks: list[str] = []
+        window = ""
+
+        def read_available() -> bool:
+            """Read what the PTY has; returns False at EOF"""
+            nonlocal window
+            while True:
+                try:
+                    data = os.read(master_fd, _READ_SIZE)
+                except BlockingIOError:
+                    return True
+                except OSError:
+                    return False  # EIO once the process closes its end of the PTY
+                if not data:
+                    return False
+                text = decoder.decode(data)
+                chunks.append(text)
+                window = window[-overlap:] + text
+                if self._is_msfconsole_finished(window):
+                    return False
+
+        def on_readable() -> None:
+            if not read_available() and not finished.done():
+                finished.set_result(None)
+
+        os.set_blocking(master_fd, False)
+        loop.add_reader(master_fd, on_readable)
+        waiters: set[asyncio.Future[Any]] = {finished}
+        if self.process is not None:
+            waiters.add(asyncio.ensure_future(self.process.wait()))
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not finished.done():
+                # The process exited (or timed out); pick up whatever it left in the PTY
+                read_available()
+        except Exception as e:
+            logger.warning(f"Error reading PTY output: {e}")
+        finally:
+            loop.remove_reader(master_fd)
+            for waiter in waiters:
+                waiter.cancel()
 
-        return output_buffer.decode("utf-8", errors="replace")
+        chunks.append(decoder.decode(b"", final=True))
+        return "".join(chunks)
 
     def _is_msfconsole_finished(self, output: str) -> bool:
         """Check if msfconsole has finished execution"""
-        # Look for msfconsole exit indicators
-        exit_indicators = [
-            "Interrupt: use the 'exit' command to quit",
-            "Thank you for using Metasploit",
-            "Database connection isn't established",
-            "Session",  # Session created or finished
-        ]
-
-        for indicator in exit_indicators:
-            if indicator in output:
-                return True
-
-        # Check for common completion patterns
-        if "Exploit completed" in output:
-            return True
-
-        if "Auxiliary module execution completed" in output:
-            return True
-
-        return False
+        return any(indicator in output for indicator in self.FINISH_INDICATORS)
 
     async def _terminate_process(self) -> None:
         """Terminate the msfconsole process"""
@@ -0,0 +1,350 @@
+"""
+Pool of long-lived msfconsole processes
+"""
+
+import asyncio
+import codecs
+import logging
+import os
+import pty
+import re
+import secrets
+import signal
+import termios
+import time
+from collections import deque
+from collections.abc import Sequence
+
+from .ansi_filter import AnsiFilter
+from .msfconsole_executor import MSFCONSOLE_ENV
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the PTY per read call
+_READ_SIZE = 64 * 1024
+
+# How workers are started: no banner, quiet, no "-x ...; exit" so they stay up
+DEFAULT_CONSOLE_COMMAND = ("msfconsole", "-n", "-q")
+
+# Metasploit boots in 10-30s; allow for slow machines
+DEFAULT_START_TIMEOUT = 120.0
+
+# Global datastore variable used to mark the end of each command's output
+MARKER_VAR = "WishCommandMarker"
+
+# Console commands that would end the worker instead of the command
+_EXIT_COMMANDS = {"exit", "exit -y", "quit"}
+
+# Run after every command: leave the module, clear global datastore values set
+# with setg, and list what is left running in the background
+_RESET_COMMANDS = ["back", "unsetg all", "jobs", "sessions"]
+
+# Replies of "jobs" and "sessions" when nothing is running
+_NO_JOBS = "No active jobs."
+_NO_SESSIONS = "No active sessions."
+
+
+class MsfconsoleWorker:
+    """A long-lived msfconsole process driven through a PTY
+
+    Commands are written to the console followed by "setg <MARKER_VAR> <token>";
+    msfconsole echoes "<MARKER_VAR> => <token>" once everything before it has
+    run, which marks the end of the command's output. Each command starts from
+    a clean console: reset() clears the module context and global datastore
+    after a command, and a worker left with jobs or sessions is not reused.
+    """
+
+    def __init__(
+        self,
+        console_command: Sequence[str] = DEFAULT_CONSOLE_COMMAND,
+        env_vars: dict[str, str] | None = None,
+    ) -> None:
+        self.console_command = tuple(console_command)
+        self.env_vars = env_vars
+        self.process: asyncio.subprocess.Process | None = None
+        self.master_fd: int | None = None
+        self.commands_run = 0
+        self.started_at = 0.0
+        self.last_used = 0.0
+        self._chunks: deque[str] = deque()
+        self._output_ready = asyncio.Event()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._eof = False
+
+    @property
+    def alive(self) -> bool:
+        """Whether the console process is still running"""
+        return self.process is not None and self.process.returncode is None and not self._eof
+
+    async def start(self, timeout: float = DEFAULT_START_TIMEOUT) -> None:
+        """Start msfconsole and wait until it accepts commands"""
+        env = os.environ.copy()
+        if self.env_vars:
+            env.update(self.env_vars)
+        env.update(MSFCONSOLE_ENV)
+
+        master_fd, slave_fd = pty.openpty()
+        # No terminal echo (typed-ahead input would appear before earlier output)
+        # and no CRLF translation of output
+        attrs = termios.tcgetattr(slave_fd)
+        attrs[1] &= ~termios.ONLCR
+        attrs[3] &= ~termios.ECHO
+        termios.tcsetattr(slave_fd, termios.TCSANOW, attrs)
+
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                *self.console_command,
+                stdin=slave_fd,
+                stdout=slave_fd,
+                stderr=slave_fd,
+                env=env,
+                start_new_session=True,
+            )
+        except Exception:
+            os.close(master_fd)
+            raise
+        finally:
+            os.close(slave_fd)
+
+        self.master_fd = master_fd
+        self.started_at = self.last_used = time.monotonic()
+        os.set_blocking(master_fd, False)
+        asyncio.get_running_loop().add_reader(master_fd, self._on_readable)
+
+        _, completed = await self._round_trip([], timeout)
+        if not completed:
+            await self.stop()
+            raise RuntimeError(f"msfconsole did not become ready within {timeout}s")
+        logger.info(f"msfconsole worker started (pid {self.process.pid})")
+
+    async def run(self, commands: list[str], timeout: float) -> tuple[str, bool]:
+        """Run console commands
+
+        Returns:
+            Tuple of (raw output, whether the commands completed before the timeout)
+        """
+        output, completed = await self._round_trip(commands, timeout)
+        self.commands_run += 1
+        self.last_used = time.monotonic()
+        return output, completed
+
+    async def reset(self, timeout: float = 30.0) -> bool:
+        """Undo the state a command left behind
+
+        Returns:
+            Whether the console is clean again; False when the command left
+            background jobs or sessions, which only stopping the worker ends
+        """
+        output, completed = await self._round_trip(_RESET_COMMANDS, timeout)
+        return completed and _NO_JOBS in output and _NO_SESSIONS in output
+
+    async def ping(self, timeout: float = 10.0) -> bool:
+        """Check that the console still answers"""
+        if not self.alive:
+            return False
+        try:
+            _, completed = await self._round_trip([], timeout)
+        except RuntimeError:
+            return False
+        return completed
+
+    async def stop(self) -> None:
+        """Terminate the console process and release the PTY"""
+        if self.master_fd is not None:
+            asyncio.get_running_loop().remove_reader(self.master_fd)
+            try:
+                os.close(self.master_fd)
+            except OSError:
+                pass
+            self.master_fd = None
+
+        process, self.process = self.process, None
+        if process is None or process.returncode is not None:
+            return
+        try:
+            os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except TimeoutError:
+                os.killpg(os.getpgid(process.pid), signal.SIGKILL)
+                await process.wait()
+        except (ProcessLookupError, OSError):
+            # Process already terminated
+            pass
+
+    async def _round_trip(self, commands: list[str], timeout: float) -> tuple[str, bool]:
+        if self.master_fd is None:
+            raise RuntimeError("msfconsole worker is not running")
+
+        token = secrets.token_hex(8)
+        sentinel = f"{MARKER_VAR} => {token}"
+        # Anything left over (such as the prompt redrawn after the last marker) is stale
+        self._chunks.clear()
+        lines = [*commands, f"setg {MARKER_VAR} {token}"]
+        os.write(self.master_fd, "".join(f"{line}\n" for line in lines).encode())
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        received: list[str] = []
+        window = ""
+        while True:
+            while self._chunks:
+                text = self._chunks.popleft()
+                received.append(text)
+                # Only new text (plus enough overlap for a split sentinel) is searched
+                window = window[-len(sentinel) :] + text
+                if sentinel in window:
+                    return _strip_marker("".join(received), sentinel), True
+            if self._eof:
+                raise RuntimeError("msfconsole worker exited")
+
+            self._output_ready.clear()
+            try:
+                await asyncio.wait_for(self._output_ready.wait(), timeout=max(deadline - loop.time(), 0))
+            except TimeoutError:
+                return _strip_marker("".join(received), sentinel), False
+
+    def _on_readable(self) -> None:
+        if self.master_fd is None:
+            return
+        try:
+            data = os.read(self.master_fd, _READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""  # EIO once the process closes its end of the PTY
+        if data:
+            self._chunks.append(self._decoder.decode(data))
+        else:
+            self._eof = True
+            asyncio.get_running_loop().remove_reader(self.master_fd)
+        self._output_ready.set()
+
+
+class MsfconsolePool:
+    """Pool of long-lived msfconsole workers
+
+    Starting msfconsole costs 10-30s of Ruby boot; workers started once are
+    reused for later commands. Workers start lazily, are pinged before reuse
+    when they have been idle for a while, and are replaced after
+    max_commands commands, after max_age seconds, when a command times out,
+    or when a command leaves jobs or sessions running (as with a one-off
+    "msfconsole -x '...; exit'", those end with the command).
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_commands: int = 50,
+        max_age: float = 3600.0,
+        health_check_interval: float = 60.0,
+        start_timeout: float = DEFAULT_START_TIMEOUT,
+        console_command: Sequence[str] = DEFAULT_CONSOLE_COMMAND,
+        env_vars: dict[str, str] | None = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1: {size}")
+        self.size = size
+        self.max_commands = max_commands
+        self.max_age = max_age
+        self.health_check_interval = health_check_interval
+        self.start_timeout = start_timeout
+        self.console_command = tuple(console_command)
+        self.env_vars = env_vars
+        self._idle: list[MsfconsoleWorker] = []
+        self._workers: set[MsfconsoleWorker] = set()
+        self._slots = asyncio.Semaphore(size)
+        self._closed = False
+
+    async def execute(self, command: str, timeout: int = 300) -> tuple[str, str, int]:
+        """
+        Run a msfconsole command line on a pooled worker
+
+        Returns:
+            Tuple of (stdout, stderr, exit_code), like MsfconsoleExecutor
+        """
+        commands = split_console_commands(command)
+        async with self._slots:
+            worker = await self._acquire()
+            try:
+                output, completed = await worker.run(commands, timeout)
+                # A console still busy with this command cannot be reused
+                clean = completed and await worker.reset()
+            except BaseException:
+                await self._discard(worker)
+                raise
+
+            if clean:
+                self._release(worker)
+            else:
+                await self._discard(worker)
+
+            stdout = AnsiFilter.sanitize_msfconsole_output(output)
+            if not completed:
+                return stdout, f"Command timed out after {timeout} seconds", -1
+            return stdout, "", 0
+
+    async def close(self) -> None:
+        """Stop all workers"""
+        self._closed = True
+        workers = list(self._workers)
+        self._workers.clear()
+        self._idle.clear()
+        await asyncio.gather(*(worker.stop() for worker in workers), return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        """Worker counts"""
+        return {"workers": len(self._workers), "idle": len(self._idle), "size": self.size}
+
+    async def _acquire(self) -> MsfconsoleWorker:
+        if self._closed:
+            raise RuntimeError("msfconsole pool is closed")
+
+        while self._idle:
+            worker = self._idle.pop()
+            if await self._is_healthy(worker):
+                return worker
+            logger.info("Recycling msfconsole worker")
+            await self._discard(worker)
+
+        worker = MsfconsoleWorker(self.console_command, self.env_vars)
+        self._workers.add(worker)
+        try:
+            await worker.start(self.start_timeout)
+        except BaseException:
+            await self._discard(worker)
+            raise
+        return worker
+
+    async def _is_healthy(self, worker: MsfconsoleWorker) -> bool:
+        if not worker.alive:
+            return False
+        now = time.monotonic()
+        if worker.commands_run >= self.max_commands or now - worker.started_at >= self.max_age:
+            return False
+        if now - worker.last_used >= self.health_check_interval:
+            return await worker.ping()
+        return True
+
+    def _release(self, worker: MsfconsoleWorker) -> None:
+        if self._closed:
+            return
+        self._idle.append(worker)
+
+    async def _discard(self, worker: MsfconsoleWorker) -> None:
+        self._workers.discard(worker)
+        await worker.stop()
+
+
+def split_console_commands(command: str) -> list[str]:
+    """Split a "cmd1; cmd2; exit" command line into console commands, without exit"""
+    commands = [part.strip() for part in re.split(r"[;\n]", command)]
+    return [part for part in commands if part and part not in _EXIT_COMMANDS]
+
+
+def _strip_marker(output: str, sentinel: str) -> str:
+    # Drop the marker reply and everything after it, and any echo of the setg line
+    end = output.find(sentinel)
+    if end >= 0:
+        output = output[:end]
+    return "".join(line for line in output.splitlines(keepends=True) if MARKER_VAR not in line)
@@ -0,0 +1,105 @@
+"""
+Disk-spooled tool output
+"""
+
+import mmap
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from .ansi_filter import AnsiFilter
+
+# Default location of spooled job output
+SPOOL_DIR = Path("~/.wish/output")
+
+# Spool files left behind by earlier sessions are swept past this age or total size
+SPOOL_MAX_AGE = 7 * 24 * 3600.0
+SPOOL_MAX_TOTAL_BYTES = 1024**3
+
+
+def spool_path_for(job_id: str, base_dir: str | Path | None = None) -> Path:
+    """Path of a new spool file for a job (job IDs restart every session, so a timestamp is included)"""
+    directory = Path(base_dir) if base_dir is not None else SPOOL_DIR
+    return directory.expanduser() / f"{time.strftime('%Y%m%d-%H%M%S')}-{job_id}.out"
+
+
+def sweep_spool_dir(
+    base_dir: str | Path | None = None,
+    max_age: float = SPOOL_MAX_AGE,
+    max_total_bytes: int = SPOOL_MAX_TOTAL_BYTES,
+) -> int:
+    """Delete spool files older than max_age seconds, then the oldest until the rest fit in max_total_bytes
+
+    Returns:
+        Number of files deleted
+    """
+    directory = (Path(base_dir) if base_dir is not None else SPOOL_DIR).expanduser()
+    files = []
+    for path in directory.glob("*.out"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    # Newest first: the budget is spent on recent output
+    files.sort(reverse=True)
+
+    cutoff = time.time() - max_age
+    total = 0
+    deleted = 0
+    for mtime, size, path in files:
+        total += size
+        if mtime >= cutoff and total <= max_total_bytes:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        deleted += 1
+    return deleted
+
+
+class SpooledOutput:
+    """Read access to raw tool output spooled to a file
+
+    Output is never loaded whole: lines are streamed from the file and the
+    tail is located by scanning backwards through a memory map.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    @property
+    def size(self) -> int:
+        """Size of the spooled output in bytes (0 if the file is gone)"""
+        try:
+            return self.path.stat().st_size
+        except OSError:
+            return 0
+
+    def iter_lines(self, sanitize: bool = True) -> Iterator[str]:
+        """Yield decoded lines (with line endings), ANSI-filtered unless sanitize is False"""
+        with open(self.path, encoding="utf-8", errors="replace", newline="") as f:
+            for line in f:
+                yield AnsiFilter.sanitize_terminal_output(line) if sanitize else line
+
+    def head(self, max_chars: int) -> str:
+        """Decoded text from the start of the output"""
+        with open(self.path, encoding="utf-8", errors="replace", newline="") as f:
+            return f.read(max_chars)
+
+    def tail(self, max_lines: int = 200) -> str:
+        """Decoded, ANSI-filtered last lines of the output"""
+        if self.size == 0:
+            return ""
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = len(data)
+            # A trailing newline ends the last line rather than starting an empty one
+            end = start - 1 if data[start - 1 : start] == b"\n" else start
+            for _ in range(max_lines):
+                start = data.rfind(b"\n", 0, end)
+                if start < 0:
+                    break
+                end = start
+            text = data[start + 1 :].decode("utf-8", errors="replace")
+        return AnsiFilter.sanitize_terminal_output(text)
@@ -0,0 +1,49 @@
+"""
+Incremental decoding of tool output streams
+"""
+
+import codecs
+from dataclasses import dataclass
+from typing import Literal
+
+# Release a partial line once this much text is pending without a line break
+MAX_PENDING_CHARS = 64 * 1024
+
+
+@dataclass
+class OutputChunk:
+    """Decoded, ANSI-filtered lines received from a running tool"""
+
+    stream: Literal["stdout", "stderr"]
+    text: str
+
+
+class LineDecoder:
+    """Incrementally decodes UTF-8 bytes and releases text up to the last line break
+
+    Both "\\n" and "\\r" end a line, so carriage-return progress updates (gobuster,
+    nmap --stats-every) are released as they are drawn. Multi-byte characters
+    and escape sequences split across reads stay pending until complete.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+
+    def feed(self, data: bytes) -> str:
+        """Decode bytes, returning the complete lines received so far"""
+        text = self._pending + self._decoder.decode(data)
+        boundary = max(text.rfind("\n"), text.rfind("\r")) + 1
+        if boundary == 0:
+            if len(text) < MAX_PENDING_CHARS:
+                self._pending = text
+                return ""
+            boundary = len(text)
+        self._pending = text[boundary:]
+        return text[:boundary]
+
+    def flush(self) -> str:
+        """Return whatever is still pending at end of stream"""
+        text = self._pending + self._decoder.decode(b"", final=True)
+        self._pending = ""
+        return text
@@ -2,8 +2,17 @@
 Parsers for security tool outputs
 """
 
-from .base import ToolParser
+from .base import ParserMatch, ParserRegistry, ToolParser
 from .nmap import NmapParser
+from .registry import create_parser_registry
 from .smb import Enum4linuxParser, SmbclientParser
 
-__all__ = ["ToolParser", "NmapParser", "SmbclientParser", "Enum4linuxParser"]
+__all__ = [
+    "ToolParser",
+    "ParserMatch",
+    "ParserRegistry",
+    "create_parser_registry",
+    "NmapParser",
+    "SmbclientParser",
+    "Enum4linuxParser",
+]
@@ -2,18 +2,24 @@
 Nmap output parser implementation
 """
 
+import io
 import logging
+import os
 import re
 import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
 from datetime import UTC, datetime
-from typing import Any, Literal
+from typing import IO, Any, Literal
 
-from wish_models import Finding, Host, Service
+from wish_models import Finding, Host, Service, TrustedModelFactory
 
-from .base import ToolParser
+from .base import SNIFF_CHARS, ParsedOutput, ToolParser
 
 logger = logging.getLogger(__name__)
 
+# A file path, or a binary or text stream, of Nmap XML
+XMLSource = str | os.PathLike[str] | IO[bytes] | IO[str]
+
 
 class NmapParser(ToolParser):
     """Parser for Nmap scan output in various formats"""
@@ -27,27 +33,35 @@ class NmapParser(ToolParser):
         return ["xml", "gnmap", "normal"]
 
     def can_parse(self, output: str, format_hint: str | None = None) -> bool:
-        """Detect if the output is from Nmap"""
-        if format_hint == "xml":
-            return output.strip().startswith("<?xml") and "<nmaprun" in output
-        elif format_hint == "gnmap":
-            return "# Nmap" in output and ("Status: Up" in output or "Status: Down" in output)
-        elif format_hint == "normal":
-            return "Nmap scan report" in output or "Starting Nmap" in output
-        else:
-            # Auto-detect format
-            return self.can_parse(output, "xml") or self.can_parse(output, "gnmap") or self.can_parse(output, "normal")
+        """Detect if the output is from Nmap (only the first SNIFF_CHARS characters are inspected)"""
+        prefix = output[:SNIFF_CHARS]
+        if format_hint in self.supported_formats:
+            return self._matches_format(prefix, format_hint)
+        return self.sniff(prefix) is not None
+
+    def sniff(self, prefix: str) -> str | None:
+        """Detect the output format from the start of the output"""
+        for output_format in ("xml", "gnmap", "normal"):
+            if self._matches_format(prefix, output_format):
+                return output_format
+        return None
+
+    @staticmethod
+    def _matches_format(prefix: str, output_format: str) -> bool:
+        if output_format == "xml":
+            return prefix.lstrip().startswith("<?xml") and "<nmaprun" in prefix
+        elif output_format == "gnmap":
+            return "# Nmap" in prefix and ("Status: Up" in prefix or "Status: Down" in prefix)
+        elif output_format == "normal":
+            return "Nmap scan report" in prefix or "Starting Nmap" in prefix
+        return False
 
     def _detect_format(self, output: str) -> str:
-        """Auto-detect the output format"""
-        if self.can_parse(output, "xml"):
-            return "xml"
-        elif self.can_parse(output, "gnmap"):
-            return "gnmap"
-        elif self.can_parse(output, "normal"):
-            return "normal"
-        else:
+        """Auto-detect the output format (only the first SNIFF_CHARS characters are inspected)"""
+        detected = self.sniff(output[:SNIFF_CHARS])
+        if detected is None:
             raise ValueError("Unable to detect Nmap output format")
+        return detected
 
     def parse_hosts(self, output: str, format_hint: str | None = None) -> list[Host]:
         """Parse hosts from Nmap output"""
@@ -82,25 +96,104 @@ class NmapParser(ToolParser):
             # Script output is mainly available in XML format
             return []
 
-    def _parse_hosts_xml(self, xml_output: str) -> list[Host]:
-        """Parse hosts from Nmap XML output"""
-        try:
-            root = ET.fromstring(xml_output)  # noqa: S314 - Nmap XML output is trusted
-        except ET.ParseError as e:
-            logger.error(f"Failed to parse XML: {e}")
-            return []
+    def parse_all(self, output: str, format_hint: str | None = None) -> ParsedOutput:
+        """Parse hosts, services and findings in one pass over the output
 
-        hosts = []
-        scan_time = self._get_scan_time(root)
+        XML is streamed once, collecting each host with its script findings,
+        and services are taken from the parsed hosts instead of parsing the
+        output again.
+        """
+        if not format_hint:
+            format_hint = self._detect_format(output)
+
+        if format_hint == "xml":
+            return self.parse_all_xml(io.StringIO(output))
+
+        hosts = self.parse_hosts(output, format_hint)
+        services = [service for host in hosts for service in host.services]
+        return {"hosts": hosts, "services": services, "findings": []}
+
+    def parse_file(self, path: str | os.PathLike[str], format_hint: str | None = None) -> ParsedOutput:
+        """Parse hosts, services and findings from output spooled to a file
+
+        The file is streamed (XML with iterparse, normal/grepable output line by
+        line), so memory does not grow with the size of the output.
+        """
+        with open(path, encoding="utf-8", errors="replace") as f:
+            if not format_hint:
+                format_hint = self.sniff(f.read(SNIFF_CHARS))
+                if format_hint is None:
+                    raise ValueError("Unable to detect Nmap output format")
+            f.seek(0)
+
+            if format_hint == "xml":
+                return self.parse_all_xml(path)
+            elif format_hint == "gnmap":
+                hosts = self._parse_hosts_gnmap(f)
+            elif format_hint == "normal":
+                hosts = self._parse_hosts_normal(f)
+            else:
+                raise ValueError(f"Unsupported format: {format_hint}")
+
+        services = [service for host in hosts for service in host.services]
+        return {"hosts": hosts, "services": services, "findings": []}
+
+    def iter_hosts_xml(self, source: XMLSource) -> Iterator[Host]:
+        """Yield hosts from Nmap XML as each <host> element closes
+
+        Args:
+            source: Path to an XML file, or a stream (e.g. spooled tool output)
+        """
+        for host, _ in self._iter_xml(source):
+            if host:
+                yield host
 
-        for host_elem in root.findall("host"):
-            host = self._parse_host_xml(host_elem, scan_time)
+    def parse_all_xml(self, source: XMLSource) -> ParsedOutput:
+        """Parse hosts, services and findings from an XML file or stream without loading it whole"""
+        hosts: list[Host] = []
+        findings: list[Finding] = []
+        for host, host_findings in self._iter_xml(source):
             if host:
                 hosts.append(host)
+            findings.extend(host_findings)
+        services = [service for host in hosts for service in host.services]
+        return {"hosts": hosts, "services": services, "findings": findings}
+
+    def _iter_xml(self, source: XMLSource) -> Iterator[tuple[Host | None, list[Finding]]]:
+        """Stream Nmap XML with iterparse, yielding each top-level <host> with its script findings
+
+        Each processed <host> is cleared and detached from the root, so memory
+        stays proportional to one host rather than the whole document. A parse
+        error ends the stream after the hosts already yielded.
+        """
+        root: ET.Element | None = None
+        factory: TrustedModelFactory | None = None
+        depth = 0
+        try:
+            for event, elem in ET.iterparse(source, events=("start", "end")):  # noqa: S314 - Nmap XML output is trusted
+                if event == "start":
+                    depth += 1
+                    if root is None:
+                        # Root attributes (scan start time) are complete at its start event
+                        root = elem
+                        factory = TrustedModelFactory("nmap", self._get_scan_time(elem))
+                    continue
+
+                depth -= 1
+                if depth == 1 and elem.tag == "host" and root is not None and factory is not None:
+                    host = self._parse_host_xml(elem, factory)
+                    findings = self._parse_host_findings_xml(elem, factory)
+                    root.remove(elem)
+                    elem.clear()
+                    yield host, findings
+        except ET.ParseError as e:
+            logger.error(f"Failed to parse XML: {e}")
 
-        return hosts
+    def _parse_hosts_xml(self, xml_output: str) -> list[Host]:
+        """Parse hosts from Nmap XML output"""
+        return list(self.iter_hosts_xml(io.StringIO(xml_output)))
 
-    def _parse_host_xml(self, host_elem: ET.Element, scan_time: datetime) -> Host | None:
+    def _parse_host_xml(self, host_elem: ET.Element, factory: TrustedModelFactory) -> Host | None:
         """Parse a single host from XML element"""
         # Get host address
         address_elem = host_elem.find("address[@addrtype='ipv4']")
@@ -153,30 +246,26 @@ class NmapParser(ToolParser):
             mac_address = mac_elem.get("addr")
 
         # Create host object
-        host = Host(
-            ip_address=ip_address,
+        host = factory.host(
+            ip_address,
             hostnames=hostnames,
             status=status,
             os_info=os_info,
             os_confidence=os_confidence,
             mac_address=mac_address,
-            discovered_by="nmap",
-            discovered_at=scan_time,
-            last_seen=scan_time,
-            notes=None,
         )
 
         # Parse services
         ports_elem = host_elem.find("ports")
         if ports_elem is not None:
             for port_elem in ports_elem.findall("port"):
-                service = self._parse_service_xml(port_elem, host.id, scan_time)
+                service = self._parse_service_xml(port_elem, host.id, factory)
                 if service:
                     host.add_service(service)
 
         return host
 
-    def _parse_service_xml(self, port_elem: ET.Element, host_id: str, scan_time: datetime) -> Service | None:
+    def _parse_service_xml(self, port_elem: ET.Element, host_id: str, factory: TrustedModelFactory) -> Service | None:
         """Parse a single service from XML port element"""
         try:
             port = int(port_elem.get("portid", "0"))
@@ -185,8 +274,6 @@ class NmapParser(ToolParser):
             if protocol_raw not in ["tcp", "udp"]:
                 return None
 
-            protocol: Literal["tcp", "udp"] = protocol_raw  # type: ignore[assignment]
-
             # Get port state
             state_elem = port_elem.find("state")
             if state_elem is None:
@@ -196,8 +283,6 @@ class NmapParser(ToolParser):
             if state_raw not in ["open", "closed", "filtered"]:
                 return None
 
-            state: Literal["open", "closed", "filtered"] = state_raw  # type: ignore[assignment]
-
             # Get service information
             service_elem = port_elem.find("service")
             service_name = None
@@ -230,32 +315,30 @@ class NmapParser(ToolParser):
                 if banner_parts:
                     banner = " ".join(banner_parts)
 
-            return Service(
-                host_id=host_id,
-                port=port,
-                protocol=protocol,
+            return factory.service(
+                host_id,
+                port,
+                protocol_raw,
+                state_raw,
                 service_name=service_name,
                 product=product,
                 version=version,
                 extrainfo=extrainfo,
-                state=state,
                 confidence=confidence,
-                discovered_by="nmap",
-                discovered_at=scan_time,
                 banner=banner,
-                ssl_info=None,
             )
 
         except ValueError as e:
             logger.warning(f"Failed to parse service: {e}")
             return None
 
-    def _parse_hosts_gnmap(self, gnmap_output: str) -> list[Host]:
-        """Parse hosts from Nmap grepable output"""
+    def _parse_hosts_gnmap(self, gnmap_output: str | Iterable[str]) -> list[Host]:
+        """Parse hosts from Nmap grepable output (a string or an iterable of lines)"""
         hosts = {}  # Use dict to merge host information
-        scan_time = datetime.now(UTC)
+        factory = TrustedModelFactory("nmap")
 
-        for line in gnmap_output.split("\n"):
+        lines = gnmap_output.split("\n") if isinstance(gnmap_output, str) else gnmap_output
+        for line in lines:
             line = line.strip()
             if not line.startswith("Host:"):
                 continue
@@ -271,14 +354,7 @@ class NmapParser(ToolParser):
                 hostnames = [hostname] if hostname else []
 
                 if ip_address not in hosts:
-                    hosts[ip_address] = Host(
-                        ip_address=ip_address,
-                        hostnames=hostnames,
-                        status=status,
-                        discovered_by="nmap",
-                        discovered_at=scan_time,
-                        last_seen=scan_time,
-                    )
+                    hosts[ip_address] = factory.host(ip_address, hostnames=hostnames, status=status)
                 else:
                     hosts[ip_address].status = status
                     if hostname and hostname not in hosts[ip_address].hostnames:
@@ -294,24 +370,17 @@ class NmapParser(ToolParser):
                 # Ensure host exists
                 if ip_address not in hosts:
                     hostnames = [hostname] if hostname else []
-                    hosts[ip_address] = Host(
-                        ip_address=ip_address,
-                        hostnames=hostnames,
-                        status="unknown",
-                        discovered_by="nmap",
-                        discovered_at=scan_time,
-                        last_seen=scan_time,
-                    )
+                    hosts[ip_address] = factory.host(ip_address, hostnames=hostnames)
 
                 # Parse services
                 for port_info in ports_str.split(", "):
-                    service = self._parse_service_gnmap(port_info.strip(), hosts[ip_address].id, scan_time)
+                    service = self._parse_service_gnmap(port_info.strip(), hosts[ip_address].id, factory)
                     if service:
                         hosts[ip_address].add_service(service)
 
         return list(hosts.values())
 
-    def _parse_service_gnmap(self, port_info: str, host_id: str, scan_time: datetime) -> Service | None:
+    def _parse_service_gnmap(self, port_info: str, host_id: str, factory: TrustedModelFactory) -> Service | None:
         """Parse service from grepable port info"""
         # Example: 22/open/tcp//ssh///
         # Example: 80/open/tcp//http//Apache httpd 2.4.41/
@@ -346,28 +415,21 @@ class NmapParser(ToolParser):
                 else:
                     product = product_version
 
-            return Service(
-                host_id=host_id,
-                port=port,
-                protocol=protocol,
-                service_name=service_name,
-                product=product,
-                version=version,
-                state=state,
-                discovered_by="nmap",
-                discovered_at=scan_time,
+            return factory.service(
+                host_id, port, protocol, state, service_name=service_name, product=product, version=version
             )
 
         except (ValueError, IndexError):
             return None
 
-    def _parse_hosts_normal(self, normal_output: str) -> list[Host]:
-        """Parse hosts from Nmap normal output"""
+    def _parse_hosts_normal(self, normal_output: str | Iterable[str]) -> list[Host]:
+        """Parse hosts from Nmap normal output (a string or an iterable of lines)"""
         hosts = []
-        scan_time = datetime.now(UTC)
+        factory = TrustedModelFactory("nmap")
         current_host = None
 
-        for line in normal_output.split("\n"):
+        lines = normal_output.split("\n") if isinstance(normal_output, str) else normal_output
+        for line in lines:
             line = line.strip()
 
             # New host section
@@ -375,7 +437,7 @@ class NmapParser(ToolParser):
                 if current_host:
                     hosts.append(current_host)
 
-                current_host = self._parse_host_normal_header(line, scan_time)
+                current_host = self._parse_host_normal_header(line, factory)
                 continue
 
             # Host status
@@ -388,7 +450,7 @@ class NmapParser(ToolParser):
 
             # Port information
             if current_host and "/" in line and ("open" in line or "closed" in line or "filtered" in line):
-                service = self._parse_service_normal(line, current_host.id, scan_time)
+                service = self._parse_service_normal(line, current_host.id, factory)
                 if service:
                     current_host.add_service(service)
 
@@ -398,7 +460,7 @@ class NmapParser(ToolParser):
 
         return hosts
 
-    def _parse_host_normal_header(self, line: str, scan_time: datetime) -> Host:
+    def _parse_host_normal_header(self, line: str, factory: TrustedModelFactory) -> Host:
         """Parse host information from normal output header"""
         # Example: Nmap scan report for 192.168.1.1
         # Example: Nmap scan report for router.local (192.168.1.1)
@@ -413,16 +475,9 @@ class NmapParser(ToolParser):
         if hostname_part and hostname_part != ip_address:
             hostnames.append(hostname_part)
 
-        return Host(
-            ip_address=ip_address,
-            hostnames=hostnames,
-            status="unknown",
-            discovered_by="nmap",
-            discovered_at=scan_time,
-            last_seen=scan_time,
-        )
+        return factory.host(ip_address, hostnames=hostnames)
 
-    def _parse_service_normal(self, line: str, host_id: str, scan_time: datetime) -> Service | None:
+    def _parse_service_normal(self, line: str, host_id: str, factory: TrustedModelFactory) -> Service | None:
         """Parse service from normal output line"""
         # Example: 22/tcp   open  ssh     OpenSSH 8.2p1 Ubuntu 4ubuntu0.2
         # Example: 80/tcp   open  http    Apache httpd 2.4.41
@@ -449,16 +504,8 @@ class NmapParser(ToolParser):
                 else:
                     product = product_info
 
-            return Service(
-                host_id=host_id,
-                port=port,
-                protocol=protocol,
-                service_name=service_name,
-                product=product,
-                version=version,
-                state=state,
-                discovered_by="nmap",
-                discovered_at=scan_time,
+            return factory.service(
+                host_id, port, protocol, state, service_name=service_name, product=product, version=version
             )
 
         except ValueError:
@@ -466,32 +513,32 @@ class NmapParser(ToolParser):
 
     def _parse_findings_xml(self, xml_output: str) -> list[Finding]:
         """Parse security findings from Nmap XML script output"""
-        try:
-            root = ET.fromstring(xml_output)  # noqa: S314 - Nmap XML output is trusted
-        except ET.ParseError:
-            return []
-
         findings = []
-        scan_time = self._get_scan_time(root)
-
-        for host_elem in root.findall("host"):
-            address_elem = host_elem.find("address[@addrtype='ipv4']")
-            if address_elem is None:
-                address_elem = host_elem.find("address[@addrtype='ipv6']")
-            if address_elem is None:
-                continue
+        for _, host_findings in self._iter_xml(io.StringIO(xml_output)):
+            findings.extend(host_findings)
+        return findings
 
-            ip_address = address_elem.get("addr", "")
+    def _parse_host_findings_xml(self, host_elem: ET.Element, factory: TrustedModelFactory) -> list[Finding]:
+        """Parse script findings of a single host element"""
+        address_elem = host_elem.find("address[@addrtype='ipv4']")
+        if address_elem is None:
+            address_elem = host_elem.find("address[@addrtype='ipv6']")
+        if address_elem is None:
+            return []
 
-            # Parse script results
-            for script_elem in host_elem.findall(".//script"):
-                finding = self._parse_script_finding(script_elem, ip_address, scan_time)
-                if finding:
-                    findings.append(finding)
+        ip_address = address_elem.get("addr", "")
 
+        # Parse script results
+        findings = []
+        for script_elem in host_elem.findall(".//script"):
+            finding = self._parse_script_finding(script_elem, ip_address, factory)
+            if finding:
+                findings.append(finding)
         return findings
 
-    def _parse_script_finding(self, script_elem: ET.Element, ip_address: str, scan_time: datetime) -> Finding | None:
+    def _parse_script_finding(
+        self, script_elem: ET.Element, ip_address: str, factory: TrustedModelFactory
+    ) -> Finding | None:
         """Parse a security finding from a script element"""
         script_id = script_elem.get("id", "")
         script_output = script_elem.get("output", "")
@@ -516,15 +563,13 @@ class NmapParser(ToolParser):
             category = "information_disclosure"
 
         # Create finding
-        return Finding(
-            title=f"Nmap Script: {script_id}",
-            description=script_output,
-            category=category,
+        return factory.finding(
+            f"Nmap Script: {script_id}",
+            script_output,
+            category,
+            "host",
             severity=severity,
-            target_type="host",
-            discovered_by="nmap",
             evidence=script_output,
-            discovered_at=scan_time,
         )
 
     def _get_scan_time(self, root: ET.Element) -> datetime:
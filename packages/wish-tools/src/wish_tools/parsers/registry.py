@@ -0,0 +1,12 @@
+"""
+Default parser registry for the bundled tool parsers
+"""
+
+from .base import ParserRegistry
+from .nmap import NmapParser
+from .smb import Enum4linuxParser, SmbclientParser
+
+
+def create_parser_registry() -> ParserRegistry:
+    """Create a registry with every bundled parser (nmap first, as it has the cheapest signature)"""
+    return ParserRegistry([NmapParser(), SmbclientParser(), Enum4linuxParser()])
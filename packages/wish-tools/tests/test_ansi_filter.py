@@ -2,9 +2,12 @@
 Tests for ANSI escape sequence filtering
 """
 
+import re
+import time
+
 import pytest
 
-from wish_tools.execution.ansi_filter import AnsiFilter
+from wish_tools.execution.ansi_filter import AnsiFilter, IncrementalAnsiFilter
 
 
 class TestAnsiFilter:
@@ -148,6 +151,11 @@ class TestAnsiFilter:
         )
         assert result == expected
 
+    def test_sanitize_private_and_osc_sequences(self):
+        """Test removal of private-mode CSI, OSC title strings and charset escapes"""
+        text = "\x1b[?25lHidden\x1b[?25h \x1b]0;nmap scan\x07Title\x1b]2;t\x1b\\ \x1b(BDone\r\n"
+        assert AnsiFilter.sanitize_terminal_output(text) == "Hidden Title Done\r\n"
+
     @pytest.mark.parametrize(
         "input_text,expected",
         [
@@ -167,3 +175,64 @@ class TestAnsiFilter:
         """Test various input patterns with expected outputs"""
         result = AnsiFilter.sanitize_terminal_output(input_text)
         assert result == expected
+
+
+class TestIncrementalAnsiFilter:
+    """Test chunked ANSI filtering"""
+
+    def test_sequence_split_across_chunks(self):
+        """Test that escape sequences split between chunks are still removed"""
+        text = "\x1b[31mRed\x1b[0m line\n\x1b]0;title\x1b\\Next\x1b[1;1R\n"
+        for size in range(1, len(text) + 1):
+            ansi_filter = IncrementalAnsiFilter()
+            chunks = [ansi_filter.feed(text[i : i + size]) for i in range(0, len(text), size)]
+            assert "".join(chunks) + ansi_filter.flush() == "Red line\nNext\n"
+
+    def test_complete_chunks_are_released(self):
+        """Test that nothing is held back when a chunk ends cleanly"""
+        ansi_filter = IncrementalAnsiFilter()
+
+        assert ansi_filter.feed("\x1b[32mok\x1b[0m\n") == "ok\n"
+        assert ansi_filter.feed("half\x1b[3") == "half"
+        assert ansi_filter.feed("1mred\n") == "red\n"
+        assert ansi_filter.flush() == ""
+
+
+def _multi_pass_sanitize(text):
+    """The previous sanitizer: one regex pass per sequence type plus two whitespace passes"""
+    text = AnsiFilter.strip_ansi_codes(text)
+    text = AnsiFilter.strip_cursor_controls(text)
+    text = AnsiFilter.strip_screen_controls(text)
+    text = AnsiFilter.strip_control_chars(text)
+    text = re.sub(r"\n\s*\n\s*\n", "\n\n", text)
+    return re.sub(r"[ \t]+\n", "\n", text)
+
+
+@pytest.mark.benchmark
+class TestAnsiFilterBenchmark:
+    """Compare sanitizer throughput (run with -s to see the numbers)"""
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            "\x1b[32m[+]\x1b[0m 10.0.0.1:443 \x1b[1mopen\x1b[0m https  \x1b[1;1R\n",
+            "22/tcp   open  ssh     OpenSSH 8.9p1 Ubuntu 3ubuntu0.1\n",
+            "\x1b[33m[*]\x1b[0m Übersicht: gefundene Dienste — 10.0.0.1\n",
+        ],
+        ids=["colored", "plain", "non-ascii"],
+    )
+    def test_sanitize_throughput(self, line):
+        """Time the single-pass sanitizer against the multi-pass one on 8 MB of tool output"""
+        text = line * (8 * 1024 * 1024 // len(line))
+        megabytes = len(text.encode()) / 1024 / 1024
+
+        results = {}
+        for name, sanitize in [
+            ("multi-pass", _multi_pass_sanitize),
+            ("single-pass", AnsiFilter.sanitize_terminal_output),
+        ]:
+            start = time.perf_counter()
+            results[name] = sanitize(text)
+            print(f"\n{name}: {megabytes / (time.perf_counter() - start):.1f} MB/s")
+
+        assert results["single-pass"] == results["multi-pass"]
@@ -3,6 +3,9 @@ Tests for ToolExecutor implementation
 """
 
 import asyncio
+import os
+import shlex
+import sys
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -266,3 +269,127 @@ class TestToolExecutor:
         """Test executor initialization"""
         executor = ToolExecutor()
         assert executor.active_processes == {}
+
+
+def _python_command(script):
+    """Build a command running a Python snippet with the current interpreter"""
+    return f"{shlex.quote(sys.executable)} -u -c {shlex.quote(script)}"
+
+
+class TestCommandStream:
+    """Test cases for streaming command output"""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_filtered_lines(self):
+        """Test that chunks arrive per stream with ANSI sequences removed"""
+        script = "import sys; print('\\x1b[31mred\\x1b[0m'); print('oops', file=sys.stderr); print('done')"
+        stream = ToolExecutor().stream_command(_python_command(script), "python", timeout=30)
+
+        chunks = [chunk async for chunk in stream]
+
+        assert "".join(c.text for c in chunks if c.stream == "stdout") == "red\ndone\n"
+        assert "".join(c.text for c in chunks if c.stream == "stderr") == "oops\n"
+        assert stream.result is not None
+        assert stream.result.success
+        assert stream.result.stdout == "red\ndone\n"
+        assert not stream.result.output_truncated
+
+    @pytest.mark.asyncio
+    async def test_stream_keeps_bounded_tail(self):
+        """Test that only the last lines are kept in the result"""
+        script = "for i in range(1000): print(f'line {i}')"
+        stream = ToolExecutor().stream_command(_python_command(script), "python", timeout=30, tail_lines=3)
+
+        line_count = sum([len(chunk.text.splitlines()) async for chunk in stream])
+
+        assert line_count == 1000
+        assert stream.result is not None
+        assert stream.result.stdout == "line 997\nline 998\nline 999\n"
+        assert stream.result.output_truncated
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_before_exit(self):
+        """Test that output is delivered while the process is still running"""
+        script = "import time; print('first'); time.sleep(30)"
+        executor = ToolExecutor()
+        stream = executor.stream_command(_python_command(script), "python", timeout=60)
+
+        first = await asyncio.wait_for(anext(aiter(stream)), timeout=10)
+        assert first.text == "first\n"
+        assert executor.get_active_executions()
+
+        await stream.aclose()
+        assert executor.get_active_executions() == {}
+
+    @pytest.mark.asyncio
+    async def test_stream_timeout(self):
+        """Test that a stream past its timeout terminates the process"""
+        stream = ToolExecutor().stream_command(_python_command("import time; time.sleep(30)"), "python", timeout=1)
+
+        assert [chunk async for chunk in stream] == []
+        assert stream.result is not None
+        assert stream.result.timeout_occurred
+        assert not stream.result.success
+
+    @pytest.mark.asyncio
+    async def test_stream_tool_not_found(self):
+        """Test that a missing tool ends the stream with an error result"""
+        stream = ToolExecutor().stream_command("definitely-not-a-tool --version", "missing")
+
+        assert [chunk async for chunk in stream] == []
+        assert stream.result is not None
+        assert stream.result.exit_code == -2
+
+    @pytest.mark.asyncio
+    async def test_stream_spools_raw_output(self, tmp_path):
+        """Test that the complete raw stdout is spooled while the result keeps only the tail"""
+        spool_path = tmp_path / "out" / "job.out"
+        script = "for i in range(1000): print(f'\\x1b[1mline {i}\\x1b[0m')"
+
+        result = await ToolExecutor().execute_command(
+            _python_command(script), "python", timeout=30, spool_path=spool_path
+        )
+
+        assert result.success
+        assert result.output_file == str(spool_path)
+        assert spool_path.read_bytes().count(b"\n") == 1000
+        assert spool_path.read_bytes().startswith(b"\x1b[1mline 0")
+        assert result.stdout.endswith("line 999\n")
+
+    @pytest.mark.asyncio
+    async def test_stream_invalid_working_directory(self, tmp_path):
+        """Test that a missing working directory ends the stream with an error result"""
+        result = await ToolExecutor().execute_command(
+            "echo hi", "echo", working_directory=str(tmp_path / "missing"), on_output=lambda chunk: None
+        )
+
+        assert not result.success
+        assert result.exit_code == -4
+        assert "Working directory does not exist" in result.stderr
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not os.path.exists("/dev/full"), reason="needs /dev/full")
+    async def test_stream_spool_write_failure(self):
+        """Test that a failed spool write (disk full) ends the stream with an error result"""
+        executor = ToolExecutor()
+
+        result = await executor.execute_command(_python_command("print('hi')"), "python", spool_path="/dev/full")
+
+        assert not result.success
+        assert result.exit_code == -4
+        assert executor.get_active_executions() == {}
+
+    @pytest.mark.asyncio
+    async def test_execute_command_with_output_callback(self):
+        """Test that execute_command streams to a callback and still returns the full output"""
+        received = []
+
+        async def on_output(chunk):
+            received.append(chunk.text)
+
+        script = "for i in range(3): print(i)"
+        result = await ToolExecutor().execute_command(_python_command(script), "python", on_output=on_output)
+
+        assert result.success
+        assert result.stdout == "0\n1\n2\n"
+        assert "".join(received) == "0\n1\n2\n"
@@ -2,6 +2,8 @@
 Tests for msfconsole executor with PTY support
 """
 
+import asyncio
+import os
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -175,34 +177,36 @@ class TestMsfconsoleExecutor:
             assert result == expected, f"Failed for output: {output}"
 
     @pytest.mark.asyncio
-    @patch("wish_tools.execution.msfconsole_executor.select.select")
-    @patch("wish_tools.execution.msfconsole_executor.os.read")
-    @patch("wish_tools.execution.msfconsole_executor.fcntl.fcntl")
-    async def test_read_pty_output(self, mock_fcntl, mock_read, mock_select, executor):
-        """Test PTY output reading"""
-        # Mock select to return ready fd
-        mock_select.side_effect = [
-            ([10], [], []),  # First call - data available
-            ([10], [], []),  # Second call - data available
-            ([], [], []),  # Third call - no data, will timeout
-        ]
-
-        # Mock os.read to return data
-        mock_read.side_effect = [
-            b"First chunk\n",
-            b"Exploit completed\n",
-            OSError(11),  # EAGAIN - no more data
-        ]
-
-        # Mock process
-        mock_process = AsyncMock()
-        mock_process.returncode = 0
-        executor.process = mock_process
+    async def test_read_pty_output(self, executor):
+        """Test that output is read until a completion indicator, even one split across reads"""
+        read_fd, write_fd = os.pipe()
+        try:
+            reader = asyncio.create_task(executor._read_pty_output(read_fd, timeout=5))
+            for data in [b"First chunk \xc3", b"\xa9\nExploit comp", b"leted\n"]:
+                await asyncio.sleep(0.05)
+                os.write(write_fd, data)
+
+            result = await asyncio.wait_for(reader, timeout=5)
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+        assert result == "First chunk é\nExploit completed\n"
 
-        result = await executor._read_pty_output(10, timeout=5)
-
-        assert "First chunk" in result
-        assert "Exploit completed" in result
+    @pytest.mark.asyncio
+    async def test_read_pty_output_timeout_and_eof(self, executor):
+        """Test that reading stops at the timeout or when the PTY is closed"""
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"still running\n")
+        timed_out = await executor._read_pty_output(read_fd, timeout=1)
+
+        os.write(write_fd, b"last line\n")
+        os.close(write_fd)
+        closed = await asyncio.wait_for(executor._read_pty_output(read_fd, timeout=30), timeout=5)
+        os.close(read_fd)
+
+        assert timed_out == "still running\n"
+        assert closed == "last line\n"
 
     @pytest.mark.asyncio
     @patch("wish_tools.execution.msfconsole_executor.os.killpg")
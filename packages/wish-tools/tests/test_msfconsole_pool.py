@@ -0,0 +1,160 @@
+"""
+Tests for the msfconsole worker pool
+"""
+
+import sys
+
+import pytest
+
+from wish_tools.execution.executor import ToolExecutor
+from wish_tools.execution.msfconsole_pool import MsfconsolePool, split_console_commands
+
+# Stand-in for msfconsole: answers setg/getg/unsetg, jobs and sessions like the
+# real console and echoes other commands ("exploit -j" leaves a job running)
+FAKE_CONSOLE = """
+import sys, time
+print("\\x1b[1mfake console\\x1b[0m", flush=True)
+datastore = {}
+jobs = 0
+for line in sys.stdin:
+    command = line.strip()
+    if command.startswith("setg "):
+        _, name, value = command.split(maxsplit=2)
+        datastore[name] = value
+        print(f"{name} => {value}", flush=True)
+    elif command.startswith("getg "):
+        name = command.split()[1]
+        print(f"{name} => {datastore.get(name, '')}", flush=True)
+    elif command == "unsetg all":
+        datastore.clear()
+        print("Flushing datastore...", flush=True)
+    elif command == "exploit -j":
+        jobs += 1
+        print(f"[*] Exploit running as background job {jobs - 1}.", flush=True)
+    elif command == "jobs":
+        print("Active jobs" if jobs else "No active jobs.", flush=True)
+    elif command == "sessions":
+        print("No active sessions.", flush=True)
+    elif command.startswith("sleep "):
+        time.sleep(float(command.split()[1]))
+    elif command == "crash":
+        sys.exit(1)
+    elif command and command != "back":
+        print(f"[*] ran {command}", flush=True)
+"""
+
+
+@pytest.fixture
+async def make_pool(tmp_path):
+    """Create pools running the fake console, closing them afterwards"""
+    script = tmp_path / "fake_msfconsole.py"
+    script.write_text(FAKE_CONSOLE)
+    pools = []
+
+    def factory(**kwargs):
+        pool = MsfconsolePool(console_command=[sys.executable, "-u", str(script)], start_timeout=10, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield factory
+    for pool in pools:
+        await pool.close()
+
+
+class TestMsfconsolePool:
+    """Test cases for MsfconsolePool"""
+
+    def test_split_console_commands(self):
+        """Test that command lines are split and exit commands dropped"""
+        assert split_console_commands("use exploit/x; set RHOSTS 10.0.0.1;run; exit") == [
+            "use exploit/x",
+            "set RHOSTS 10.0.0.1",
+            "run",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_commands_reuse_worker(self, make_pool):
+        """Test that consecutive commands run on the same console with their own output"""
+        pool = make_pool(size=1)
+
+        first = await pool.execute("use exploit/x; set RHOSTS 10.0.0.1; run; exit", timeout=10)
+        (worker,) = pool._idle
+        second = await pool.execute("use auxiliary/y; run", timeout=10)
+
+        assert first == ("ran use exploit/x\nran set RHOSTS 10.0.0.1\nran run", "", 0)
+        assert second == ("ran use auxiliary/y\nran run", "", 0)
+        assert pool._idle == [worker]
+        assert worker.commands_run == 2
+
+    @pytest.mark.asyncio
+    async def test_global_datastore_reset_between_commands(self, make_pool):
+        """Test that values set with setg by one command are gone for the next"""
+        pool = make_pool(size=1)
+
+        first = await pool.execute("setg RHOSTS 10.0.0.1; getg RHOSTS", timeout=10)
+        second = await pool.execute("getg RHOSTS", timeout=10)
+
+        assert first == ("RHOSTS => 10.0.0.1\nRHOSTS => 10.0.0.1", "", 0)
+        assert second == ("RHOSTS =>", "", 0)
+        assert pool._idle[0].commands_run == 2
+
+    @pytest.mark.asyncio
+    async def test_worker_with_background_job_discarded(self, make_pool):
+        """Test that a worker left running a job is stopped rather than reused"""
+        pool = make_pool(size=1)
+
+        result = await pool.execute("use exploit/multi/handler; exploit -j", timeout=10)
+        worker = next(iter(pool._workers), None)
+
+        assert result == ("ran use exploit/multi/handler\nExploit running as background job 0.", "", 0)
+        assert worker is None
+        assert pool.stats()["workers"] == 0
+        assert await pool.execute("version", timeout=10) == ("ran version", "", 0)
+
+    @pytest.mark.asyncio
+    async def test_worker_recycled_after_max_commands(self, make_pool):
+        """Test that workers are replaced once they have run max_commands commands"""
+        pool = make_pool(size=1, max_commands=1)
+
+        await pool.execute("version", timeout=10)
+        first_worker = pool._idle[0]
+        await pool.execute("version", timeout=10)
+
+        assert pool._idle[0] is not first_worker
+        assert not first_worker.alive
+
+    @pytest.mark.asyncio
+    async def test_timeout_discards_worker(self, make_pool):
+        """Test that a command past its timeout is reported and its busy worker replaced"""
+        pool = make_pool(size=1)
+
+        stdout, stderr, exit_code = await pool.execute("sleep 5", timeout=1)
+        result = await pool.execute("version", timeout=10)
+
+        assert exit_code == -1
+        assert "timed out" in stderr
+        assert result == ("ran version", "", 0)
+        assert pool.stats()["workers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_dead_worker_replaced(self, make_pool):
+        """Test that a worker that exited is detected by the health check and replaced"""
+        pool = make_pool(size=1, health_check_interval=0)
+
+        with pytest.raises(RuntimeError, match="exited"):
+            await pool.execute("crash", timeout=10)
+        await pool.execute("version", timeout=10)
+        pool._idle[0].process.kill()
+        await pool._idle[0].process.wait()
+
+        assert await pool.execute("version", timeout=10) == ("ran version", "", 0)
+
+    @pytest.mark.asyncio
+    async def test_tool_executor_dispatches_to_pool(self, make_pool):
+        """Test that ToolExecutor runs msfconsole commands on the pool"""
+        executor = ToolExecutor(msfconsole_pool=make_pool(size=1))
+
+        result = await executor.execute_command('msfconsole -q -x "use exploit/x; run; exit"', "msfconsole")
+
+        assert result.success
+        assert result.stdout == "ran use exploit/x\nran run"
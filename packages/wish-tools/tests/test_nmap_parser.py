@@ -2,8 +2,14 @@
 Tests for NmapParser implementation
 """
 
+import io
+import xml.etree.ElementTree as ET
+from datetime import UTC, datetime
+from unittest.mock import patch
+
 import pytest
 
+from wish_tools.parsers.base import SNIFF_CHARS
 from wish_tools.parsers.nmap import NmapParser
 
 
@@ -289,6 +295,30 @@ PORT   STATE SERVICE
         assert len(result["services"]) == 1
         assert len(result["findings"]) == 1
 
+    def test_parse_all_parses_xml_once(self):
+        """Test that parse_all streams the XML a single time"""
+        xml_output = """<?xml version="1.0"?>
+<nmaprun start="1700000000">
+    <host>
+        <status state="up"/>
+        <address addr="192.168.1.100" addrtype="ipv4"/>
+        <ports>
+            <port protocol="tcp" portid="80">
+                <state state="open"/>
+                <service name="http"/>
+                <script id="http-enum" output="Found /admin/ directory"/>
+            </port>
+        </ports>
+    </host>
+</nmaprun>"""
+
+        with patch("wish_tools.parsers.nmap.ET.iterparse", wraps=ET.iterparse) as iterparse:
+            result = self.parser.parse_all(xml_output)
+
+        assert iterparse.call_count == 1
+        assert result["services"] == result["hosts"][0].services
+        assert [f.title for f in result["findings"]] == [f.title for f in self.parser.parse_findings(xml_output)]
+
     def test_get_metadata(self):
         """Test metadata extraction"""
         xml_output = """<?xml version="1.0"?>
@@ -382,3 +412,95 @@ PORT   STATE SERVICE
         hosts = self.parser.parse_hosts(xml_output, "xml")
         assert len(hosts) == 1
         assert len(hosts[0].services) == 0  # Service without state should be skipped
+
+    def _scan_xml(self, host_count):
+        """Build Nmap XML for a number of hosts with one scripted service each"""
+        hosts = "".join(
+            f"""<host><status state="up"/><address addr="10.0.{i // 256}.{i % 256}" addrtype="ipv4"/>
+<ports><port protocol="tcp" portid="80"><state state="open"/><service name="http"/>
+<script id="http-enum" output="Found /admin/"/></port></ports></host>"""
+            for i in range(host_count)
+        )
+        return f'<?xml version="1.0"?><nmaprun start="1700000000">{hosts}</nmaprun>'
+
+    def test_iter_hosts_xml_from_path_and_stream(self, tmp_path):
+        """Test streaming hosts from a file path and from a byte stream"""
+        xml_output = self._scan_xml(300)
+        path = tmp_path / "scan.xml"
+        path.write_text(xml_output)
+
+        from_path = list(self.parser.iter_hosts_xml(path))
+        from_stream = self.parser.parse_all_xml(io.BytesIO(xml_output.encode()))
+
+        assert [host.ip_address for host in from_path] == [host.ip_address for host in from_stream["hosts"]]
+        assert len(from_path) == 300
+        assert len(from_stream["services"]) == 300
+        assert len(from_stream["findings"]) == 300
+        assert from_path[0].discovered_at == datetime.fromtimestamp(1700000000, tz=UTC)
+
+    def test_iter_hosts_xml_yields_before_document_ends(self):
+        """Test that hosts are yielded incrementally and survive a truncated document"""
+        truncated = self._scan_xml(2)[: -len("</host></nmaprun>") - 10]
+        hosts = self.parser.iter_hosts_xml(io.BytesIO(truncated.encode()))
+
+        first = next(hosts)
+
+        assert first.ip_address == "10.0.0.0"
+        assert list(hosts) == []
+
+    def test_parse_file_streams_each_format(self, tmp_path):
+        """Test parsing spooled output files in XML and normal format"""
+        xml_path = tmp_path / "scan.xml"
+        xml_path.write_text(self._scan_xml(50))
+        normal_path = tmp_path / "scan.nmap"
+        normal_path.write_text(
+            "Nmap scan report for 10.0.0.5\nHost is up (0.00010s latency).\nPORT   STATE SERVICE\n22/tcp open  ssh\n"
+        )
+
+        from_xml = self.parser.parse_file(xml_path)
+        from_normal = self.parser.parse_file(normal_path)
+
+        assert len(from_xml["hosts"]) == 50
+        assert len(from_xml["findings"]) == 50
+        assert [host.ip_address for host in from_normal["hosts"]] == ["10.0.0.5"]
+        assert [service.port for service in from_normal["services"]] == [22]
+
+    def test_parse_file_unknown_format(self, tmp_path):
+        """Test that a file that is not nmap output is rejected"""
+        path = tmp_path / "other.out"
+        path.write_text("hello world\n")
+
+        with pytest.raises(ValueError):
+            self.parser.parse_file(path)
+
+    def test_detect_format_inspects_prefix_only(self):
+        """Test that format detection only looks at the start of the output and keeps no reference to it"""
+        xml_output = '<?xml version="1.0"?><nmaprun>' + " " * (2 * SNIFF_CHARS) + "</nmaprun>"
+        calls = []
+        original_sniff = self.parser.sniff
+
+        def counting_sniff(prefix):
+            calls.append(prefix)
+            return original_sniff(prefix)
+
+        self.parser.sniff = counting_sniff
+        self.parser.parse_hosts(xml_output)
+        self.parser.parse_services(xml_output)
+        self.parser.parse_findings(xml_output)
+
+        assert [len(prefix) for prefix in calls] == [SNIFF_CHARS] * 3
+        assert all(value is not xml_output for value in vars(self.parser).values())
+
+    def test_registry_dispatch(self):
+        """Test that the default registry routes by tool name or output signature"""
+        from wish_tools.parsers import create_parser_registry
+
+        registry = create_parser_registry()
+        normal_output = "Starting Nmap 7.94\nNmap scan report for 192.168.1.1"
+
+        match = registry.detect(normal_output)
+        assert match is not None
+        assert match.parser.tool_name == "nmap"
+        assert match.format == "normal"
+        assert registry.detect("Sharename       Type      Comment", tool_name="smbclient") is not None
+        assert registry.detect(normal_output, tool_name="smbclient") is None
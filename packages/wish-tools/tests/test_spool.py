@@ -0,0 +1,64 @@
+"""
+Tests for disk-spooled tool output
+"""
+
+import os
+import time
+
+from wish_tools.execution.spool import SpooledOutput, spool_path_for, sweep_spool_dir
+
+
+class TestSpooledOutput:
+    """Test cases for SpooledOutput"""
+
+    def test_spool_path_for_job(self, tmp_path):
+        """Test that spool files are named after the job inside the base directory"""
+        path = spool_path_for("job_001", base_dir=tmp_path)
+
+        assert path.parent == tmp_path
+        assert path.name.endswith("-job_001.out")
+
+    def test_sweep_removes_old_and_excess_files(self, tmp_path):
+        """Test that the sweep deletes expired files and the oldest files over the size budget"""
+        now = time.time()
+        for name, age in [("expired", 30 * 86400), ("old", 300), ("recent", 200), ("newest", 100)]:
+            path = tmp_path / f"{name}.out"
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (now - age, now - age))
+        (tmp_path / "notes.txt").write_text("not spooled output")
+
+        deleted = sweep_spool_dir(tmp_path, max_age=86400, max_total_bytes=250)
+
+        assert deleted == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["newest.out", "notes.txt", "recent.out"]
+
+    def test_sweep_of_missing_directory(self, tmp_path):
+        """Test that sweeping a directory that does not exist yet is a no-op"""
+        assert sweep_spool_dir(tmp_path / "missing") == 0
+
+    def test_tail_returns_last_lines(self, tmp_path):
+        """Test that the tail holds the last lines with ANSI sequences removed"""
+        path = tmp_path / "job.out"
+        path.write_bytes(b"".join(f"line {i}\n".encode() for i in range(10000)) + b"\x1b[32mdone\x1b[0m\n")
+
+        assert SpooledOutput(path).tail(3) == "line 9998\nline 9999\ndone\n"
+
+    def test_tail_of_short_and_empty_output(self, tmp_path):
+        """Test that short outputs are returned whole and missing files are empty"""
+        path = tmp_path / "job.out"
+        path.write_bytes(b"only line")
+
+        assert SpooledOutput(path).tail(5) == "only line"
+        assert SpooledOutput(tmp_path / "missing.out").tail() == ""
+        assert SpooledOutput(tmp_path / "missing.out").size == 0
+
+    def test_iter_lines_and_head(self, tmp_path):
+        """Test streaming lines with and without sanitization"""
+        path = tmp_path / "job.out"
+        path.write_bytes(b"\x1b[1mbold\x1b[0m\nplain\n")
+        spooled = SpooledOutput(path)
+
+        assert list(spooled.iter_lines()) == ["bold\n", "plain\n"]
+        assert list(spooled.iter_lines(sanitize=False))[0] == "\x1b[1mbold\x1b[0m\n"
+        assert spooled.head(4) == "\x1b[1m"
+        assert spooled.size == len(path.read_bytes())
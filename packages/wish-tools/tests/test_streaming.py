@@ -0,0 +1,36 @@
+"""
+Tests for incremental output decoding
+"""
+
+from wish_tools.execution.streaming import MAX_PENDING_CHARS, LineDecoder
+
+
+class TestLineDecoder:
+    """Test cases for LineDecoder"""
+
+    def test_releases_complete_lines_only(self):
+        """Test that partial lines stay pending until their line break arrives"""
+        decoder = LineDecoder()
+
+        assert decoder.feed(b"Nmap scan rep") == ""
+        assert decoder.feed(b"ort for 10.0.0.1\nHost is") == "Nmap scan report for 10.0.0.1\n"
+        assert decoder.flush() == "Host is"
+
+    def test_carriage_return_ends_line(self):
+        """Test that progress updates drawn with carriage returns are released"""
+        decoder = LineDecoder()
+
+        assert decoder.feed(b"Progress: 10%\rProgress: 20%\r") == "Progress: 10%\rProgress: 20%\r"
+
+    def test_multibyte_character_split_across_reads(self):
+        """Test that a UTF-8 character split between reads is decoded once complete"""
+        decoder = LineDecoder()
+
+        assert decoder.feed("café\n".encode()[:4]) == ""
+        assert decoder.feed("café\n".encode()[4:]) == "café\n"
+
+    def test_long_line_without_break_is_released(self):
+        """Test that a line longer than the pending limit is not buffered forever"""
+        decoder = LineDecoder()
+
+        assert len(decoder.feed(b"x" * MAX_PENDING_CHARS)) == MAX_PENDING_CHARS